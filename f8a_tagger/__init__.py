@@ -7,11 +7,15 @@ __author__ = 'Fridolin Pokorny'
 __license__ = 'ASL 2.0'
 __copyright__ = 'Copyright 2017 Fridolin Pokorny'
 
+from .compiled_keywords_chief import CompiledKeywordsChief
 from .corpus import Corpus
 from .errors import RemoteDependencyMissingError
 from .keywords_chief import KeywordsChief
+from .lookup_resources import LookupResources
 from .recipes import aggregate
 from .recipes import collect
+from .recipes import collect_keywords_set
+from .recipes import compile_keywords
 from .recipes import get_registered_collectors
 from .recipes import get_registered_scorers
 from .recipes import get_registered_stemmers
@@ -19,13 +23,19 @@ from .recipes import lookup_file
 from .recipes import lookup_readme
 from .recipes import lookup_text
 from .recipes import reckon
+from .recipes import retag
+from .result_cache import ResultCache
 from .tokenizer import Tokenizer
 
+assert CompiledKeywordsChief
 assert Corpus
 assert RemoteDependencyMissingError
 assert KeywordsChief
+assert LookupResources
 assert aggregate
 assert collect
+assert collect_keywords_set
+assert compile_keywords
 assert get_registered_collectors
 assert get_registered_scorers
 assert get_registered_stemmers
@@ -33,6 +43,8 @@ assert lookup_file
 assert lookup_readme
 assert lookup_text
 assert reckon
+assert retag
+assert ResultCache
 assert Tokenizer
 
 
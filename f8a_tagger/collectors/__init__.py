@@ -4,10 +4,12 @@ from .base import CollectorBase
 from .maven import MavenCollector
 from .npm import NpmCollector
 from .pypi import PypiCollector
+from .rate_limiter import TokenBucket
 from .stackoverflow import StackOverflowCollector
 
 assert CollectorBase
 assert MavenCollector
 assert NpmCollector
 assert PypiCollector
+assert TokenBucket
 assert StackOverflowCollector
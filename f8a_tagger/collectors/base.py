@@ -2,6 +2,12 @@
 """Base class for collectors."""
 
 import abc
+from contextlib import contextmanager
+import os
+
+from f8a_tagger.utils import get_files_dir
+
+from .checkpoint import Checkpoint
 
 
 class CollectorBase(metaclass=abc.ABCMeta):
@@ -9,19 +15,54 @@ class CollectorBase(metaclass=abc.ABCMeta):
 
     _collectors = {}
 
+    # Minimal number of seconds between two checkpoint saves
+    _CHECKPOINT_INTERVAL = 60
+
     @abc.abstractmethod
-    def execute(self, ignore_errors=True, use_progressbar=False):
+    def execute(self, ignore_errors=True, use_progressbar=False, resume=False):
         """Collect keywords.
 
         :param ignore_errors: ignore any non-critical error
         :param use_progressbar: report progress with progressbar
+        :param resume: continue from the last checkpoint if there is any
         :return: keywords set
         :rtype: f8a_tagger.keywords_set.KeywordsSet
         """
         assert ignore_errors is not None
         assert use_progressbar is not None
+        assert resume is not None
         pass
 
+    def get_checkpoint_path(self):
+        """Get path to checkpoint file of this collector."""
+        return os.path.join(get_files_dir(), 'checkpoints',
+                            '%s.json' % self.__class__.__name__.lower())
+
+    @contextmanager
+    def checkpoint(self, resume=False):
+        """Keep checkpoint of collector's run.
+
+        The checkpoint is saved periodically while packages are marked as processed and when the
+        run fails or is interrupted. It is removed once the run finishes successfully.
+
+        :param resume: load the last checkpoint, if False, start from scratch
+        :return: checkpoint instance
+        :rtype: f8a_tagger.collectors.checkpoint.Checkpoint
+        """
+        path = self.get_checkpoint_path()
+        if resume:
+            checkpoint = Checkpoint.load(path, self._CHECKPOINT_INTERVAL)
+        else:
+            checkpoint = Checkpoint(path, self._CHECKPOINT_INTERVAL)
+
+        try:
+            yield checkpoint
+        except BaseException:
+            checkpoint.save()
+            raise
+
+        checkpoint.remove()
+
     @classmethod
     def register_collector(cls, collector_name, collector):
         """Register collector to global collectors.
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""On-disk checkpoints of collectors runs."""
+
+import json
+import os
+import time
+
+import daiquiri
+from f8a_tagger.keywords_set import KeywordsSet
+
+_logger = daiquiri.getLogger(__name__)
+
+
+class Checkpoint(object):
+    """Keep track of processed packages and collected keywords so a run can be resumed."""
+
+    def __init__(self, path, interval=60):
+        """Construct.
+
+        :param path: path to file where checkpoint should be stored
+        :param interval: minimal number of seconds between two checkpoint saves
+        """
+        self._path = path
+        self._interval = interval
+        self._last_save = time.monotonic()
+        self._processed = set()
+        self.keywords_set = KeywordsSet()
+
+    @property
+    def path(self):
+        """Get path to checkpoint file."""
+        return self._path
+
+    @classmethod
+    def load(cls, path, interval=60):
+        """Load checkpoint from a file, start with an empty checkpoint if there is none.
+
+        :param path: path to file where checkpoint is stored
+        :param interval: minimal number of seconds between two checkpoint saves
+        :return: checkpoint instance
+        """
+        instance = cls(path, interval)
+        if not os.path.isfile(path):
+            _logger.warning("No checkpoint found in '%s', starting from scratch", path)
+            return instance
+
+        _logger.debug("Loading checkpoint from '%s'", path)
+        with open(path, 'r') as f:
+            content = json.load(f)
+
+        instance._processed = set(content['processed'])  # pylint: disable=protected-access
+        instance.keywords_set = KeywordsSet.from_dict(content['keywords'])
+
+        _logger.info("Resuming from checkpoint '%s' with %d processed packages",
+                     path, len(instance._processed))  # pylint: disable=protected-access
+        return instance
+
+    def is_processed(self, package_id):
+        """Check whether the given package was already processed.
+
+        :param package_id: package identifier
+        :return: True if package was processed in a previous run
+        """
+        return package_id in self._processed
+
+    def mark_processed(self, package_id):
+        """Mark package as processed, its keywords should be already in keywords set.
+
+        Checkpoint is saved if the checkpoint interval elapsed.
+
+        :param package_id: package identifier
+        """
+        self._processed.add(package_id)
+        if time.monotonic() - self._last_save >= self._interval:
+            self.save()
+
+    def save(self):
+        """Save checkpoint to disk, atomically replace the previous one."""
+        _logger.debug("Saving checkpoint with %d processed packages to '%s'",
+                      len(self._processed), self._path)
+        os.makedirs(os.path.dirname(self._path), exist_ok=True)
+        temp_path = self._path + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump({'processed': list(self._processed),
+                       'keywords': self.keywords_set.to_dict()}, f)
+        os.replace(temp_path, self._path)
+        self._last_save = time.monotonic()
+
+    def remove(self):
+        """Remove checkpoint from disk."""
+        if os.path.isfile(self._path):
+            _logger.debug("Removing checkpoint '%s'", self._path)
+            os.remove(self._path)
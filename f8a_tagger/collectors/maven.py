@@ -1,23 +1,31 @@
 #!/usr/bin/env python3
 """Maven keywords collector."""
 
-from json import loads
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from contextlib import closing
+import hashlib
+import io
 from os import path
 from shutil import rmtree
-from subprocess import check_output
-from time import sleep
+from subprocess import CalledProcessError
+from subprocess import PIPE
+from subprocess import Popen
+import threading
 
-from requests import get
+import requests
 
 from bs4 import BeautifulSoup
 import daiquiri
 from f8a_tagger.errors import InstallPrepareError
-from f8a_tagger.keywords_set import KeywordsSet
-from f8a_tagger.utils import cwd
+from f8a_tagger.http_cache import get_http_cache
 from f8a_tagger.utils import get_files_dir
+from f8a_tagger.utils import iter_json_array
 from f8a_tagger.utils import progressbarize
 
 from .base import CollectorBase
+from .rate_limiter import TokenBucket
 
 _logger = daiquiri.getLogger(__name__)
 
@@ -26,11 +34,28 @@ class MavenCollector(CollectorBase):
     """Maven keywords collector."""
 
     _MVNREPOSITORY_URL = 'https://mvnrepository.com/artifact/'
-
-    def execute(self, ignore_errors=True, use_progressbar=False):
+    # It seems that mvnrepository has limit for 2000 requests per hour
+    _MVNREPOSITORY_REQUESTS_PER_HOUR = 2000
+
+    def __init__(self, mvnrepository_url=None, rate_limiter=None, workers=4, http_cache=None):
+        """Construct.
+
+        :param mvnrepository_url: base URL of artifact pages on mvnrepository.com
+        :param rate_limiter: rate limiter to be used, could be shared with other collectors
+        :type rate_limiter: f8a_tagger.collectors.rate_limiter.TokenBucket
+        :param workers: number of concurrent fetchers
+        :param http_cache: HTTP cache to be used, the shared one if not provided
+        :type http_cache: f8a_tagger.http_cache.HttpCache
+        """
+        self._mvnrepository_url = mvnrepository_url or self._MVNREPOSITORY_URL
+        self._rate_limiter = rate_limiter or \
+            TokenBucket.per_hour(self._MVNREPOSITORY_REQUESTS_PER_HOUR)
+        self._workers = workers
+        self._local = threading.local()
+        self._http_cache = http_cache or get_http_cache()
+
+    def execute(self, ignore_errors=True, use_progressbar=False, resume=False):
         """Collect Maven keywords."""
-        keywords_set = KeywordsSet()
-
         _logger.debug("Fetching Maven and executing Maven index checker")
         maven_index_checker_dir = get_files_dir()
         maven_index_checker_jar = path.join(maven_index_checker_dir, "maven-index-checker.jar")
@@ -40,42 +65,122 @@ class MavenCollector(CollectorBase):
                                       "to run prepare()?"
                                       % maven_index_checker_jar)
 
-        with cwd(maven_index_checker_dir):
-            # This requires at least  4GB of free space on /tmp partition
-            packages = loads(check_output(
-                ['java', '-jar', maven_index_checker_jar, '-it']))
-
-        for package in packages:
-            del package['version']
-        packages = [dict(s) for s in set(frozenset(d.items()) for d in packages)]
-
         _logger.debug("started fetching data from mvnrepository.com")
         try:
-            for package in progressbarize(packages, use_progressbar):
-                package_name = package['groupId'] + '/' + package['artifactId']
-                response = get(self._MVNREPOSITORY_URL + package_name)
-                if response.ok is not True:
-                    error_msg = "Failed to retrieve package information for '{}', " \
-                                "response status code: {}". \
-                        format(package_name, response.status_code)
-                    if ignore_errors:
-                        _logger.error(error_msg)
-                        continue
-                    raise RuntimeError(error_msg)
+            # index checker is stopped (if still running) before its output is cleaned
+            with self.checkpoint(resume) as checkpoint, \
+                    closing(self.iter_index_artifacts(maven_index_checker_jar)) as package_names:
+                self.fetch_keywords(progressbarize(package_names, use_progressbar), checkpoint,
+                                    ignore_errors)
+        finally:
+            # Clean unpacked maven index after executing, errors would hide the original one
+            _logger.debug("Cleaning unpacked maven index")
+            rmtree(path.join(maven_index_checker_dir, "target"), ignore_errors=True)
 
-                soup = BeautifulSoup(response.text, 'lxml')
-                for i in soup.find_all(class_="b tag"):
-                    keywords_set.add(i.text)
+        return checkpoint.keywords_set
 
-                # It seems that mvnrepository has limit for 2000 requests per hour
-                # so sleeping 2 seconds of sleep should do the trick
-                sleep(2)
+    @staticmethod
+    def iter_index_artifacts(maven_index_checker_jar):
+        """Yield unique artifacts listed in Maven index as they are read from index checker.
+
+        Records are parsed one at a time from the index checker output and deduplicated on
+        groupId and artifactId (versions are ignored). Only a short hash of already seen
+        artifacts is kept in memory.
+
+        :param maven_index_checker_jar: path to maven-index-checker.jar
+        :return: artifact names in form of groupId/artifactId
+        """
+        seen = set()
+        # This requires at least  4GB of free space on /tmp partition
+        command = ['java', '-jar', maven_index_checker_jar, '-it']
+        process = Popen(command, stdout=PIPE, cwd=path.dirname(maven_index_checker_jar))
+        try:
+            with io.TextIOWrapper(process.stdout, encoding='utf-8') as stream:
+                for package in iter_json_array(stream):
+                    package_name = package['groupId'] + '/' + package['artifactId']
+                    digest = hashlib.blake2b(package_name.encode(), digest_size=8).digest()
+                    key = int.from_bytes(digest, 'little')
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    yield package_name
         finally:
-            # Clean unpacked maven index after executing
-            _logger.debug("Cleaning unpacked maven index")
-            rmtree(path.join(maven_index_checker_dir, "target"))
+            if process.poll() is None:
+                process.kill()
+            process.wait()
+
+        if process.returncode != 0:
+            raise CalledProcessError(process.returncode, command)
+
+    def fetch_keywords(self, package_names, checkpoint, ignore_errors=True):
+        """Fetch keywords of packages concurrently, respecting rate limit.
+
+        :param package_names: iterable of package names in form of groupId/artifactId
+        :param checkpoint: checkpoint to which found keywords and processed packages are added
+        :type checkpoint: f8a_tagger.collectors.checkpoint.Checkpoint
+        :param ignore_errors: ignore any non-critical error
+        """
+        with ThreadPoolExecutor(max_workers=self._workers) as executor:
+            pending = set()
+            try:
+                for package_name in package_names:
+                    if checkpoint.is_processed(package_name):
+                        continue
 
-        return keywords_set
+                    if len(pending) >= self._workers:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        self._add_keywords(checkpoint, done)
+                    pending.add(executor.submit(self._fetch_package, package_name,
+                                                ignore_errors))
+
+                done, pending = wait(pending)
+                self._add_keywords(checkpoint, done)
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    @staticmethod
+    def _add_keywords(checkpoint, done):
+        """Add keywords computed by finished fetchers, propagate errors if any."""
+        errors = [future.exception() for future in done if future.exception() is not None]
+
+        for future in done:
+            if future.exception() is not None:
+                continue
+
+            package_name, found_keywords = future.result()
+            if found_keywords is None:
+                continue
+
+            checkpoint.keywords_set.update(found_keywords)
+            checkpoint.mark_processed(package_name)
+
+        if errors:
+            raise errors[0]
+
+    def _fetch_package(self, package_name, ignore_errors):
+        """Fetch keywords of a single package, run by fetchers.
+
+        :return: tuple - package name and a list of keywords found, None if retrieval failed
+        """
+        # Sessions are not guaranteed to be thread safe, keep one per fetcher
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+
+        self._rate_limiter.acquire()
+        response = self._http_cache.get(self._mvnrepository_url + package_name, session=session)
+        if response.ok is not True:
+            error_msg = "Failed to retrieve package information for '{}', " \
+                        "response status code: {}". \
+                format(package_name, response.status_code)
+            if ignore_errors:
+                _logger.error(error_msg)
+                return package_name, None
+            raise RuntimeError(error_msg)
+
+        soup = BeautifulSoup(response.text, 'lxml')
+        return package_name, [i.text for i in soup.find_all(class_="b tag")]
 
 
 CollectorBase.register_collector('Maven', MavenCollector)
@@ -7,10 +7,11 @@ from .base import CollectorBase
 class NpmCollector(CollectorBase):
     """NPM keywords collector."""
 
-    def execute(self, ignore_errors=True, use_progressbar=False):
+    def execute(self, ignore_errors=True, use_progressbar=False, resume=False):
         """Collect NPM keywords."""
         assert ignore_errors is not None
         assert use_progressbar is not None
+        assert resume is not None
         raise NotImplementedError()
 
 
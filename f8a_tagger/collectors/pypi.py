@@ -1,13 +1,15 @@
 #!/usr/bin/env python3
 """PyPI keywords collector."""
 
-import requests
+import asyncio
+from json import loads
+import os
+from urllib.parse import quote
 
+import aiohttp
 from bs4 import BeautifulSoup
-from urllib.parse import urljoin
-
 import daiquiri
-from f8a_tagger.keywords_set import KeywordsSet
+from f8a_tagger.http_cache import get_http_cache
 from f8a_tagger.utils import progressbarize
 
 from .base import CollectorBase
@@ -18,55 +20,227 @@ _logger = daiquiri.getLogger(__name__)
 class PypiCollector(CollectorBase):
     """PyPI keywords collector."""
 
-    _PYPI_SIMPLE_URL = 'https://pypi.python.org/simple/'
-    _PACKAGE_BASE_URL = 'https://pypi.python.org/pypi/project'
-
-    def execute(self, ignore_errors=True, use_progressbar=False):
+    _PYPI_SIMPLE_URL = 'https://pypi.org/simple/'
+    _PACKAGE_JSON_URL = 'https://pypi.org/pypi/{}/json'
+
+    # Ask for PEP 691 JSON listing, but accept the HTML one as well
+    _SIMPLE_ACCEPT = 'application/vnd.pypi.simple.v1+json, text/html;q=0.1'
+    # Status codes that are worth retrying
+    _RETRY_STATUS_CODES = frozenset((429, 500, 502, 503, 504))
+
+    def __init__(self, simple_url=None, package_json_url=None, concurrency=32, retries=3,
+                 backoff=0.5, timeout=60, rate_limiter=None, http_cache=None):
+        # pylint: disable=too-many-arguments
+        """Construct.
+
+        :param simple_url: URL to PyPI simple index listing all packages
+        :param package_json_url: URL template (str.format) to per-project JSON metadata
+        :param concurrency: maximum number of requests (and pooled connections) in flight
+        :param retries: number of retries on connection errors and server side errors
+        :param backoff: initial delay in seconds between retries, doubled on each retry
+        :param timeout: timeout in seconds for a single request
+        :param rate_limiter: optional rate limiter, could be shared with other collectors
+        :type rate_limiter: f8a_tagger.collectors.rate_limiter.TokenBucket
+        :param http_cache: HTTP cache to be used, the shared one if not provided
+        :type http_cache: f8a_tagger.http_cache.HttpCache
+        """
+        self._simple_url = simple_url or self._PYPI_SIMPLE_URL
+        self._package_json_url = package_json_url or self._PACKAGE_JSON_URL
+        self._concurrency = concurrency
+        self._retries = retries
+        self._backoff = backoff
+        self._timeout = timeout
+        self._rate_limiter = rate_limiter
+        self._http_cache = http_cache or get_http_cache()
+
+    def execute(self, ignore_errors=True, use_progressbar=False, resume=False):
         """Collect PyPI keywords."""
-        keywords_set = KeywordsSet()
+        loop = asyncio.new_event_loop()
+        try:
+            with self.checkpoint(resume) as checkpoint:
+                loop.run_until_complete(self._execute(checkpoint, ignore_errors, use_progressbar))
+        finally:
+            loop.close()
+
+        return checkpoint.keywords_set
+
+    async def _execute(self, checkpoint, ignore_errors, use_progressbar):
+        """Collect PyPI keywords using an asynchronous HTTP client."""
+        # Connector keeps connections alive and reuses them, its limit bounds concurrency as well
+        connector = aiohttp.TCPConnector(limit=self._concurrency)
+        timeout = aiohttp.ClientTimeout(total=self._timeout)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            _logger.debug("Fetching PyPI")
+            package_names = await self._fetch_package_names(session)
+
+            pending = set()
+            try:
+                for package_name in progressbarize(package_names, use_progressbar):
+                    if checkpoint.is_processed(package_name):
+                        continue
+
+                    if len(pending) >= self._concurrency:
+                        done, pending = await asyncio.wait(pending,
+                                                           return_when=asyncio.FIRST_COMPLETED)
+                        self._add_keywords(checkpoint, done)
+                    pending.add(asyncio.ensure_future(
+                        self._process_package(session, package_name, ignore_errors)))
+
+                if pending:
+                    done, pending = await asyncio.wait(pending)
+                    self._add_keywords(checkpoint, done)
+            finally:
+                for task in pending:
+                    task.cancel()
+
+    @staticmethod
+    def _add_keywords(checkpoint, done):
+        """Add keywords computed by finished tasks, propagate errors if any."""
+        errors = [task.exception() for task in done if task.exception() is not None]
+
+        for task in done:
+            if task.exception() is not None:
+                continue
 
-        _logger.debug("Fetching PyPI")
-        response = requests.get(self._PYPI_SIMPLE_URL)
-        if response.status_code != 200:
-            raise RuntimeError("Failed to fetch '%s', request ended with status code %s"
-                               % (self._PYPI_SIMPLE_URL, response.status_code))
-
-        soup = BeautifulSoup(response.text, 'lxml')
-        for link in progressbarize(soup.find_all('a'), use_progressbar):
-            package_name = link.text
-            url = urljoin(self._PACKAGE_BASE_URL, package_name)
-            response = requests.get(url)
-            if response.status_code != 200:
-                error_msg = "Failed to retrieve package information for '{}', " \
-                            "response status code: {}".\
-                    format(package_name, response.status_code)
-                if ignore_errors:
-                    _logger.error(error_msg)
-                    continue
-                raise RuntimeError(error_msg)
-
-            package_soup = BeautifulSoup(response.text, 'lxml')
-            # meta_keywords = package_soup.find_all('meta', attrs={'name': 'keywords'})
-            meta_keywords = package_soup.find_all('p', attrs={'class': 'tags'})
-            if len(meta_keywords) < 1:
-                warn_msg = "Failed to parse and find keywords for '%s'" % package_name
-                _logger.warning(warn_msg)
+            package_name, found_keywords = task.result()
+            if found_keywords is None:
                 continue
 
-            # some packages have comma hardcoded in the keywords list, split keywords there as well
-            found_keywords = []
-            keywords_spans = meta_keywords[0].find_all('span', attrs={'class': 'package-keyword'})
-            for span in keywords_spans:
-                for word in span.contents:
-                    found_keywords += [k.strip().lower() for k in word.split(',')
-                                       if k.strip() != ""]
+            checkpoint.keywords_set.update(found_keywords)
+            checkpoint.mark_processed(package_name)
+
+        if errors:
+            raise errors[0]
+
+    async def _get(self, session, url, headers=None):
+        """Perform HTTP GET request, retry on connection and server side errors.
+
+        Responses are cached, requests for cached responses are sent as conditional requests.
+
+        :return: tuple - response status code, content type and response body
+        """
+        conditional_headers = {}
+        if self._http_cache.enabled:
+            conditional_headers = await self._run_blocking(
+                self._http_cache.get_conditional_headers, url)
+        delay = self._backoff
+        attempt = 0
+        while True:
+            if self._rate_limiter is not None:
+                await self._rate_limiter.acquire_async()
+
+            try:
+                async with session.get(url, headers=dict(headers or {},
+                                                         **conditional_headers)) as response:
+                    body = await response.read()
+                    if response.status == 304 and conditional_headers:
+                        cached = await self._run_blocking(self._read_cached, url)
+                        if cached is not None:
+                            return cached
+                        # evicted in the meantime, fetch without conditions right away, the
+                        # request did not fail so it is not counted as an attempt
+                        conditional_headers = {}
+                        continue
+
+                    if self._http_cache.enabled and \
+                            self._http_cache.is_cacheable(response.status, response.headers):
+                        await self._run_blocking(self._http_cache.store, url,
+                                                 response.headers, (body,))
+
+                    if response.status not in self._RETRY_STATUS_CODES or \
+                            attempt == self._retries:
+                        return response.status, response.content_type, body
+                    _logger.debug("Request to '%s' ended with status code %d, retrying",
+                                  url, response.status)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                if attempt == self._retries:
+                    raise
+                _logger.debug("Request to '%s' failed, retrying: %s", url, str(exc))
+
+            attempt += 1
+            await asyncio.sleep(delay)
+            delay *= 2
+
+    @staticmethod
+    async def _run_blocking(func, *args):
+        """Run function accessing HTTP cache (index and files) in a thread.
+
+        The event loop is not blocked and keeps serving other requests meanwhile.
+        """
+        return await asyncio.get_event_loop().run_in_executor(None, func, *args)
+
+    def _read_cached(self, url):
+        """Read cached response for a not modified resource.
+
+        :return: tuple - status code, content type and response body or None if not cached
+        """
+        path, headers = self._http_cache.lookup(url)
+        if path is None or not os.path.isfile(path):
+            return None
+
+        _logger.debug("Response for '%s' not modified, using cached one", url)
+        with open(path, 'rb') as f:
+            body = f.read()
+        content_type = headers.get('Content-Type', 'application/octet-stream')
+        return 200, content_type.split(';')[0].strip(), body
+
+    async def _fetch_package_names(self, session):
+        """Retrieve names of all packages available on PyPI."""
+        status, content_type, body = await self._get(session, self._simple_url,
+                                                     headers={'Accept': self._SIMPLE_ACCEPT})
+        if status != 200:
+            raise RuntimeError("Failed to fetch '%s', request ended with status code %s"
+                               % (self._simple_url, status))
+
+        if content_type.endswith('json'):
+            return [project['name'] for project in loads(body.decode())['projects']]
+
+        soup = BeautifulSoup(body, 'lxml')
+        return [link.text for link in soup.find_all('a')]
+
+    async def _process_package(self, session, package_name, ignore_errors):
+        """Retrieve keywords of a package from its JSON metadata.
+
+        :return: tuple - package name and a set of keywords found, None if retrieval failed
+        """
+        url = self._package_json_url.format(quote(package_name))
+        try:
+            status, _, body = await self._get(session, url)
+            metadata = loads(body.decode()) if status == 200 else None
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as exc:
+            status, metadata = str(exc), None
+
+        if metadata is None:
+            error_msg = "Failed to retrieve package information for '{}', " \
+                        "response status code: {}".format(package_name, status)
+            if ignore_errors:
+                _logger.error(error_msg)
+                return package_name, None
+            raise RuntimeError(error_msg)
+
+        found_keywords = self.parse_keywords((metadata.get('info') or {}).get('keywords'))
+        _logger.debug("Found keywords %s in '%s'", found_keywords, package_name)
+
+        return package_name, found_keywords
+
+    @staticmethod
+    def parse_keywords(keywords):
+        """Parse keywords as stated in package metadata.
+
+        Keywords are comma separated, but a lot of packages use whitespace as a separator.
 
-            _logger.debug("Found keywords %s in '%s'", found_keywords, package_name)
+        :param keywords: keywords metadata value, a string or a list of strings
+        :return: a set of normalized keywords
+        :rtype: set
+        """
+        if not keywords:
+            return set()
 
-            for keyword in set(found_keywords):
-                keywords_set.add(keyword)
+        if not isinstance(keywords, str):
+            keywords = ','.join(str(keyword) for keyword in keywords)
 
-        return keywords_set
+        return set(k.strip().lower() for k in keywords.split(',' if ',' in keywords else None)
+                   if k.strip() != "")
 
 
 CollectorBase.register_collector('PyPI', PypiCollector)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Rate limiting of requests done by collectors."""
+
+import asyncio
+import threading
+import time
+
+
+class TokenBucket(object):
+    """Token bucket rate limiter.
+
+    Tokens are refilled continuously at the given rate up to burst size, each request consumes
+    one token. Callers that find the bucket empty reserve a token in advance and wait until it is
+    refilled, so concurrent callers are served in order and the number of requests done in any
+    time window of T seconds never exceeds burst + rate * T.
+
+    An instance can be shared by multiple threads and by coroutines of an event loop, so more
+    collectors (or more fetchers of one collector) can share a single limit.
+    """
+
+    def __init__(self, rate, burst=1, clock=time.monotonic):
+        """Construct.
+
+        :param rate: number of tokens refilled per second
+        :type rate: float
+        :param burst: maximum number of tokens kept in the bucket
+        :type burst: int
+        :param clock: monotonic clock to be used
+        """
+        if rate <= 0:
+            raise ValueError("Rate has to be a positive number, got %r" % rate)
+
+        if burst < 1:
+            raise ValueError("Burst has to be at least 1, got %r" % burst)
+
+        self._rate = float(rate)
+        self._burst = burst
+        self._clock = clock
+        self._tokens = float(burst)
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_hour(cls, requests, burst=1):
+        """Construct rate limiter allowing the given number of requests per hour.
+
+        :param requests: number of requests allowed per hour
+        :param burst: maximum number of requests that can be done at once
+        :return: token bucket instance
+        """
+        return cls(requests / 3600.0, burst)
+
+    @property
+    def rate(self):
+        """Get number of tokens refilled per second."""
+        return self._rate
+
+    @property
+    def burst(self):
+        """Get maximum number of tokens kept in the bucket."""
+        return self._burst
+
+    def reserve(self, tokens=1):
+        """Reserve tokens, do not wait for them.
+
+        :param tokens: number of tokens to reserve
+        :return: time in seconds the caller has to wait before the reserved tokens can be used
+        :rtype: float
+        """
+        if tokens > self._burst:
+            raise ValueError("Cannot acquire %d tokens at once with burst %d"
+                             % (tokens, self._burst))
+
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self._burst, self._tokens + (now - self._last) * self._rate)
+            self._last = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self._rate
+
+    def acquire(self, tokens=1):
+        """Acquire tokens, block the calling thread until they are available.
+
+        :param tokens: number of tokens to acquire
+        """
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, tokens=1):
+        """Acquire tokens, suspend the calling coroutine until they are available.
+
+        :param tokens: number of tokens to acquire
+        """
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
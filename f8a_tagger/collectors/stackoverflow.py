@@ -1,12 +1,12 @@
 #!/usr/bin/env python3
 """StackOverflow keywords collector."""
 
-import requests
+from xml.parsers import expat
 
 import daiquiri
+from f8a_tagger.http_cache import get_http_cache
 from f8a_tagger.keywords_set import KeywordsSet
 import libarchive
-import xmltodict
 
 from .base import CollectorBase
 
@@ -17,38 +17,69 @@ class StackOverflowCollector(CollectorBase):
     """StackOverflow keywords collector."""
 
     _STACKOVERFLOW_URL = 'https://archive.org/download/stackexchange/stackoverflow.com-Tags.7z'
+    _BLOCK_SIZE = 64 * 1024
 
-    def execute(self, ignore_errors=True, use_progressbar=False):
+    def __init__(self, url=None, http_cache=None):
+        """Construct.
+
+        :param url: URL to StackOverflow's tags archive
+        :param http_cache: HTTP cache to be used, the shared one if not provided
+        :type http_cache: f8a_tagger.http_cache.HttpCache
+        """
+        self._url = url or self._STACKOVERFLOW_URL
+        self._http_cache = http_cache or get_http_cache()
+
+    def execute(self, ignore_errors=True, use_progressbar=False, resume=False):
         """Collect PyPI keywords."""
         assert ignore_errors is not None
         assert use_progressbar is not None
-        keywords_set = KeywordsSet()
+        # Tags are fetched in one request, there is nothing to resume
+        assert resume is not None
         _logger.debug("Fetching StackOverflow")
 
-        response = requests.get(self._STACKOVERFLOW_URL)
-        if response.ok is not True:
-            raise RuntimeError("Failed to fetch '%s', request ended with status code %s"
-                               % (self._STACKOVERFLOW_URL, response.status_code))
+        with self._http_cache.get(self._url, to_file=True) as response:
+            if response.ok is not True:
+                raise RuntimeError("Failed to fetch '%s', request ended with status code %s"
+                                   % (self._url, response.status_code))
 
-        tags = None
-        _logger.debug("Unpacking StackOverflow's tags archive")
-        with libarchive.memory_reader(response.content) as archive:
-            for entry in archive:
-                if entry.name == 'Tags.xml':
-                    tags = xmltodict.parse(b"".join(entry.get_blocks()))
-                    break
+            _logger.debug("Unpacking StackOverflow's tags archive")
+            return self.parse_archive(response.path)
+
+    def parse_archive(self, path):
+        """Parse tags from StackOverflow's tags archive.
+
+        The archive is decompressed block by block and rows are parsed incrementally, so memory
+        usage does not depend on archive size.
+
+        :param path: path to tags archive
+        :return: keywords set
+        :rtype: f8a_tagger.keywords_set.KeywordsSet
+        """
+        keywords_set = KeywordsSet()
+
+        def row_handler(name, attributes):
+            if name != 'row':
+                return
 
-        for tag in tags['tags']['row']:
             try:
-                keywords_set.add(tag['@TagName'], int(tag['@Count']))
+                keywords_set.add(attributes['TagName'], int(attributes['Count']))
             except ValueError:
-                _logger.warning("Failed to parse number of occurrences for tag %s", tag['@TagName'])
-                continue
+                _logger.warning("Failed to parse number of occurrences for tag %s",
+                                attributes.get('TagName'))
             except KeyError:
                 _logger.exception("Missing tagname or tag count")
-                continue
 
-        return keywords_set
+        with libarchive.file_reader(path) as archive:
+            for entry in archive:
+                if entry.name == 'Tags.xml':
+                    parser = expat.ParserCreate()
+                    parser.StartElementHandler = row_handler
+                    for block in entry.get_blocks(self._BLOCK_SIZE):
+                        parser.Parse(block, False)
+                    parser.Parse(b'', True)
+                    return keywords_set
+
+        raise RuntimeError("No Tags.xml found in StackOverflow's tags archive '%s'" % path)
 
 
 CollectorBase.register_collector('StackOverflow', StackOverflowCollector)
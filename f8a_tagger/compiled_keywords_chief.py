@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""Keywords chief backed by a compiled memory mapped keywords database."""
+
+from collections.abc import Mapping
+import hashlib
+import json
+import mmap
+import re
+import struct
+import zlib
+
+import daiquiri
+from f8a_tagger.errors import InvalidInputError
+from f8a_tagger.keywords_chief import KeywordsChief
+
+_logger = daiquiri.getLogger(__name__)
+
+_MAGIC = b'F8AKWDB\0'
+_VERSION = 2
+# magic, version, keywords count, table size, ngram size, total occurrence count, offsets of
+# keywords index, occurrence counts, hash table and regexps, size of regexps and metadata, digest
+_HEADER = struct.Struct('<8sIIIIdQQQQII32s')
+# offset of keyword record in the database
+_INDEX_ENTRY = struct.Struct('<Q')
+# occurrence count of keyword
+_OCCURRENCE_COUNT = struct.Struct('<d')
+# hash of string, offset of string in the database (0 for empty slot), index of keyword
+# shifted by one with the lowest bit set if the string is the keyword itself
+_SLOT = struct.Struct('<IQI')
+_LENGTH = struct.Struct('<I')
+
+
+def _hash(encoded):
+    """Compute hash of an encoded string, stable across processes unlike hash()."""
+    return zlib.crc32(encoded)
+
+
+class _CompiledKeywords(Mapping):
+    """Read-only view of keywords stored in a compiled keywords database."""
+
+    def __init__(self, chief):
+        self._chief = chief
+
+    def __getitem__(self, keyword):
+        # pylint: disable=protected-access
+        index = self._chief._find_keyword(keyword)
+        if index is None:
+            raise KeyError(keyword)
+        return self._chief._read_entry(index)
+
+    def __iter__(self):
+        # pylint: disable=protected-access
+        for index in range(len(self)):
+            yield self._chief._read_keyword(index)
+
+    def __len__(self):
+        # pylint: disable=protected-access
+        return self._chief._keywords_count
+
+
+class CompiledKeywordsChief(KeywordsChief):
+    """Keywords chief interacting with keywords compiled to a memory mapped database.
+
+    Synonyms are stored in an open addressing hash table with strings kept in a string pool,
+    both in a file which is memory mapped on lookup. Worker processes (forked or spawned)
+    open the same file and share its pages in the page cache, no keywords are copied to their
+    heaps. Instances are pickled as the path to the database.
+    """
+
+    def __init__(self, database_file):  # pylint: disable=super-init-not-called
+        """Construct, map keywords database to memory.
+
+        :param database_file: path to compiled keywords database, see compile()
+        """
+        self._database_file = database_file
+        with open(database_file, 'rb') as f:
+            try:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise InvalidInputError("Empty compiled keywords database '%s'" % database_file)
+
+        if self._mmap.size() < _HEADER.size or self._mmap[:len(_MAGIC)] != _MAGIC:
+            self._mmap.close()
+            raise InvalidInputError("File '%s' is not a compiled keywords database"
+                                    % database_file)
+
+        (_, version, self._keywords_count, table_size, self._ngram_size,
+         self._occurrence_count_total, self._index_offset, self._occurrence_counts_offset,
+         self._table_offset, regexps_offset, regexps_size, metadata_size,
+         digest) = _HEADER.unpack_from(self._mmap)
+        if version != _VERSION:
+            self._mmap.close()
+            raise InvalidInputError("Unsupported version %d of compiled keywords database '%s'"
+                                    % (version, database_file))
+
+        self._table_mask = table_size - 1
+        self.digest = digest.hex()
+        self.metadata = json.loads(
+            self._mmap[regexps_offset + regexps_size:
+                       regexps_offset + regexps_size + metadata_size].decode())
+        # regexps are not hashable, they are compiled in each process - keyword id and regexp
+        self._regexps = [(keyword_id, re.compile(regexp)) for keyword_id, regexp in
+                         json.loads(self._mmap[regexps_offset:
+                                               regexps_offset + regexps_size].decode())]
+        self._keywords_prop = _CompiledKeywords(self)
+
+    def __getstate__(self):
+        """Pickle only path to the database, it is mapped again when unpickled."""
+        return {'database_file': self._database_file}
+
+    def __setstate__(self, state):
+        """Map the database when unpickled."""
+        self.__init__(state['database_file'])
+
+    def __enter__(self):
+        """Use keywords chief as a context manager, see close()."""
+        return self
+
+    def __exit__(self, *args):
+        """Unmap keywords database."""
+        self.close()
+
+    def close(self):
+        """Unmap keywords database."""
+        self._mmap.close()
+
+    @classmethod
+    def is_compiled_keywords_file(cls, keyword_file):
+        """Check whether the given file is a compiled keywords database.
+
+        :param keyword_file: path to a keywords file or None
+        :return: True if the given file is a compiled keywords database
+        :rtype: bool
+        """
+        if not isinstance(keyword_file, str) or not keyword_file:
+            return False
+
+        try:
+            with open(keyword_file, 'rb') as f:
+                return f.read(len(_MAGIC)) == _MAGIC
+        except OSError:
+            return False
+
+    @staticmethod
+    def compile(chief, database_file, metadata=None):
+        """Compile keywords of a keywords chief to a database.
+
+        :param chief: keywords chief instance with keywords (already stemmed and lemmatized)
+        :type chief: f8a_tagger.keywords_chief.KeywordsChief
+        :param database_file: path to the database to be written
+        :param metadata: JSON serializable metadata stored in the database, e.g. stemmer used
+        """
+        # pylint: disable=protected-access,too-many-locals
+        keywords = [chief.get_keyword_name(keyword_id)
+                    for keyword_id in range(chief.get_keywords_count())]
+        strings = {str(synonym): keyword_id << 1
+                   for synonym, keyword_id in chief._synonym_ids.items()}
+        # keywords are matched directly, before any synonyms and regexps
+        strings.update((keyword, (keyword_id << 1) | 1)
+                       for keyword, keyword_id in chief._keyword_ids.items())
+
+        table_size = 8
+        while table_size < 2 * len(strings):
+            table_size <<= 1
+
+        body = bytearray()
+
+        def add(data):
+            offset = _HEADER.size + len(body)
+            body.extend(_LENGTH.pack(len(data)))
+            body.extend(data)
+            return offset
+
+        index = []
+        for keyword in keywords:
+            # keyword record - keyword followed by its configuration
+            index.append(add(keyword.encode(errors='surrogatepass')))
+            add(json.dumps(chief.keywords.get(keyword, {})).encode())
+
+        table = [None] * table_size
+        for string, value in strings.items():
+            encoded = string.encode(errors='surrogatepass')
+            slot = _hash(encoded) & (table_size - 1)
+            while table[slot] is not None:
+                slot = (slot + 1) & (table_size - 1)
+            table[slot] = (_hash(encoded), add(encoded), value)
+
+        index_offset = _HEADER.size + len(body)
+        for record_offset in index:
+            body.extend(_INDEX_ENTRY.pack(record_offset))
+
+        occurrence_counts_offset = _HEADER.size + len(body)
+        for keyword_id in range(len(keywords)):
+            body.extend(_OCCURRENCE_COUNT.pack(chief.get_occurrence_count(keyword_id)))
+
+        table_offset = _HEADER.size + len(body)
+        for entry in table:
+            body.extend(_SLOT.pack(*(entry or (0, 0, 0))))
+
+        regexps = json.dumps([[keyword_id, regexp.pattern]
+                              for keyword_id, regexp in chief._regexps]).encode()
+        regexps_offset = _HEADER.size + len(body)
+        body.extend(regexps)
+        serialized_metadata = json.dumps(metadata or {}).encode()
+        body.extend(serialized_metadata)
+
+        occurrence_count_total = sum(value.get('occurrence_count', 0)
+                                     for value in chief.keywords.values())
+        header = _HEADER.pack(_MAGIC, _VERSION, len(keywords), table_size,
+                              chief.compute_ngram_size(), occurrence_count_total, index_offset,
+                              occurrence_counts_offset, table_offset, regexps_offset, len(regexps),
+                              len(serialized_metadata), hashlib.sha256(body).digest())
+
+        with open(database_file, 'wb') as f:
+            f.write(header)
+            f.write(body)
+
+        _logger.debug("Compiled %d keywords with %d synonyms to '%s'",
+                      len(keywords), len(strings), database_file)
+
+    def _read_string(self, offset):
+        """Read string stored at the given offset."""
+        start = offset + _LENGTH.size
+        end = start + _LENGTH.unpack_from(self._mmap, offset)[0]
+        return self._mmap[start:end].decode(errors='surrogatepass')
+
+    def _read_keyword(self, index):
+        """Read keyword with the given index."""
+        offset = _INDEX_ENTRY.unpack_from(self._mmap,
+                                          self._index_offset + index * _INDEX_ENTRY.size)[0]
+        return self._read_string(offset)
+
+    def _read_entry(self, index):
+        """Read configuration of keyword with the given index."""
+        offset = _INDEX_ENTRY.unpack_from(self._mmap,
+                                          self._index_offset + index * _INDEX_ENTRY.size)[0]
+        offset += _LENGTH.size + _LENGTH.unpack_from(self._mmap, offset)[0]
+        return json.loads(self._read_string(offset))
+
+    def _find(self, token):
+        """Find token in hash table.
+
+        :return: index of keyword shifted by one, the lowest bit set if the token is a keyword,
+                 None if the token is neither a keyword nor a synonym
+        """
+        encoded = token.encode(errors='surrogatepass')
+        token_hash = _hash(encoded)
+        slot = token_hash & self._table_mask
+
+        while True:
+            slot_hash, offset, value = _SLOT.unpack_from(self._mmap,
+                                                         self._table_offset + slot * _SLOT.size)
+            if not offset:
+                return None
+
+            if slot_hash == token_hash:
+                start = offset + _LENGTH.size
+                if self._mmap[start:start + _LENGTH.unpack_from(self._mmap, offset)[0]] == encoded:
+                    return value
+
+            slot = (slot + 1) & self._table_mask
+
+    def _find_keyword(self, keyword):
+        """Find index of the given keyword, None if there is no such keyword."""
+        if not isinstance(keyword, str):
+            return None
+
+        value = self._find(keyword)
+        return value >> 1 if value is not None and value & 1 else None
+
+    @property
+    def keywords(self):
+        """Get read-only mapping of keywords, entries are read from the database on access."""
+        return self._keywords_prop
+
+    def get_keywords_count(self):
+        """Get number of keywords registered."""
+        return self._keywords_count
+
+    def get_average_occurrence_count(self):
+        """Get average keyword occurrence count."""
+        return self._occurrence_count_total / self._keywords_count
+
+    def compute_ngram_size(self):
+        """Get ngram size computed when keywords were compiled.
+
+        :return: computed ngram size
+        :rtype: int
+        """
+        return self._ngram_size
+
+    def get_synonyms(self, keyword):
+        """Get all synonyms to the given keyword.
+
+        :param keyword: keyword to check synonyms against.
+        :type keyword: str
+        :return: a list of synonyms
+        :rtype: list
+        """
+        index = self._find_keyword(keyword)
+        return self._read_entry(index).get('synonyms', []) if index is not None else []
+
+    def get_keyword_id(self, token):
+        """Get id of keyword for a token.
+
+        :param token: token for which keyword should be found.
+        :type token: str
+        :return: id of keyword for the given token or None if no keyword was found
+        :rtype: int
+        """
+        value = self._find(token)
+        if value is not None and value & 1:
+            return value >> 1
+
+        return self._match_regexps(token, value >> 1 if value is not None else None)
+
+    def get_keyword_name(self, keyword_id):
+        """Get keyword with the given id.
+
+        :param keyword_id: id of keyword, see get_keyword_id()
+        :return: keyword
+        :rtype: str
+        """
+        return self._read_keyword(keyword_id)
+
+    def get_occurrence_count(self, keyword_id):
+        """Get occurrence count of keyword with the given id as stated in keywords file.
+
+        :param keyword_id: id of keyword, see get_keyword_id()
+        :return: occurrence count
+        :rtype: float
+        """
+        return _OCCURRENCE_COUNT.unpack_from(
+            self._mmap, self._occurrence_counts_offset + keyword_id * _OCCURRENCE_COUNT.size)[0]
+
+    def is_keyword(self, word):
+        """Check whether the given word is a keyword.
+
+        :param word: keyword to be checked
+        :return: True if the given word is a keyword
+        """
+        return self._find_keyword(word) is not None
@@ -50,6 +50,13 @@ class Corpus(object):
         self._entries.append(entry)
         self._names.append(name)
 
+    def items(self):
+        """Iterate over corpus entries.
+
+        :return: generator of tuples - name and a list of extracted tokens
+        """
+        return zip(self._names, self._entries)
+
     def dump_pickle(self, path):
         """Dump whole corpus to a file using pickle.
 
@@ -16,8 +16,20 @@ DEFAULT_STEMMER = None
 DEFAULT_LEMMATIZER = None
 # DEFAULT_LEMMATIZER = Lemmatizer.get_lemmatizer()
 
+# Maximum number of distinct tokens whose lemmatized and stemmed form is kept by tokenizer.
+NORMALIZED_TOKENS_CACHE_SIZE = 100000
+
 # Filter keywords that have low occurrence.
 OCCURRENCE_COUNT_FILTER = 2
 
 # Scoring mechanism used.
 DEFAULT_SCORER = 'Count'
+
+# Cache responses of remote resources and use conditional requests to refresh them.
+USE_HTTP_CACHE = True
+
+# Maximum size of cached HTTP responses in bytes.
+HTTP_CACHE_MAX_SIZE = 1024 ** 3
+
+# Maximum size of cached keywords lookup results in bytes.
+RESULT_CACHE_MAX_SIZE = 256 * 1024 ** 2
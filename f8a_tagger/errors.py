@@ -20,3 +20,7 @@ class RemoteDependencyMissingError(Exception):
 
 class InstallPrepareError(Exception):
     """Raised when prepare() was not called after installation."""
+
+
+class ParserLimitExceededError(Exception):
+    """Raised when parsing of a document exceeds time or memory limit."""
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""Persistent HTTP response cache with conditional requests."""
+
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+import requests
+from requests.utils import get_encoding_from_headers
+
+import daiquiri
+import f8a_tagger.defaults as defaults
+from f8a_tagger.utils import get_files_dir
+
+_logger = daiquiri.getLogger(__name__)
+
+_HTTP_CACHE = None
+_HTTP_CACHE_LOCK = threading.Lock()
+
+
+def get_http_cache():
+    """Get HTTP cache shared by collectors and remote resources retrieval."""
+    global _HTTP_CACHE  # pylint: disable=global-statement
+
+    with _HTTP_CACHE_LOCK:
+        if _HTTP_CACHE is None:
+            _HTTP_CACHE = HttpCache(enabled=defaults.USE_HTTP_CACHE)
+
+    return _HTTP_CACHE
+
+
+class CachedResponse(object):
+    """Response served by HTTP cache, either fetched or read from the cache."""
+
+    def __init__(self, url, status_code, headers, content=None, path=None, from_cache=False,
+                 temporary=False):
+        # pylint: disable=too-many-arguments
+        """Construct.
+
+        :param url: requested URL
+        :param status_code: HTTP status code, 200 for responses served from the cache
+        :param headers: response headers
+        :param content: response body, if kept in memory
+        :param path: path to file with response body, if stored in the cache
+        :param from_cache: True if body was not transferred as server responded with 304
+        :param temporary: True if path points to a temporary file removed on close()
+        """
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.path = path
+        self.from_cache = from_cache
+        self._content = content
+        self._temporary = temporary
+
+    def __enter__(self):
+        """Use response as a context manager, see close()."""
+        return self
+
+    def __exit__(self, *args):
+        """Release resources held by response."""
+        self.close()
+
+    def close(self):
+        """Remove temporary file holding response body, if any."""
+        if self._temporary and self.path is not None:
+            os.remove(self.path)
+            self.path = None
+
+    @property
+    def ok(self):  # pylint: disable=invalid-name
+        """Check whether the response was successful."""
+        return 200 <= self.status_code < 400
+
+    @property
+    def content(self):
+        """Get response body."""
+        if self._content is None and self.path is not None:
+            with open(self.path, 'rb') as f:
+                return f.read()
+        return self._content or b''
+
+    @property
+    def text(self):
+        """Get response body as text."""
+        encoding = get_encoding_from_headers(self.headers) or 'utf-8'
+        return self.content.decode(encoding, errors='replace')
+
+
+class HttpCache(object):
+    """Persistent on-disk HTTP response cache.
+
+    Responses carrying ETag or Last-Modified headers are stored on disk, subsequent requests
+    for the same URL are sent as conditional requests and 304 responses are served from
+    the cache. The total size of cached responses is bounded, least recently used responses
+    are evicted first.
+    """
+
+    _INDEX_FILE = 'index.sqlite'
+    _CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, cache_dir=None, max_size=None, enabled=True):
+        """Construct.
+
+        :param cache_dir: directory where cached responses should be stored
+        :param max_size: maximum size of cached responses in bytes
+        :param enabled: if False, all requests are passed directly to server
+        """
+        self._enabled = enabled
+        self._cache_dir = cache_dir or os.path.join(get_files_dir(), 'http-cache')
+        self._max_size = max_size if max_size is not None else defaults.HTTP_CACHE_MAX_SIZE
+        self._lock = threading.Lock()
+        self._connection = None
+        self._total_size = 0
+
+        if enabled:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            self._connection = sqlite3.connect(os.path.join(self._cache_dir, self._INDEX_FILE),
+                                               check_same_thread=False)
+            self._connection.execute("CREATE TABLE IF NOT EXISTS entries ("
+                                     "key TEXT PRIMARY KEY, url TEXT, etag TEXT, "
+                                     "last_modified TEXT, content_type TEXT, size INTEGER, "
+                                     "last_access REAL)")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS entries_last_access "
+                                     "ON entries (last_access)")
+            self._connection.commit()
+            self._total_size = self._connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    @property
+    def enabled(self):
+        """Check whether the cache is enabled."""
+        return self._enabled
+
+    @property
+    def total_size(self):
+        """Get total size of cached responses in bytes."""
+        return self._total_size
+
+    @staticmethod
+    def _key(url):
+        """Compute cache key for the given URL."""
+        return hashlib.sha256(url.encode()).hexdigest()
+
+    def _body_path(self, key):
+        """Get path to file with cached response body."""
+        return os.path.join(self._cache_dir, key[:2], key)
+
+    def _get_entry(self, url):
+        """Get cache index entry for the given URL, if any."""
+        if not self._enabled:
+            return None
+
+        with self._lock:
+            return self._connection.execute(
+                "SELECT key, etag, last_modified, content_type FROM entries WHERE key = ?",
+                (self._key(url),)).fetchone()
+
+    def get_conditional_headers(self, url):
+        """Get headers for a conditional request on the given URL.
+
+        :param url: URL to be requested
+        :return: request headers, empty if the URL is not cached
+        :rtype: dict
+        """
+        entry = self._get_entry(url)
+        if entry is None or not os.path.isfile(self._body_path(entry[0])):
+            return {}
+
+        headers = {}
+        if entry[1]:
+            headers['If-None-Match'] = entry[1]
+        if entry[2]:
+            headers['If-Modified-Since'] = entry[2]
+        return headers
+
+    def lookup(self, url):
+        """Mark the cached response as recently used and get its path and headers.
+
+        :param url: requested URL
+        :return: tuple - path to file with response body and stored response headers
+        """
+        entry = self._get_entry(url)
+        if entry is None:
+            return None, None
+
+        with self._lock:
+            self._connection.execute("UPDATE entries SET last_access = ? WHERE key = ?",
+                                     (time.time(), entry[0]))
+            self._connection.commit()
+
+        headers = {}
+        for header, value in zip(('ETag', 'Last-Modified', 'Content-Type'), entry[1:]):
+            if value:
+                headers[header] = value
+
+        return self._body_path(entry[0]), headers
+
+    @staticmethod
+    def is_cacheable(status_code, headers):
+        """Check whether a response can be validated later on, so it is worth caching."""
+        return status_code == 200 and \
+            (headers.get('ETag') is not None or headers.get('Last-Modified') is not None)
+
+    def store(self, url, headers, chunks):
+        """Store response in the cache.
+
+        :param url: requested URL
+        :param headers: response headers
+        :param chunks: iterable of response body chunks (bytes)
+        :return: path to file with stored response body
+        """
+        key = self._key(url)
+        path = self._body_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        size = 0
+        temp_path = '%s.%d.%d.tmp' % (path, os.getpid(), threading.get_ident())
+        with open(temp_path, 'wb') as f:
+            for chunk in chunks:
+                size += len(chunk)
+                f.write(chunk)
+        os.replace(temp_path, path)
+
+        with self._lock:
+            previous = self._connection.execute("SELECT size FROM entries WHERE key = ?",
+                                                (key,)).fetchone()
+            self._connection.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                     (key, url, headers.get('ETag'),
+                                      headers.get('Last-Modified'),
+                                      headers.get('Content-Type'), size, time.time()))
+            self._connection.commit()
+            self._total_size += size - (previous[0] if previous else 0)
+            self._evict(keep=key)
+
+        return path
+
+    def _evict(self, keep=None):
+        """Evict least recently used responses until the cache fits in its size limit."""
+        while self._total_size > self._max_size:
+            entry = self._connection.execute(
+                "SELECT key, size FROM entries WHERE key != ? ORDER BY last_access LIMIT 1",
+                (keep or '',)).fetchone()
+            if entry is None:
+                break
+
+            _logger.debug("Evicting cached response '%s' of size %d", entry[0], entry[1])
+            self._connection.execute("DELETE FROM entries WHERE key = ?", (entry[0],))
+            try:
+                os.remove(self._body_path(entry[0]))
+            except FileNotFoundError:
+                pass
+            self._total_size -= entry[1]
+
+        self._connection.commit()
+
+    def get(self, url, session=None, to_file=False):
+        """Perform GET request, use cached response if it was not modified.
+
+        :param url: URL to be requested
+        :param session: requests session to be used, if any
+        :param to_file: stream response body to a file even if the response is not cacheable,
+                        the file is removed once the response is closed
+        :return: response
+        :rtype: CachedResponse
+        """
+        headers = self.get_conditional_headers(url)
+        response = (session or requests).get(url, headers=headers, stream=True)
+
+        if response.status_code == 304 and headers:
+            response.close()
+            path, cached_headers = self.lookup(url)
+            if path is not None and os.path.isfile(path):
+                _logger.debug("Response for '%s' not modified, using cached one", url)
+                return CachedResponse(url, 200, cached_headers, path=path, from_cache=True)
+            # evicted in the meantime
+            response = (session or requests).get(url, stream=True)
+
+        if self._enabled and self.is_cacheable(response.status_code, response.headers):
+            path = self.store(url, response.headers, response.iter_content(self._CHUNK_SIZE))
+            return CachedResponse(url, response.status_code, response.headers, path=path)
+
+        if to_file and response.status_code == 200:
+            with tempfile.NamedTemporaryFile(mode='wb', delete=False) as f:
+                for chunk in response.iter_content(self._CHUNK_SIZE):
+                    f.write(chunk)
+            return CachedResponse(url, response.status_code, response.headers, path=f.name,
+                                  temporary=True)
+
+        return CachedResponse(url, response.status_code, response.headers,
+                              content=response.content)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Aggregation of keywords from multiple keywords files."""
+
+import daiquiri
+from f8a_tagger.keywords_chief import KeywordsChief
+
+_logger = daiquiri.getLogger(__name__)
+
+
+class KeywordsAggregator(object):
+    """Merge keywords configuration, synonyms and regexps are kept as sets updated in place."""
+
+    def __init__(self):
+        """Construct."""
+        # keyword -> configuration, lists are stored as sets
+        self._keywords = {}
+
+    def __len__(self):
+        """Get number of aggregated keywords."""
+        return len(self._keywords)
+
+    def add(self, keyword, value):
+        """Add a keyword with its configuration.
+
+        :param keyword: keyword to be added
+        :param value: keyword configuration - occurrence count, synonyms, regexps, ...
+        :type value: dict
+        """
+        keyword = str(keyword)
+        if not KeywordsChief.matches_keyword_pattern(keyword):
+            _logger.debug("Dropping keyword '%s' as it does not match keyword pattern.", keyword)
+            return
+
+        entry = self._keywords.get(keyword)
+        if entry is None:
+            entry = self._keywords[keyword] = {}
+
+        for conf, items in (value or {}).items():
+            conf = str(conf)
+            if conf == 'occurrence_count':
+                entry[conf] = entry.get(conf, 0) + (items or 0)
+                continue
+
+            if conf not in entry:
+                entry[conf] = set()
+            if items is None:
+                continue
+            if not isinstance(items, (list, tuple, set)):
+                items = (items,)
+            entry[conf].update(items)
+
+    def update(self, keywords):
+        """Add keywords with their configuration.
+
+        :param keywords: iterable of tuples - keyword and its configuration
+        """
+        for keyword, value in keywords:
+            self.add(keyword, value)
+
+    def merge(self, other):
+        """Merge keywords aggregated by other aggregator, other aggregator is consumed.
+
+        :param other: aggregator to be merged
+        :type other: f8a_tagger.keywords_aggregator.KeywordsAggregator
+        :return: self
+        """
+        # pylint: disable=protected-access
+        for keyword, other_entry in other._keywords.items():
+            entry = self._keywords.get(keyword)
+            if entry is None:
+                self._keywords[keyword] = other_entry
+                continue
+
+            for conf, items in other_entry.items():
+                if conf == 'occurrence_count':
+                    entry[conf] = entry.get(conf, 0) + items
+                elif conf in entry:
+                    entry[conf] |= items
+                else:
+                    entry[conf] = items
+
+        other._keywords = {}
+        return self
+
+    def get_keywords(self, no_synonyms=False, occurrence_count_filter=None):
+        """Get aggregated keywords.
+
+        :param no_synonyms: do not compute synonyms for keywords
+        :param occurrence_count_filter: filter out keywords with occurrence count not greater
+                                        than the given one, if greater than 1
+        :return: aggregated keywords with their configuration
+        :rtype: dict
+        """
+        result = {}
+
+        for keyword, entry in self._keywords.items():
+            if occurrence_count_filter and occurrence_count_filter > 1 and \
+                    entry.get('occurrence_count', 1) <= occurrence_count_filter:
+                continue
+
+            value = {}
+            for conf, items in entry.items():
+                if isinstance(items, set):
+                    items = sorted(items, key=str)
+                value[conf] = items
+
+            if not no_synonyms:
+                synonyms = entry.get('synonyms', set()) | \
+                    set(KeywordsChief.compute_synonyms(keyword))
+                value['synonyms'] = sorted(synonyms, key=str)
+
+            result[keyword] = value
+
+        return result
@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """Keywords loading and handling for fabric8-analytics."""
 
+from array import array
+from collections import Counter
+from collections.abc import Mapping
 import io
 import os
 import re
@@ -13,6 +16,44 @@ from f8a_tagger.errors import InvalidInputError
 _logger = daiquiri.getLogger(__name__)
 
 
+class _KeywordsView(Mapping):
+    """Read-only view of keywords of a keywords chief in the form of keywords file.
+
+    Entries are built from the internal store on access, empty configuration is omitted and
+    compiled regexps are reported as patterns.
+    """
+
+    def __init__(self, keywords, keywords_count):
+        self._keywords = keywords
+        self._keywords_count = keywords_count
+
+    @staticmethod
+    def _entry(entry):
+        result = {}
+        for conf, value in entry.items():
+            if not value:
+                continue
+            if conf == 'regexp':
+                value = [regexp.pattern for regexp in value]
+            result[conf] = value
+
+        return result
+
+    def __getitem__(self, keyword):
+        entry = self._entry(self._keywords[keyword])
+        if not entry:
+            raise KeyError(keyword)
+        return entry
+
+    def __iter__(self):
+        for keyword, entry in self._keywords.items():
+            if any(entry.values()):
+                yield keyword
+
+    def __len__(self):
+        return self._keywords_count
+
+
 class KeywordsChief(object):
     """Keeping and interacting with keywords."""
 
@@ -79,6 +120,28 @@ class KeywordsChief(object):
                                       synonym, new_synonym, keyword)
                         entry['synonyms'][idx] = new_synonym
 
+        self._build_index()
+
+    def _build_index(self):
+        """Assign dense integer ids to keywords, index their synonyms and occurrence counts."""
+        self._keyword_names = list(self._keywords.keys())
+        self._keyword_ids = {keyword: keyword_id
+                             for keyword_id, keyword in enumerate(self._keyword_names)}
+        self._occurrence_counts = array('d', (entry['occurrence_count']
+                                              for entry in self._keywords.values()))
+        self._occurrence_count_total = sum(self._occurrence_counts)
+        # keywords with no configuration at all are not reported, see keywords
+        self._keywords_count = sum(1 for entry in self._keywords.values() if any(entry.values()))
+        # the first keyword with the synonym wins, as keywords are checked in order
+        self._synonym_ids = {}
+        # regexps in order of keywords - keyword id and compiled regexp
+        self._regexps = []
+        for keyword_id, entry in enumerate(self._keywords.values()):
+            for synonym in entry['synonyms']:
+                self._synonym_ids.setdefault(synonym, keyword_id)
+            for regexp in entry['regexp']:
+                self._regexps.append((keyword_id, regexp))
+
     def read_keyword_file(self, keyword_file):
         """Read keyword file."""
         if isinstance(keyword_file, str) or keyword_file is None:
@@ -91,38 +154,22 @@ class KeywordsChief(object):
 
     @property
     def keywords(self):
-        """Get keywords used by keywords chief instance."""
-        if self._keywords_prop is None:
-            self._keywords_prop = {}
-
-            for keyword in self._keywords.keys():
-                for conf in self._keywords[keyword].keys():
-                    if not self._keywords[keyword][conf]:
-                        continue
+        """Get read-only mapping of keywords used by keywords chief instance.
 
-                    if keyword not in self._keywords_prop:
-                        self._keywords_prop[keyword] = {}
-
-                    if conf == 'regexp':
-                        self._keywords_prop[keyword]['regexp'] = []
-                        for regexp in self._keywords[keyword]['regexp']:
-                            self._keywords_prop[keyword]['regexp'].append(regexp.pattern)
-                    else:
-                        self._keywords_prop[keyword][conf] = self._keywords[keyword][conf]
+        Keywords are in the form of keywords file, entries are built on access.
+        """
+        if self._keywords_prop is None:
+            self._keywords_prop = _KeywordsView(self._keywords, self._keywords_count)
 
         return self._keywords_prop
 
     def get_keywords_count(self):
         """Get number of keywords registered."""
-        return len(self.keywords.keys())
+        return self._keywords_count
 
     def get_average_occurrence_count(self):
         """Get average keyword occurrence count."""
-        usage = 0
-        for value in self.keywords.values():
-            usage += value['occurrence_count']
-
-        return usage / self.get_keywords_count()
+        return self._occurrence_count_total / self._keywords_count
 
     def compute_ngram_size(self):
         """Compute ngram size based on keywords configuration.
@@ -150,6 +197,53 @@ class KeywordsChief(object):
         entry = self._keywords.get(keyword)
         return entry.get('synonyms', []) if entry else []
 
+    def _match_regexps(self, token, synonym_id=None):
+        """Match token against regexps of keywords preceding the keyword with matching synonym.
+
+        :param token: token to be matched
+        :param synonym_id: id of the first keyword with the token as synonym, if any
+        :return: id of the keyword found, None if no keyword was found
+        """
+        for keyword_id, regexp in self._regexps:
+            if synonym_id is not None and keyword_id >= synonym_id:
+                break
+            if regexp.fullmatch(token):
+                return keyword_id
+
+        return synonym_id
+
+    def get_keyword_id(self, token):
+        """Get id of keyword for a token.
+
+        :param token: token for which keyword should be found.
+        :type token: str
+        :return: id of keyword for the given token or None if no keyword was found
+        :rtype: int
+        """
+        keyword_id = self._keyword_ids.get(token)
+        if keyword_id is not None:
+            return keyword_id
+
+        return self._match_regexps(token, self._synonym_ids.get(token))
+
+    def get_keyword_name(self, keyword_id):
+        """Get keyword with the given id.
+
+        :param keyword_id: id of keyword, see get_keyword_id()
+        :return: keyword
+        :rtype: str
+        """
+        return self._keyword_names[keyword_id]
+
+    def get_occurrence_count(self, keyword_id):
+        """Get occurrence count of keyword with the given id as stated in keywords file.
+
+        :param keyword_id: id of keyword, see get_keyword_id()
+        :return: occurrence count
+        :rtype: float
+        """
+        return self._occurrence_counts[keyword_id]
+
     def get_keyword(self, token):
         """Get keyword for a token.
 
@@ -157,25 +251,30 @@ class KeywordsChief(object):
         :type token: str
         :return: keyword for the given token or None if no keyword was found
         """
-        if token in self._keywords.keys():
-            _logger.debug("Found direct keyword '%s'", token)
-            return token
+        keyword_id = self.get_keyword_id(token)
+        if keyword_id is None:
+            return None
 
-        for keyword, entry in self._keywords.items():
-            if not entry:
-                continue
+        keyword = self.get_keyword_name(keyword_id)
+        _logger.debug("Found keyword '%s' for '%s'", keyword, token)
+        return keyword
 
-            if token in (entry.get('synonyms') or []):  # pylint: disable=superfluous-parens
-                _logger.debug("Found keyword '%s' based on synonym '%s'", keyword, token)
-                return keyword
+    def extract_keyword_ids(self, tokens):
+        """Extract ids of all keywords.
 
-            for regexp in (entry.get('regexp') or []):  # pylint: disable=superfluous-parens
-                if re.fullmatch(regexp, token):
-                    _logger.debug("Found keyword '%s' based regexp match '%s' for '%s'", keyword,
-                                  regexp.pattern, token)
-                    return keyword
+        :param tokens: tokens for which keywords should be gathered.
+        :return: ids of keywords with their occurrence count, in order of first occurrence
+        :rtype: collections.Counter
+        """
+        keyword_ids = Counter()
+        get_keyword_id = self.get_keyword_id
 
-        return None
+        for token in tokens:
+            keyword_id = get_keyword_id(token)
+            if keyword_id is not None:
+                keyword_ids[keyword_id] += 1
+
+        return keyword_ids
 
     def extract_keywords(self, tokens):
         """Extract all keywords.
@@ -184,14 +283,8 @@ class KeywordsChief(object):
         :return: dictionary of keywords with they occurrence count
         :rtype: dict
         """
-        keywords = dict()
-
-        for token in tokens:
-            keyword = self.get_keyword(token)
-            if keyword:
-                keywords[keyword] = keywords.get(keyword, 0) + 1
-
-        return keywords
+        return {self.get_keyword_name(keyword_id): count
+                for keyword_id, count in self.extract_keyword_ids(tokens).items()}
 
     @staticmethod
     def filter_keyword(keyword):
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Differences of keywords databases and incremental re-tagging."""
+
+import re
+
+import daiquiri
+from f8a_tagger.utils import iter_keywords_file
+
+_logger = daiquiri.getLogger(__name__)
+
+
+def _matching_entry(entry):
+    """Get configuration of keyword entry which affects matching of tokens."""
+    entry = entry or {}
+    return set(entry.get('synonyms') or []), set(entry.get('regexp') or [])
+
+
+def _index_entry(entry):
+    """Get synonyms, regexps and occurrence count of keyword entry in a comparable form."""
+    entry = entry or {}
+    return (frozenset(map(str, entry.get('synonyms') or ())),
+            frozenset(map(str, entry.get('regexp') or ())),
+            entry.get('occurrence_count'))
+
+
+def _record_difference(section, keyword, items):
+    """Record differing synonyms or regexps of a keyword, if any."""
+    if items:
+        section[keyword] = sorted(items)
+
+
+def diff_keywords_entries(old_entries, new_entries):
+    """Compute differences of two keywords databases.
+
+    Only old entries are kept in memory (as sets), new entries are compared as they come, so
+    new entries can be streamed, e.g. using f8a_tagger.utils.iter_keywords_file().
+
+    :param old_entries: iterable of tuples - keyword and its configuration
+    :param new_entries: iterable of tuples - keyword and its configuration
+    :return: added and removed keywords, added and removed synonyms and regexps keyed by keyword
+             present in both databases and changed occurrence counts (old and new) keyed by
+             keyword
+    :rtype: dict
+    """
+    old_index = {str(keyword): _index_entry(entry) for keyword, entry in old_entries}
+    result = {
+        'added_keywords': [],
+        'removed_keywords': [],
+        'added_synonyms': {},
+        'removed_synonyms': {},
+        'added_regexps': {},
+        'removed_regexps': {},
+        'changed_occurrence_counts': {}
+    }
+
+    for keyword, entry in new_entries:
+        keyword = str(keyword)
+        old = old_index.pop(keyword, None)
+        if old is None:
+            result['added_keywords'].append(keyword)
+            continue
+
+        old_synonyms, old_regexps, old_count = old
+        new_synonyms, new_regexps, new_count = _index_entry(entry)
+        _record_difference(result['added_synonyms'], keyword, new_synonyms - old_synonyms)
+        _record_difference(result['removed_synonyms'], keyword, old_synonyms - new_synonyms)
+        _record_difference(result['added_regexps'], keyword, new_regexps - old_regexps)
+        _record_difference(result['removed_regexps'], keyword, old_regexps - new_regexps)
+        if old_count != new_count:
+            result['changed_occurrence_counts'][keyword] = [old_count, new_count]
+
+    result['added_keywords'].sort()
+    result['removed_keywords'] = sorted(old_index.keys())
+    return result
+
+
+def diff_keywords_files(old_path, new_path):
+    """Compute differences of two keywords files, the new one is not loaded to memory.
+
+    :param old_path: path to old keywords file, YAML or JSON
+    :param new_path: path to new keywords file, YAML or JSON
+    :return: differences as computed by diff_keywords_entries()
+    :rtype: dict
+    """
+    return diff_keywords_entries(iter_keywords_file(old_path), iter_keywords_file(new_path))
+
+
+def diff_keywords(old_keywords, new_keywords):
+    """Compute keywords which were added, removed or whose synonyms or regexps changed.
+
+    :param old_keywords: old keywords as provided by KeywordsChief.keywords
+    :param new_keywords: new keywords as provided by KeywordsChief.keywords
+    :return: tuple of sets - added, removed and changed keywords
+    """
+    diff = diff_keywords_entries(old_keywords.items(), new_keywords.items())
+    changed = set()
+    for section in ('added_synonyms', 'removed_synonyms', 'added_regexps', 'removed_regexps'):
+        changed.update(diff[section].keys())
+
+    return set(diff['added_keywords']), set(diff['removed_keywords']), changed
+
+
+class KeywordsDelta(object):
+    """Re-tag tokens affected by a change of keywords database."""
+
+    def __init__(self, old_chief, new_chief):
+        """Construct.
+
+        :param old_chief: keywords chief with keywords used to compute previous results
+        :param new_chief: keywords chief with updated keywords
+        """
+        self._old_chief = old_chief
+        self._new_chief = new_chief
+        self.added, self.removed, self.changed = diff_keywords(old_chief.keywords,
+                                                               new_chief.keywords)
+
+        # only tokens matching affected keywords (in either version) can be tagged differently
+        self._tokens = set()
+        regexps = set()
+        for keywords in (old_chief.keywords, new_chief.keywords):
+            for keyword in self.affected_keywords & set(keywords.keys()):
+                synonyms, keyword_regexps = _matching_entry(keywords[keyword])
+                self._tokens.add(keyword)
+                self._tokens.update(synonyms)
+                regexps.update(keyword_regexps)
+        self._regexps = [re.compile(regexp) for regexp in regexps]
+
+    @property
+    def affected_keywords(self):
+        """Get keywords which were added, removed or changed."""
+        return self.added | self.removed | self.changed
+
+    def _is_affected(self, token):
+        """Check whether tagging of token can differ between old and new keywords."""
+        if token in self._tokens:
+            return True
+        return any(re.fullmatch(regexp, token) for regexp in self._regexps)
+
+    def apply(self, tokens, keywords):
+        """Update keywords found in tokens with the old keywords database.
+
+        :param tokens: tokens of a document, including ngrams, as stored in corpus
+        :param keywords: keywords with occurrence counts found using the old keywords database
+        :return: keywords with occurrence counts as found using the new keywords database
+        :rtype: dict
+        """
+        result = dict(keywords)
+        for keyword in self.removed:
+            result.pop(keyword, None)
+
+        if not self._tokens and not self._regexps:
+            return result
+
+        for token in tokens:
+            if not self._is_affected(token):
+                continue
+
+            old_keyword = self._old_chief.get_keyword(token)
+            new_keyword = self._new_chief.get_keyword(token)
+            if old_keyword == new_keyword:
+                continue
+
+            if old_keyword is not None and old_keyword in result:
+                result[old_keyword] -= 1
+                if result[old_keyword] <= 0:
+                    del result[old_keyword]
+
+            if new_keyword is not None:
+                result[new_keyword] = result.get(new_keyword, 0) + 1
+
+        return result
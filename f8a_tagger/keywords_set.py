@@ -1,38 +1,128 @@
 #!/usr/bin/env python3
 """Keywords set handling for collectors."""
 
+from collections import Counter
+from collections.abc import Mapping
+import json
+import sys
+
+import yaml
+
+# libyaml based dumper is considerably faster, if available
+_YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+
+def _intern(keyword):
+    """Intern keyword, so equal keywords collected by different collectors share memory."""
+    return sys.intern(keyword) if isinstance(keyword, str) else keyword
+
 
 class KeywordsSet(object):
-    """Manage keywords set for collectors."""
+    """Manage keywords set for collectors.
+
+    Keywords are interned and stored in a flat counter of occurrences.
+    """
 
     def __init__(self):
         """Initialize keywords set."""
-        self._keywords_set = {}
+        self._counts = Counter()
+
+    def __contains__(self, keyword):
+        """Check whether keyword is in set."""
+        return keyword in self._counts
 
     @property
     def keywords(self):
-        """Get stored keywords."""
-        return self._keywords_set
+        """Get stored keywords in the form of keywords file, see to_dict()."""
+        return self.to_dict()
+
+    def get_occurrence_count(self, keyword):
+        """Get occurrence count of a keyword, 0 if the keyword is not in set."""
+        return self._counts.get(keyword, 0)
 
     def add(self, keyword, occurrence_count=1):
         """Add a keyword to set (count additions)."""
-        if keyword not in self._keywords_set:
-            self._keywords_set[keyword] = {}
-        self._keywords_set[keyword]['occurrence_count'] = \
-            self._keywords_set[keyword].get('occurrence_count', 0) + occurrence_count
+        if keyword in self._counts:
+            self._counts[keyword] += occurrence_count
+        else:
+            self._counts[_intern(keyword)] = occurrence_count
+
+    def update(self, keywords):
+        """Add keywords to set in bulk.
+
+        :param keywords: iterable of keywords, each occurrence counted once, or a mapping of
+                         keywords to their occurrence counts
+        :return: self
+        :rtype: f8a_tagger.keywords_set.KeywordsSet
+        """
+        if isinstance(keywords, Mapping):
+            for keyword, occurrence_count in keywords.items():
+                self.add(keyword, occurrence_count)
+        else:
+            self._counts.update(map(_intern, keywords))
+
+        return self
+
+    def merge(self, other):
+        """Merge other keywords set, occurrence counts of keywords present in both are summed.
+
+        :param other: second keywords set to be merged
+        :return: self
+        :rtype: f8a_tagger.keywords_set.KeywordsSet
+        """
+        # pylint: disable=protected-access
+        self._counts.update(other._counts)
+        return self
 
     def union(self, other):
         """Perform union on two keywords set.
 
+        Occurrence counts of keywords already present in this set are kept, see merge() for
+        summing them.
+
         :param other: second keywords set for which union should be done
         :return: self
         :rtype: f8a_tagger.keywords_set.KeywordsSet
         """
-        for keyword in other.keywords.keys():
-            if keyword in self._keywords_set.keys():
-                self._keywords_set[keyword]['occurrence_count'] = \
-                    self._keywords_set[keyword].get('occurrence_count', 1)
-            else:
-                self._keywords_set[keyword] = other.keywords[keyword]
+        # pylint: disable=protected-access
+        for keyword, occurrence_count in other._counts.items():
+            if keyword not in self._counts:
+                self._counts[keyword] = occurrence_count
 
         return self
+
+    def to_dict(self):
+        """Convert keywords set to the form of keywords file as expected by aggregate().
+
+        :return: keywords with their occurrence counts
+        :rtype: dict
+        """
+        return {keyword: {'occurrence_count': occurrence_count}
+                for keyword, occurrence_count in self._counts.items()}
+
+    @classmethod
+    def from_dict(cls, keywords):
+        """Construct keywords set from keywords in the form of keywords file.
+
+        :param keywords: keywords with their configuration, see to_dict()
+        :return: keywords set
+        :rtype: f8a_tagger.keywords_set.KeywordsSet
+        """
+        instance = cls()
+        for keyword, value in keywords.items():
+            instance.add(keyword, (value or {}).get('occurrence_count', 1))
+
+        return instance
+
+    def dump(self, stream, fmt='yaml'):
+        """Serialize keywords set to a stream in the form of keywords file.
+
+        :param stream: text stream to write to
+        :param fmt: output format - yaml or json
+        """
+        if fmt in ('yaml', 'yml'):
+            yaml.dump(self.to_dict(), stream, Dumper=_YAML_DUMPER, default_flow_style=False)
+        elif fmt == 'json':
+            json.dump(self.to_dict(), stream)
+        else:
+            raise ValueError("Unknown output format '%s'" % fmt)
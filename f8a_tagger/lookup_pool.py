@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Keywords lookup in forked worker processes sharing read-only lookup resources."""
+
+from collections import deque
+import gc
+from itertools import chain
+import multiprocessing
+import os
+
+import daiquiri
+import f8a_tagger.defaults as defaults
+from f8a_tagger.scoring import Scoring
+
+_logger = daiquiri.getLogger(__name__)
+
+# Lookup resources inherited by forked workers - tokenizer, keywords chief and scorer instance
+_resources = None
+
+
+def _initialize_worker(resources):
+    """Initialize worker process started by other method than fork, resources are unpickled."""
+    global _resources  # pylint: disable=global-statement
+    _resources = resources
+
+
+def _lookup_worker(content, with_tokens):
+    """Perform keywords lookup on parsed content using inherited lookup resources.
+
+    :param content: parsed content
+    :param with_tokens: return also extracted tokens
+    :return: tuple - found keywords, extracted tokens (or None) and exception (None on success)
+    """
+    tokenizer, chief, scorer = _resources
+    try:
+        tokens = chain(*tokenizer.tokenize(content))
+        if with_tokens:
+            tokens = list(tokens)
+        keywords = scorer.score_ids(chief, chief.extract_keyword_ids(tokens))
+        return keywords, tokens if with_tokens else None, None
+    except Exception as exc:  # pylint: disable=broad-except
+        return None, None, exc
+
+
+def get_unique_memory(pid):
+    """Get memory used exclusively by a process (not shared with other processes) in bytes.
+
+    :param pid: process id
+    :return: unique set size in bytes, None if it cannot be determined
+    """
+    try:
+        with open('/proc/%d/smaps_rollup' % pid, 'r') as f:
+            return sum(int(line.split()[1]) * 1024 for line in f
+                       if line.startswith(('Private_Clean:', 'Private_Dirty:')))
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class LookupPool(object):
+    """Perform keywords lookup in a pool of forked worker processes.
+
+    Lookup resources (keywords, stopwords and NLTK data) are built and loaded once in the
+    parent process and frozen, so the garbage collector never touches them. Workers are forked
+    afterwards and share memory pages with lookup resources copy-on-write instead of building
+    their own copies.
+
+    If workers are not forked, lookup resources are pickled to each worker. Use
+    f8a_tagger.compiled_keywords_chief.CompiledKeywordsChief in such case, it is pickled as
+    a path to a memory mapped keywords database shared by all workers.
+    """
+
+    def __init__(self, tokenizer, chief, scorer=None, workers=None, start_method=None):
+        # pylint: disable=too-many-arguments
+        """Construct, start worker processes.
+
+        :param tokenizer: tokenizer instance to be used
+        :param chief: keywords chief instance to be used
+        :param scorer: name of scorer to be used
+        :type scorer: str
+        :param workers: number of worker processes, number of CPUs if not provided
+        :param start_method: multiprocessing start method, fork if available if not provided
+        """
+        global _resources  # pylint: disable=global-statement
+
+        if workers is not None and workers < 1:
+            raise ValueError("Number of workers has to be positive, got %d" % workers)
+
+        if start_method is None:
+            available = multiprocessing.get_all_start_methods()
+            start_method = 'fork' if 'fork' in available else available[0]
+        context = multiprocessing.get_context(start_method)
+
+        scorer = Scoring.get_scoring(scorer or defaults.DEFAULT_SCORER)
+        self._workers = workers or os.cpu_count() or 1
+        self._frozen = start_method == 'fork'
+        if not self._frozen:
+            self._pool = context.Pool(self._workers, initializer=_initialize_worker,
+                                      initargs=((tokenizer, chief, scorer),))
+            return
+
+        # lazily loaded NLTK data (punkt, WordNet) has to be loaded before forking
+        tokenizer.tokenize("Preloading lookup resources.")
+        _logger.debug("Preloaded %d keywords", chief.get_keywords_count())
+        _resources = (tokenizer, chief, scorer)
+        # move all objects to permanent generation, garbage collector would write to memory
+        # pages of all objects otherwise and pages would be copied to each worker
+        gc.collect()
+        gc.freeze()
+        try:
+            self._pool = context.Pool(self._workers)
+        except Exception:
+            gc.unfreeze()
+            raise
+
+    def __enter__(self):
+        """Use lookup pool as a context manager, see close()."""
+        return self
+
+    def __exit__(self, *args):
+        """Stop all worker processes."""
+        self.close()
+
+    def close(self):
+        """Stop all worker processes."""
+        global _resources  # pylint: disable=global-statement
+
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+            if self._frozen:
+                _resources = None
+                gc.unfreeze()
+
+    @property
+    def pids(self):
+        """Get process ids of worker processes."""
+        # pylint: disable=protected-access
+        return [process.pid for process in self._pool._pool]
+
+    def apply(self, func, *args):
+        """Call function in a worker process.
+
+        :param func: function to be called, has to be picklable
+        :param args: arguments passed to the function
+        :return: result of the call
+        """
+        return self._pool.apply(func, args)
+
+    def imap(self, items, with_tokens=False):
+        """Perform keywords lookup on parsed contents, yield results in order of items.
+
+        Only a limited number of contents is submitted to workers ahead, so items are consumed
+        as results are retrieved.
+
+        :param items: iterable of tuples - metadata kept in the parent and parsed content
+        :param with_tokens: report also tokens extracted from content, e.g. for corpus
+        :return: generator of tuples - metadata, found keywords (None on failure), extracted
+                 tokens (None if not requested or on failure) and exception raised on failure
+                 (None on success)
+        """
+        pending = deque()
+
+        for metadata, content in items:
+            pending.append((metadata, self._pool.apply_async(_lookup_worker,
+                                                             (content, with_tokens))))
+            if len(pending) > 2 * self._workers:
+                yield self._get_result(*pending.popleft())
+
+        while pending:
+            yield self._get_result(*pending.popleft())
+
+    @staticmethod
+    def _get_result(metadata, result):
+        """Wait for result of lookup, report failure if result cannot be transferred."""
+        try:
+            return (metadata,) + result.get()
+        except Exception as exc:  # pylint: disable=broad-except
+            return metadata, None, None, exc
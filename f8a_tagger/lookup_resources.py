@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""Lookup resources for long running processes, reloadable without restart."""
+
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+import time
+
+import daiquiri
+from f8a_tagger.errors import InvalidInputError
+from f8a_tagger.recipes import _compute_digest
+from f8a_tagger.recipes import _get_readme_content
+from f8a_tagger.recipes import _perform_lookup
+from f8a_tagger.recipes import _prepare_lookup
+
+_logger = daiquiri.getLogger(__name__)
+
+# Immutable set of lookup resources, swapped as a whole on reload
+LookupSnapshot = namedtuple('LookupSnapshot', ('generation', 'digest', 'loaded_at',
+                                               'keywords_file', 'stopwords_file', 'ngram_size',
+                                               'tokenizer', 'chief', 'core_parser'))
+
+
+def _get_mtime(path):
+    """Get modification time of a file, None if not applicable."""
+    if not isinstance(path, str) or not path:
+        return None
+
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class LookupResources(object):
+    """Keywords chief, tokenizer and parser kept for repeated lookups.
+
+    Resources can be reloaded (e.g. after keywords file was updated) in a background thread.
+    New resources are swapped in at once when they are ready, lookups already in progress
+    finish with resources they started with.
+    """
+
+    def __init__(self, keywords_file=None, stopwords_file=None, ngram_size=None,
+                 lemmatize=False, stemmer=None, scorer=None, parser_options=None,
+                 result_cache=None):
+        # pylint: disable=too-many-arguments
+        """Construct, load lookup resources.
+
+        :param keywords_file: keywords file to be used
+        :param stopwords_file: stopwords file to be used
+        :param ngram_size: size of ngrams, if None, ngram size is computed on each (re)load
+        :param lemmatize: use lemmatizer
+        :type lemmatize: bool
+        :param stemmer: stemmer to be used
+        :type stemmer: str
+        :param scorer: scorer to be used
+        :type scorer: str
+        :param parser_options: additional arguments for markup parsers keyed by content type
+        :type parser_options: dict
+        :param result_cache: cache of lookup results, unchanged text is not looked up again
+        :type result_cache: f8a_tagger.result_cache.ResultCache
+        """
+        self._ngram_size = ngram_size
+        self._lemmatize = lemmatize
+        self._stemmer = stemmer
+        self._scorer = scorer
+        self._parser_options = parser_options
+        self._result_cache = result_cache
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._generation = 0
+        self._mtimes = None
+        self._snapshot = None
+        self._pending = None
+        self._swap(self._load(keywords_file, stopwords_file))
+
+    def __enter__(self):
+        """Use lookup resources as a context manager, see close()."""
+        return self
+
+    def __exit__(self, *args):
+        """Wait for pending reloads."""
+        self.close()
+
+    def close(self):
+        """Wait for pending reloads, no reloads are possible afterwards."""
+        self._executor.shutdown(wait=True)
+
+    @property
+    def snapshot(self):
+        """Get resources currently used for lookup."""
+        return self._snapshot
+
+    @property
+    def version(self):
+        """Get information about live resources.
+
+        :return: generation (incremented on each reload), digest of effective keywords and
+                 stopwords, time of load, keywords and stopwords files and number of keywords
+        :rtype: dict
+        """
+        snapshot = self._snapshot
+        return {
+            'generation': snapshot.generation,
+            'digest': snapshot.digest,
+            'loaded_at': snapshot.loaded_at,
+            'keywords_file': snapshot.keywords_file,
+            'stopwords_file': snapshot.stopwords_file,
+            'keywords_count': snapshot.chief.get_keywords_count()
+        }
+
+    def _load(self, keywords_file, stopwords_file):
+        """Build new lookup resources."""
+        # files modified while being loaded are reloaded again
+        mtimes = (_get_mtime(keywords_file), _get_mtime(stopwords_file))
+        ngram_size, tokenizer, chief, core_parser = _prepare_lookup(keywords_file,
+                                                                    stopwords_file,
+                                                                    self._ngram_size,
+                                                                    self._lemmatize,
+                                                                    self._stemmer,
+                                                                    self._parser_options)
+        # digest of lookup configuration identifies content of loaded resources
+        digest = _compute_digest(ngram_size, tokenizer, chief, self._lemmatize, self._stemmer,
+                                 self._scorer)
+        return mtimes, LookupSnapshot(None, digest, time.time(), keywords_file, stopwords_file,
+                                      ngram_size, tokenizer, chief, core_parser)
+
+    def _swap(self, loaded):
+        """Make loaded resources live."""
+        mtimes, snapshot = loaded
+        with self._lock:
+            self._generation += 1
+            self._mtimes = mtimes
+            self._snapshot = snapshot._replace(generation=self._generation)
+
+        _logger.info("Lookup resources generation %d loaded (digest %s, %d keywords)",
+                     self._generation, snapshot.digest, snapshot.chief.get_keywords_count())
+        return self._snapshot
+
+    def _reload(self, keywords_file, stopwords_file):
+        """Build resources and swap them in, run in the background."""
+        try:
+            return self._swap(self._load(keywords_file, stopwords_file))
+        except Exception as exc:
+            _logger.error("Failed to reload lookup resources, generation %d stays live: %s",
+                          self._generation, str(exc), exc_info=exc)
+            raise
+
+    def reload(self, keywords_file=None, stopwords_file=None):
+        """Reload lookup resources in the background.
+
+        Resources in use are kept live until new ones are built; if the build fails, they stay
+        live.
+
+        :param keywords_file: keywords file to be used, the current one if not provided
+        :param stopwords_file: stopwords file to be used, the current one if not provided
+        :return: future resolved to the new snapshot of resources once they are live
+        :rtype: concurrent.futures.Future
+        """
+        snapshot = self._snapshot
+        self._pending = self._executor.submit(self._reload,
+                                              keywords_file or snapshot.keywords_file,
+                                              stopwords_file or snapshot.stopwords_file)
+        return self._pending
+
+    def reload_if_changed(self):
+        """Reload lookup resources in the background if keywords or stopwords file was modified.
+
+        :return: future as returned by reload(), None if files were not modified
+        """
+        if self._pending is not None and not self._pending.done():
+            return self._pending
+
+        snapshot = self._snapshot
+        mtimes = (_get_mtime(snapshot.keywords_file), _get_mtime(snapshot.stopwords_file))
+        if mtimes == self._mtimes:
+            return None
+
+        _logger.debug("Keywords or stopwords file modified, reloading lookup resources")
+        return self.reload()
+
+    def lookup_text(self, text):
+        """Perform keywords lookup on a plain text.
+
+        :param text: plain text on which keywords lookup should be performed
+        :return: found keywords
+        """
+        if not isinstance(text, str):
+            raise InvalidInputError("Invalid text passed '%s' (type: %s), should be string" %
+                                    (text, type(text)))
+
+        return self._lookup(text, 'txt')
+
+    def lookup_readme(self, readme):
+        """Perform keywords lookup in a parsed README.json dict.
+
+        :param readme: parsed README.json file
+        :return: found keywords
+        """
+        return self._lookup(*_get_readme_content(readme))
+
+    def _lookup(self, content, content_type):
+        """Perform keywords lookup on content with resources live at the time of the call."""
+        snapshot = self._snapshot
+        fingerprint = snapshot.digest if self._result_cache is not None else None
+        return _perform_lookup(snapshot.core_parser.parse(content, content_type),
+                               snapshot.tokenizer, snapshot.chief, self._scorer,
+                               self._result_cache, fingerprint)
@@ -2,5 +2,7 @@
 """Markup parsers for fabric8-analytics."""
 
 from .core_parser import CoreParser
+from .sandbox import SandboxedParser
 
 assert CoreParser
+assert SandboxedParser
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Main parser representation for fabric8-analytics."""
 
+import os
 
 import daiquiri
 import simplejson as json
@@ -52,7 +53,7 @@ class CoreParser(object):
         '.mediawiki': 'mediawiki',
         '.mkdn': 'markdown',
         '.org': 'org',
-        '.pod': 'asciidoc',
+        '.pod': 'pod',
         '.rdoc': 'rdoc',
         '.rst': 'restructuredtext',
         '.textile': 'textile',
@@ -61,15 +62,31 @@ class CoreParser(object):
         '.html': 'html'
     }
 
+    def __init__(self, parser_options=None):
+        """Construct.
+
+        :param parser_options: additional arguments for markup parsers keyed by content type,
+                               e.g. {'markdown': {'backend': 'text'}}
+        :type parser_options: dict
+        """
+        self._parser_options = parser_options or {}
+        # parser instances keyed by content type and parser arguments
+        self._parsers = {}
+
+        for content_type in self._parser_options:
+            if content_type not in self._PARSERS:
+                raise ValueError("No parser registered for content type '%s'" % content_type)
+
     def parse(self, content, content_type, **parser_kwargs):
         """Parse content based on content type.
 
         :param content: content to be parsed.
         :param content_type: markup type to be parsed
-        :param parser_kwargs: additional arguments for markup parser
+        :param parser_kwargs: additional arguments for markup parser, override parser options
         :return: parsed raw/plain content
         """
-        parser_class = self._PARSERS.get(content_type.lower())
+        content_type = content_type.lower()
+        parser_class = self._PARSERS.get(content_type)
 
         if not parser_class:
             raise ValueError("No parser registered for content type '%s'" % content_type)
@@ -79,9 +96,52 @@ class CoreParser(object):
 
         _logger.debug("Using parser '%s' for content type '%s'",
                       parser_class.__name__, content_type)
-        parser = parser_class(**parser_kwargs)
+        return self._get_parser(parser_class, content_type, parser_kwargs).parse(content)
+
+    def _get_parser(self, parser_class, content_type, parser_kwargs):
+        """Get parser instance for content type, reuse already created one if possible.
+
+        :param parser_class: class of parser for content type
+        :param content_type: markup type to be parsed
+        :param parser_kwargs: additional arguments for markup parser, override parser options
+        :return: parser instance
+        """
+        if content_type in self._parser_options:
+            parser_kwargs = dict(self._parser_options[content_type], **parser_kwargs)
+
+        try:
+            key = (content_type, frozenset(parser_kwargs.items()))
+            parser = self._parsers.get(key)
+        except TypeError:
+            # unhashable parser arguments, the instance cannot be reused
+            return parser_class(**parser_kwargs)
 
-        return parser.parse(content)
+        if parser is None:
+            parser = parser_class(**parser_kwargs)
+            self._parsers[key] = parser
+
+        return parser
+
+    @classmethod
+    def get_supported_extensions(cls):
+        """Get extensions of files which can be parsed, see parse_file().
+
+        :return: file extensions including the leading dot, lowercase
+        :rtype: list
+        """
+        return list(cls._FILE_EXTENSIONS.keys())
+
+    def get_file_content_type(self, path):
+        """Determine content type of a file based on its extension.
+
+        :param path: path to file
+        :return: content type, None for README.json files which carry their content type
+        """
+        extension = os.path.splitext(path)[1].lower()
+        try:
+            return self._FILE_EXTENSIONS[extension]
+        except KeyError:
+            raise ValueError("Unknown file type for '%s'" % path)
 
     def parse_readme_json(self, path, **parser_kwargs):
         """Parse preprocessed README.json file.
@@ -112,13 +172,29 @@ class CoreParser(object):
         :param parser_kwargs: additional arguments for markup parser
         :return: parsed raw/plain content
         """
-        if path.endswith('.json'):
-            return self.parse_readme_json(path)
+        content_type = self.get_file_content_type(path)
+        if content_type is None:
+            return self.parse_readme_json(path, **parser_kwargs)
 
-        for extension, content_type in self._FILE_EXTENSIONS.items():
-            if path.endswith(extension):
-                _logger.debug("Parsing file '%s'", path)
-                with open(path, 'r') as f:
-                    return self.parse(f.read(), content_type.lower(), **parser_kwargs)
+        _logger.debug("Parsing file '%s'", path)
+        with open(path, 'r') as f:
+            return self.parse(f.read(), content_type, **parser_kwargs)
 
-        raise ValueError("Unknown file type for '%s'" % path)
+    def parse_many(self, paths, ignore_errors=False, **parser_kwargs):
+        """Parse files in bulk, parser instances are shared across files of the same type.
+
+        :param paths: iterable of paths to files to be parsed
+        :param ignore_errors: report files which cannot be parsed, but continue with others
+        :param parser_kwargs: additional arguments for markup parsers
+        :return: generator of tuples - path and its parsed raw/plain content
+        """
+        for path in paths:
+            try:
+                content = self.parse_file(path, **parser_kwargs)
+            except Exception as exc:  # pylint: disable=broad-except
+                if not ignore_errors:
+                    raise
+                _logger.exception("Failed to parse file '%s': %s", path, str(exc))
+                continue
+
+            yield path, content
@@ -5,12 +5,120 @@ from docutils.core import publish_string
 
 from bs4 import BeautifulSoup
 import daiquiri
+from lxml import etree
 import markdown2
 
 from .abstract import AbstractParser
+from .strippers import strip_asciidoc
+from .strippers import strip_creole
+from .strippers import strip_markdown
+from .strippers import strip_mediawiki
+from .strippers import strip_org
+from .strippers import strip_pod
+from .strippers import strip_rdoc
+from .strippers import strip_restructuredtext
+from .strippers import strip_textile
 
 _logger = daiquiri.getLogger(__name__)
 
+# Elements which content is not a part of document text
+_SKIPPED_HTML_ELEMENTS = ('script', 'style', 'template')
+# Elements in which whitespace is preserved
+_PRESERVE_WHITESPACE_HTML_ELEMENTS = ('pre', 'textarea')
+_HTML_SPACES = ' \n\t\x0c\r'
+
+
+def _collapse_blank(text):
+    """Collapse whitespace-only text the way BeautifulSoup does, keep any other text as is."""
+    if not text or text.strip(_HTML_SPACES) or len(text) == 1:
+        return text
+    return '\n' if '\n' in text else ' '
+
+
+def _html_to_text_lxml(content, body_only=False, drop_code=False):
+    """Extract text from HTML walking lxml tree directly.
+
+    :param content: HTML to extract text from
+    :type content: str or bytes
+    :param body_only: extract only text of body element
+    :param drop_code: omit content of preformatted (code) blocks
+    :return: text of HTML document
+    :rtype: str
+    """
+    if isinstance(content, bytes):
+        parser = etree.HTMLParser(encoding='utf-8', remove_comments=True, remove_pis=True)
+    else:
+        parser = etree.HTMLParser(remove_comments=True, remove_pis=True)
+
+    root = etree.fromstring(content, parser)
+    if root is None:
+        return ''
+
+    if body_only:
+        root = root.find('body')
+        if root is None:
+            return ''
+
+    etree.strip_elements(root, *_SKIPPED_HTML_ELEMENTS, with_tail=False)
+    if drop_code:
+        etree.strip_elements(root, 'pre', with_tail=False)
+
+    preserved = set()
+    for element in root.iter(*_PRESERVE_WHITESPACE_HTML_ELEMENTS):
+        preserved.update(element.iter())
+
+    for element in root.iter():
+        if element not in preserved:
+            element.text = _collapse_blank(element.text)
+        if element.tail and element.getparent() not in preserved:
+            element.tail = _collapse_blank(element.tail)
+
+    return etree.tostring(root, method='text', encoding='unicode', with_tail=False)
+
+
+def _html_to_text_beautifulsoup(content, body_only=False, drop_code=False):
+    """Extract text from HTML using BeautifulSoup.
+
+    :param content: HTML to extract text from
+    :type content: str or bytes
+    :param body_only: extract only text of body element
+    :param drop_code: omit content of preformatted (code) blocks
+    :return: text of HTML document
+    :rtype: str
+    """
+    soup = BeautifulSoup(content, 'lxml')
+    if body_only:
+        soup = soup.find('body')
+        if soup is None:
+            return ''
+
+    if drop_code:
+        for element in soup.find_all('pre'):
+            element.decompose()
+
+    return soup.get_text()
+
+
+_HTML_BACKENDS = {
+    'lxml': _html_to_text_lxml,
+    'beautifulsoup': _html_to_text_beautifulsoup
+}
+
+
+class _HtmlTextParser(AbstractParser):  # pylint: disable=too-few-public-methods
+    """Base for parsers extracting text from HTML."""
+
+    def __init__(self, backend='lxml'):
+        """Construct.
+
+        :param backend: library used to extract text from HTML, 'lxml' or 'beautifulsoup'
+        """
+        try:
+            self._html_to_text = _HTML_BACKENDS[backend]
+        except KeyError:
+            raise ValueError("Unknown HTML backend '%s', available: %s"
+                             % (backend, ', '.join(sorted(_HTML_BACKENDS))))
+
 
 class TextParser(AbstractParser):  # pylint: disable=too-few-public-methods
     """Plain text parser."""
@@ -26,9 +134,23 @@ class TextParser(AbstractParser):  # pylint: disable=too-few-public-methods
         return content
 
 
-class MarkdownParser(AbstractParser):  # pylint: disable=too-few-public-methods
+class MarkdownParser(_HtmlTextParser):  # pylint: disable=too-few-public-methods
     """Markdown parser."""
 
+    def __init__(self, backend='lxml', drop_code=False):
+        """Construct.
+
+        :param backend: 'text' to strip Markdown markup directly, otherwise Markdown is rendered
+                        to HTML and the library used to extract text from it, 'lxml'
+                        or 'beautifulsoup'
+        :param drop_code: omit content of code blocks
+        """
+        self._drop_code = drop_code
+        if backend == 'text':
+            self._html_to_text = None
+        else:
+            super().__init__(backend)
+
     def parse(self, content):
         """Parse content to raw text.
 
@@ -37,10 +159,12 @@ class MarkdownParser(AbstractParser):  # pylint: disable=too-few-public-methods
         :return: raw/plain content representation
         :rtype: str
         """
-        return BeautifulSoup(markdown2.markdown(content), 'lxml').get_text()
+        if self._html_to_text is None:
+            return strip_markdown(content, drop_code=self._drop_code)
+        return self._html_to_text(markdown2.markdown(content), drop_code=self._drop_code)
 
 
-class HtmlParser(AbstractParser):  # pylint: disable=too-few-public-methods
+class HtmlParser(_HtmlTextParser):  # pylint: disable=too-few-public-methods
     """HTML parser."""
 
     def parse(self, content):
@@ -51,12 +175,24 @@ class HtmlParser(AbstractParser):  # pylint: disable=too-few-public-methods
         :return: raw/plain content representation
         :rtype: str
         """
-        return BeautifulSoup(content, 'lxml').get_text()
+        return self._html_to_text(content)
 
 
-class ReStructuredTextParser(AbstractParser):  # pylint: disable=too-few-public-methods
+class ReStructuredTextParser(_HtmlTextParser):  # pylint: disable=too-few-public-methods
     """ReStructuredText parser."""
 
+    def __init__(self, backend='doctree'):
+        """Construct.
+
+        :param backend: 'doctree' to collect text from docutils doctree directly, otherwise
+                        reStructuredText is written to HTML and the library used to extract
+                        text from it, 'lxml' or 'beautifulsoup'
+        """
+        if backend == 'doctree':
+            self._html_to_text = None
+        else:
+            super().__init__(backend)
+
     def parse(self, content):
         """Parse content to raw text.
 
@@ -65,10 +201,12 @@ class ReStructuredTextParser(AbstractParser):  # pylint: disable=too-few-public-
         :return: raw/plain content representation
         :rtype: str
         """
-        return BeautifulSoup(publish_string(content,
-                                            parser_name='restructuredtext',
-                                            writer_name='html'),
-                             'lxml').find('body').get_text()
+        if self._html_to_text is None:
+            return strip_restructuredtext(content)
+        return self._html_to_text(publish_string(content,
+                                                 parser_name='restructuredtext',
+                                                 writer_name='html'),
+                                  body_only=True)
 
 
 class AsciidocParser(AbstractParser):  # pylint: disable=too-few-public-methods
@@ -82,7 +220,7 @@ class AsciidocParser(AbstractParser):  # pylint: disable=too-few-public-methods
         :return: raw/plain content representation
         :rtype: str
         """
-        raise NotImplementedError("Parser '%s' not implemented", self.__class__.__name__)
+        return strip_asciidoc(content)
 
 
 class TextileParser(AbstractParser):  # pylint: disable=too-few-public-methods
@@ -96,8 +234,7 @@ class TextileParser(AbstractParser):  # pylint: disable=too-few-public-methods
         :return: raw/plain content representation
         :rtype: str
         """
-        # TODO: implement
-        raise NotImplementedError("Parser '%s' not implemented", self.__class__.__name__)
+        return strip_textile(content)
 
 
 class RdocParser(AbstractParser):  # pylint: disable=too-few-public-methods
@@ -111,8 +248,7 @@ class RdocParser(AbstractParser):  # pylint: disable=too-few-public-methods
         :return: raw/plain content representation
         :rtype: str
         """
-        # TODO: implement
-        raise NotImplementedError("Parser '%s' not implemented", self.__class__.__name__)
+        return strip_rdoc(content)
 
 
 class OrgParser(AbstractParser):  # pylint: disable=too-few-public-methods
@@ -126,8 +262,7 @@ class OrgParser(AbstractParser):  # pylint: disable=too-few-public-methods
         :return: raw/plain content representation
         :rtype: str
         """
-        # TODO: implement
-        raise NotImplementedError("Parser '%s' not implemented", self.__class__.__name__)
+        return strip_org(content)
 
 
 class CreoleParser(AbstractParser):  # pylint: disable=too-few-public-methods
@@ -141,8 +276,7 @@ class CreoleParser(AbstractParser):  # pylint: disable=too-few-public-methods
         :return: raw/plain content representation
         :rtype: str
         """
-        # TODO: implement
-        raise NotImplementedError("Parser '%s' not implemented", self.__class__.__name__)
+        return strip_creole(content)
 
 
 class MediawikiParser(AbstractParser):  # pylint: disable=too-few-public-methods
@@ -156,8 +290,7 @@ class MediawikiParser(AbstractParser):  # pylint: disable=too-few-public-methods
         :return: raw/plain content representation
         :rtype: str
         """
-        # TODO: implement
-        raise NotImplementedError("Parser '%s' not implemented", self.__class__.__name__)
+        return strip_mediawiki(content)
 
 
 class PodParser(AbstractParser):  # pylint: disable=too-few-public-methods
@@ -171,5 +304,4 @@ class PodParser(AbstractParser):  # pylint: disable=too-few-public-methods
         :return: raw/plain content representation
         :rtype: str
         """
-        # TODO: implement
-        raise NotImplementedError("Parser '%s' not implemented", self.__class__.__name__)
+        return strip_pod(content)
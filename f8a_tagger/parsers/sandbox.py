@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""Parsing in worker processes with time and memory limits per document."""
+
+from collections import deque
+import multiprocessing
+from multiprocessing.connection import wait
+import os
+import time
+
+import daiquiri
+from f8a_tagger.errors import ParserLimitExceededError
+
+from .core_parser import CoreParser
+
+_logger = daiquiri.getLogger(__name__)
+
+
+def _parse_worker(connection, parser_options):
+    """Parse files received over connection until None is received.
+
+    :param connection: connection to the parent process
+    :param parser_options: additional arguments for markup parsers keyed by content type
+    """
+    core_parser = CoreParser(parser_options)
+    # report readiness, so that the initial memory usage can be measured
+    connection.send(None)
+
+    while True:
+        path = connection.recv()
+        if path is None:
+            break
+
+        try:
+            result = (core_parser.parse_file(path), None)
+        except Exception as exc:  # pylint: disable=broad-except
+            result = (None, exc)
+
+        try:
+            connection.send(result)
+        except Exception as exc:  # pylint: disable=broad-except
+            # exception raised by parser could not be pickled
+            connection.send((None, RuntimeError("%s: %s" % (exc.__class__.__name__, str(exc)))))
+
+
+def _get_rss(pid):
+    """Get resident set size of a process in bytes, None if it cannot be determined."""
+    try:
+        with open('/proc/%d/statm' % pid, 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class _Worker(object):
+    """Worker process parsing one document at a time."""
+
+    def __init__(self, context, parser_options):
+        """Start worker process."""
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(target=_parse_worker,
+                                       args=(child_connection, parser_options),
+                                       daemon=True)
+        self.process.start()
+        child_connection.close()
+        self.path = None
+        self.deadline = None
+
+        try:
+            self.connection.recv()
+        except EOFError:
+            self.kill()
+            raise RuntimeError("Parsing worker failed to start, exit code %s"
+                               % self.process.exitcode)
+        self.initial_rss = _get_rss(self.process.pid)
+
+    def get_rss_growth(self):
+        """Get growth of resident set size since the worker started, None if unknown."""
+        rss = _get_rss(self.process.pid)
+        if rss is None or self.initial_rss is None:
+            return None
+        return rss - self.initial_rss
+
+    def submit(self, path, timeout):
+        """Submit document to parse."""
+        self.path = path
+        self.deadline = time.monotonic() + timeout if timeout is not None else None
+        self.connection.send(path)
+
+    def finish(self):
+        """Mark document as processed, return its path."""
+        path, self.path, self.deadline = self.path, None, None
+        return path
+
+    def stop(self):
+        """Stop worker process gracefully."""
+        try:
+            self.connection.send(None)
+        except OSError:
+            pass
+        self.process.join(1)
+        self.kill()
+
+    def kill(self):
+        """Terminate worker process immediately."""
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+
+class SandboxedParser(object):
+    """Parse files in a pool of worker processes with time and memory limits per document.
+
+    A worker exceeding limits while parsing a document is killed and replaced with a new one,
+    the document is reported as failed and the remaining documents are processed as usual.
+    """
+
+    # Seconds between two checks of worker's memory usage
+    _POLL_INTERVAL = 0.1
+
+    def __init__(self, workers=None, timeout=None, max_rss=None, parser_options=None):
+        """Construct.
+
+        :param workers: number of worker processes, number of CPUs if not provided
+        :param timeout: wall-clock time limit for parsing a document in seconds, if any
+        :param max_rss: limit of worker's resident set size growth in bytes, if any; workers
+                        are forked, so they share memory with the caller initially, only
+                        memory allocated on top of it is limited
+        :param parser_options: additional arguments for markup parsers keyed by content type
+        :type parser_options: dict
+        """
+        if workers is not None and workers < 1:
+            raise ValueError("Number of workers has to be positive, got %d" % workers)
+
+        self._workers_count = workers or os.cpu_count() or 1
+        self._timeout = timeout
+        self._max_rss = max_rss
+        # fail early on wrong options, not in workers
+        CoreParser(parser_options)
+        self._parser_options = parser_options
+        try:
+            # parser modules are already imported in forked workers, so they start quickly
+            self._context = multiprocessing.get_context('fork')
+        except ValueError:
+            self._context = multiprocessing.get_context()
+        self._workers = []
+
+    def __enter__(self):
+        """Use sandboxed parser as a context manager, see close()."""
+        return self
+
+    def __exit__(self, *args):
+        """Stop all worker processes."""
+        self.close()
+
+    def close(self):
+        """Stop all worker processes."""
+        for worker in self._workers:
+            worker.stop()
+        self._workers = []
+
+    def _replace_worker(self, worker):
+        """Kill worker and start a fresh one instead of it."""
+        worker.kill()
+        self._workers.remove(worker)
+        new_worker = _Worker(self._context, self._parser_options)
+        self._workers.append(new_worker)
+        return new_worker
+
+    def _check_limits(self, worker):
+        """Check whether worker parsing a document exceeds limits.
+
+        :return: error to be reported if limits were exceeded, None otherwise
+        """
+        if worker.deadline is not None and time.monotonic() > worker.deadline:
+            return ParserLimitExceededError("Parsing of '%s' exceeded time limit of %s seconds"
+                                            % (worker.path, self._timeout))
+
+        if self._max_rss is not None:
+            rss_growth = worker.get_rss_growth()
+            if rss_growth is not None and rss_growth > self._max_rss:
+                return ParserLimitExceededError("Parsing of '%s' exceeded memory limit of %d "
+                                                "bytes (RSS grew by %d bytes)"
+                                                % (worker.path, self._max_rss, rss_growth))
+
+        return None
+
+    def _receive(self, worker):
+        """Receive result of parsing from worker, replace the worker if it died."""
+        try:
+            content, error = worker.connection.recv()
+        except (EOFError, OSError):
+            error = RuntimeError("Worker parsing '%s' died with exit code %s"
+                                 % (worker.path, worker.process.exitcode))
+            content = None
+            path = worker.finish()
+            self._replace_worker(worker)
+            return path, content, error
+
+        path = worker.finish()
+        if self._max_rss is not None:
+            rss_growth = worker.get_rss_growth()
+            if rss_growth is not None and rss_growth > self._max_rss:
+                # memory is not returned to the system, do not charge the next document
+                _logger.debug("Recycling worker with RSS grown by %d bytes after parsing '%s'",
+                              rss_growth, path)
+                self._replace_worker(worker)
+
+        return path, content, error
+
+    def _get_poll_timeout(self, busy_workers):
+        """Get time to wait for results before limits of busy workers should be checked."""
+        poll_timeout = self._POLL_INTERVAL if self._max_rss is not None else None
+
+        deadlines = [worker.deadline for worker in busy_workers if worker.deadline is not None]
+        if deadlines:
+            until_deadline = max(min(deadlines) - time.monotonic(), 0)
+            if poll_timeout is None or until_deadline < poll_timeout:
+                poll_timeout = until_deadline
+
+        return poll_timeout
+
+    def imap(self, paths):
+        """Parse files, yield results as documents are parsed.
+
+        :param paths: iterable of paths to files to be parsed
+        :return: generator of tuples - path, parsed raw/plain content (None on failure)
+                 and exception raised on failure (None on success)
+        """
+        paths = iter(paths)
+        pending = deque()
+        exhausted = False
+
+        while len(self._workers) < self._workers_count:
+            self._workers.append(_Worker(self._context, self._parser_options))
+
+        try:
+            while True:
+                for worker in self._workers:
+                    if worker.path is not None:
+                        continue
+                    if not pending and not exhausted:
+                        try:
+                            pending.append(next(paths))
+                        except StopIteration:
+                            exhausted = True
+                    if pending:
+                        worker.submit(pending.popleft(), self._timeout)
+
+                busy = {worker.connection: worker for worker in self._workers
+                        if worker.path is not None}
+                if not busy:
+                    return
+
+                for connection in wait(list(busy), self._get_poll_timeout(busy.values())):
+                    yield self._receive(busy.pop(connection))
+
+                for worker in busy.values():
+                    error = self._check_limits(worker)
+                    if error is not None:
+                        _logger.warning(str(error))
+                        path = worker.finish()
+                        self._replace_worker(worker)
+                        yield path, None, error
+        finally:
+            # results of documents in progress would be received by the next run otherwise
+            for worker in list(self._workers):
+                if worker.path is not None:
+                    worker.finish()
+                    self._replace_worker(worker)
+
+    def parse_many(self, paths, ignore_errors=False):
+        """Parse files in worker processes.
+
+        :param paths: iterable of paths to files to be parsed
+        :param ignore_errors: report files which cannot be parsed, but continue with others
+        :return: generator of tuples - path and its parsed raw/plain content
+        """
+        for path, content, error in self.imap(paths):
+            if error is not None:
+                if not ignore_errors:
+                    raise error
+                _logger.error("Failed to parse file '%s': %s", path, str(error))
+                continue
+
+            yield path, content
@@ -0,0 +1,1130 @@
+#!/usr/bin/env python3
+"""Markup strippers turning markup directly to plain text without rendering it."""
+
+import html
+import re
+import threading
+
+from docutils import frontend
+from docutils import nodes
+from docutils import utils
+from docutils.parsers.rst import Parser as RstParser
+from docutils.transforms.references import Substitutions
+
+_FENCE_RE = re.compile(r'^ {0,3}(`{3,}|~{3,})')
+_ATX_HEADING_RE = re.compile(r'^ {0,3}#{1,6}(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$')
+_SETEXT_UNDERLINE_RE = re.compile(r'^ {0,3}(?:=+|-+)[ \t]*$')
+_HORIZONTAL_RULE_RE = re.compile(r'^ {0,3}(?:(?:\*[ \t]*){3,}|(?:-[ \t]*){3,}|(?:_[ \t]*){3,})$')
+_BLOCKQUOTE_RE = re.compile(r'^ {0,3}(?:>[ \t]?)+')
+_LIST_ITEM_RE = re.compile(r'^[ \t]*(?:[*+-]|\d{1,9}[.)])[ \t]+')
+_LINK_DEFINITION_RE = re.compile(r'^ {0,3}\[[^\]]+\]:[ \t]*\S+')
+_TABLE_DELIMITER_RE = re.compile(r'^[ \t]*\|?(?:[ \t]*:?-+:?[ \t]*\|)+(?:[ \t]*:?-+:?[ \t]*)?$')
+_TABLE_CELL_SEPARATOR_RE = re.compile(r'(?<!\\)\|')
+_HIDDEN_START_RE = re.compile(r'<!--|<(script|style)\b', re.IGNORECASE)
+# Nodes of reStructuredText doctree which are not a part of rendered text
+_RST_SKIPPED_NODES = (nodes.comment, nodes.raw, nodes.substitution_definition,
+                      nodes.system_message)
+# Longest text enclosed in a pair of inline formatting marks, keeps matching linear in time
+_MAX_FORMATTING_SPAN = 500
+_INLINE_RE = re.compile(r'''
+    (?P<code>(?<!`)(?P<ticks>`+)(?!`)(?P<code_text>.{1,%(span)d}?)(?<!`)(?P=ticks)(?!`))
+  | (?P<image>!\[[^\]]{0,%(span)d}\]\([^)]{0,%(span)d}\))
+  | (?P<link>\[(?P<link_text>(?:!\[[^\]]{0,%(span)d}\]\([^)]{0,%(span)d}\)|!(?!\[)|[^\]!])
+                               {0,%(span)d})\](?:\([^)]{0,%(span)d}\)|\[[^\]]{0,%(span)d}\])?)
+  | (?P<autolink><(?P<url>[a-zA-Z][a-zA-Z0-9+.-]{0,32}:[^>\s]{1,%(span)d}
+        |[^>\s@]{1,%(span)d}@[^>\s]{1,%(span)d})>)
+  | (?P<tag></?[a-zA-Z][a-zA-Z0-9-]{0,32}(?:\s[^>]{0,%(span)d})?/?>)
+  | (?P<escape>\\(?P<escaped>[\\`*_{}\[\]()#+\-.!|>~<]))
+  | (?P<emphasis>(?<![\w*~])(?:\*{1,3}|_{1,3}|~~)(?=\S)|(?<=\S)(?:\*{1,3}|_{1,3}|~~)(?![\w*~]))
+''' % {'span': _MAX_FORMATTING_SPAN}, re.VERBOSE)
+
+
+def _inline_replacement(match):
+    """Replace inline Markdown construct with its text."""
+    if match.group('code') is not None:
+        return match.group('code_text').strip()
+    if match.group('link') is not None:
+        return _INLINE_RE.sub(_inline_replacement, match.group('link_text'))
+    if match.group('autolink') is not None:
+        return match.group('url')
+    if match.group('escape') is not None:
+        return match.group('escaped')
+    # images (not a part of rendered text), raw HTML tags and emphasis
+    return ''
+
+
+def _strip_hidden(line, end_marker):
+    """Remove HTML comments, scripts and styles which can span multiple lines.
+
+    :param line: line to process
+    :param end_marker: end of hidden content started on previous lines, if any
+    :return: tuple - line without hidden content, end marker of hidden content left open
+    """
+    result = []
+    while True:
+        if end_marker is not None:
+            index = line.lower().find(end_marker)
+            if index < 0:
+                return ''.join(result), end_marker
+            line = line[index + len(end_marker):]
+            end_marker = None
+
+        match = _HIDDEN_START_RE.search(line)
+        if not match:
+            result.append(line)
+            return ''.join(result), None
+
+        result.append(line[:match.start()])
+        end_marker = '-->' if match.group(1) is None else '</%s>' % match.group(1).lower()
+        line = line[match.end():]
+
+
+def _strip_markdown_inline(line):
+    """Strip inline Markdown markup from a line of text."""
+    if line.endswith('\\'):
+        # hard line break
+        line = line[:-1]
+    line = _INLINE_RE.sub(_inline_replacement, line)
+    if '&' in line:
+        line = html.unescape(line)
+    return line
+
+
+def strip_markdown(content, drop_code=False):
+    # pylint: disable=too-many-branches,too-many-statements
+    """Turn Markdown to plain text in one pass, without rendering it to HTML.
+
+    Headings, emphasis, links, lists, block quotes, tables and raw HTML markup are stripped,
+    text of code blocks is kept as is. Images and link definitions are omitted, same as
+    when text of rendered Markdown is extracted.
+
+    :param content: Markdown content
+    :type content: str
+    :param drop_code: omit content of code blocks
+    :return: plain text
+    :rtype: str
+    """
+    lines = content.splitlines()
+    result = []
+    fence = None
+    hidden_end = None
+    in_list = False
+    in_table = False
+    previous_blank = True
+
+    for index, line in enumerate(lines):
+        if fence is not None:
+            # inside fenced code block
+            if line.lstrip(' ').startswith(fence) and not line.strip().strip(fence[0]):
+                fence = None
+            elif not drop_code:
+                result.append(line)
+            continue
+
+        if hidden_end is None and '<' not in line:
+            visible = line
+        else:
+            visible, hidden_end = _strip_hidden(line, hidden_end)
+            if not visible.strip() and line.strip():
+                continue
+
+        stripped = visible.strip()
+        if not stripped:
+            result.append('')
+            previous_blank = True
+            in_table = False
+            continue
+
+        match = _FENCE_RE.match(visible)
+        if match:
+            fence = match.group(1)
+            previous_blank = False
+            # language of code block is kept, it is a valuable hint for tagging
+            info = visible[match.end():].strip()
+            if info and not drop_code:
+                result.append(info)
+            continue
+
+        if previous_blank and not in_list and (visible.startswith('    ') or
+                                               visible.startswith('\t')):
+            # indented code block, continues until the next non-indented line
+            if not drop_code:
+                result.append(visible[4:] if visible.startswith('    ') else visible[1:])
+            continue
+
+        previous_blank = False
+
+        if _LINK_DEFINITION_RE.match(visible) or _HORIZONTAL_RULE_RE.match(visible):
+            continue
+
+        if _SETEXT_UNDERLINE_RE.match(visible) and result and result[-1]:
+            continue
+
+        if '|' in visible:
+            if _TABLE_DELIMITER_RE.match(visible):
+                in_table = True
+                continue
+            if in_table or (index + 1 < len(lines) and
+                            _TABLE_DELIMITER_RE.match(lines[index + 1])):
+                visible = _TABLE_CELL_SEPARATOR_RE.sub(' ', stripped.strip('|'))
+
+        match = _BLOCKQUOTE_RE.match(visible)
+        if match:
+            visible = visible[match.end():]
+            if not visible.strip():
+                result.append('')
+                continue
+
+        match = _ATX_HEADING_RE.match(visible)
+        if match:
+            result.append(_strip_markdown_inline(match.group(1) or ''))
+            in_list = False
+            continue
+
+        match = _LIST_ITEM_RE.match(visible)
+        if match:
+            visible = visible[match.end():]
+            in_list = True
+        elif not visible[0].isspace():
+            in_list = False
+
+        result.append(_strip_markdown_inline(visible.strip()))
+
+    return '\n'.join(result)
+
+
+def _rst_settings():
+    """Get settings for parsing reStructuredText without any reporting or file access."""
+    try:
+        settings = frontend.get_default_settings(RstParser)
+    except AttributeError:
+        # docutils<0.19
+        settings = frontend.OptionParser(components=(RstParser,)).get_default_values()
+
+    # report level above severe, system messages are not created in the doctree
+    settings.report_level = 5
+    settings.halt_level = 5
+    settings.warning_stream = False
+    settings.file_insertion_enabled = False
+    settings.raw_enabled = False
+    # tokens of highlighted code are not needed, only its text
+    settings.syntax_highlight = 'none'
+    return settings
+
+
+_RST_SETTINGS = _rst_settings()
+# docutils parser keeps state of the document being parsed, each thread needs its own
+_rst_local = threading.local()
+
+
+def _get_rst_parser():
+    """Get reStructuredText parser of the current thread."""
+    parser = getattr(_rst_local, 'parser', None)
+    if parser is None:
+        parser = _rst_local.parser = RstParser()
+    return parser
+
+
+def _collect_rst_text(node, parts):
+    """Collect text of doctree node children, block elements are separated by a newline."""
+    for child in node.children:
+        if isinstance(child, nodes.Text):
+            parts.append(child.astext())
+        elif not isinstance(child, _RST_SKIPPED_NODES):
+            _collect_rst_text(child, parts)
+            if not isinstance(child, nodes.Inline):
+                parts.append('\n')
+
+
+def strip_restructuredtext(content):
+    """Turn reStructuredText to plain text walking its doctree, without writing it to HTML.
+
+    Only substitutions are resolved in the doctree, other transforms are not needed for the
+    text. Comments, raw content and system messages are omitted.
+
+    :param content: reStructuredText content
+    :type content: str
+    :return: plain text
+    :rtype: str
+    """
+    document = utils.new_document('<string>', _RST_SETTINGS)
+    _get_rst_parser().parse(content, document)
+    document.transformer.add_transform(Substitutions)
+    document.transformer.apply_transforms()
+
+    parts = []
+    _collect_rst_text(document, parts)
+    return ''.join(parts)
+
+
+_HTML_TAG_RE = re.compile(r'</?[a-zA-Z][a-zA-Z0-9-]*(?:\s[^<>]*)?/?>')
+
+
+def _formatting_re(marks, constrained=True):
+    """Compile regexp matching text enclosed in a pair of inline formatting marks.
+
+    :param marks: regexp of alternative marks
+    :param constrained: marks have to be delimited by whitespace or punctuation
+    :return: compiled regexp, enclosed text is captured in group 'text'
+    """
+    before, after = '', ''
+    if constrained:
+        before = r'''(?:^|(?<=[\s(\[{'"-]))'''
+        after = r'''(?=[\s)\]}'".,;:!?-]|$)'''
+    return re.compile(r'%s(?P<mark>%s)(?=\S)(?P<text>.{1,%d}?)(?<=\S)(?P=mark)%s'
+                      % (before, marks, _MAX_FORMATTING_SPAN, after))
+
+
+def _strip_formatting(formatting_re, line):
+    """Remove pairs of inline formatting marks from a line of text, nested ones included."""
+    for _ in range(3):
+        line, count = formatting_re.subn(r'\g<text>', line)
+        if not count:
+            break
+    return line
+
+
+def _strip_tags(line):
+    """Remove raw HTML tags and resolve character references in a line of text."""
+    if '<' in line:
+        line = _HTML_TAG_RE.sub('', line)
+    if '&' in line:
+        line = html.unescape(line)
+    return line
+
+
+_ADOC_BLOCK_DELIMITER_RE = re.compile(r'^(-{4,}|\.{4,}|\+{4,}|/{4,}|`{3,}[\w+-]*|={4,}|\*{4,}|'
+                                      r'_{4,}|--)[ \t]*$')
+# delimited blocks whose content is not AsciiDoc, keyed by delimiter character
+_ADOC_DELIMITED_BLOCKS = {'-': 'verbatim', '.': 'verbatim', '`': 'verbatim', '+': 'passthrough',
+                          '/': 'comment'}
+_ADOC_SETEXT_UNDERLINE_RE = re.compile(r'^(?:=+|-+|~+|\^+|\++)[ \t]*$')
+_ADOC_ATTRIBUTE_ENTRY_RE = re.compile(r'^:!?\w[\w-]*!?:(?:[ \t]|$)')
+_ADOC_BLOCK_ATTRIBUTES_RE = re.compile(r'^\[.*\][ \t]*$')
+_ADOC_BLOCK_MACRO_RE = re.compile(r'^[a-z]+::\S*\[.*\][ \t]*$')
+_ADOC_SECTION_TITLE_RE = re.compile(r'^(?:={1,6}|#{1,6})[ \t]+(\S.*)$')
+_ADOC_SECTION_TITLE_END_RE = re.compile(r'(?<=\S)[ \t]+=+$')
+_ADOC_BLOCK_TITLE_RE = re.compile(r'^\.([^\s.].*)$')
+_ADOC_ADMONITION_RE = re.compile(r'^(?:NOTE|TIP|IMPORTANT|WARNING|CAUTION):[ \t]+')
+_ADOC_LIST_ITEM_RE = re.compile(r'^[ \t]*(?:[*-]{1,5}|\.{1,5}|\d+\.|[a-zA-Z]\.|[ivxIVX]+\))'
+                                r'[ \t]+(?:\[[ x*]\][ \t]+)?')
+_ADOC_LABELED_LIST_ITEM_RE = re.compile(r'^[ \t]*(.+?)(?::{2,4}|;;)(?:[ \t]+(.*)|$)')
+_ADOC_TABLE_CELL_RE = re.compile(r'(?:^|(?<=\s))[\d.+*<^>]*[adehlmsv]?(?<!\\)\|')
+_ADOC_INLINE_RE = re.compile(r'''
+    (?P<image>image:[^\s\[]+\[[^\[\]]*\])
+  | (?P<link>(?:link:|mailto:|(?=(?:https?|ftp|irc)://))(?P<target>[^\s\[]+)
+      \[(?P<link_text>[^\[\]]*)\])
+  | (?P<macro>\b(?:footnote|footnoteref|kbd|btn|menu|pass|xref|anchor|icon|stem)
+      (?::[^\s\[]*)?\[(?P<macro_text>[^\[\]]*)\])
+  | (?P<xref><<(?P<xref_id>[^,<>]+)(?:,[ \t]*(?P<xref_text>[^<>]+))?>>)
+  | (?P<anchor>\[\[[^\[\]]*\]\]|\[[.\#][\w.\#-]*\](?=[\#*_`]))
+  | (?P<attribute>\{[\w-]+\})
+  | (?P<escape>\\(?P<escaped>[*_`\#+^~\[{<\\]))
+''', re.VERBOSE)
+_ADOC_UNCONSTRAINED_RE = _formatting_re(r'\*\*|__|``|\#\#|\+\+\+|\+\+', constrained=False)
+_ADOC_CONSTRAINED_RE = _formatting_re(r'[*_`#+]')
+
+
+def _asciidoc_inline_replacement(match):
+    """Replace inline AsciiDoc construct with its text."""
+    if match.group('link') is not None:
+        return match.group('link_text').split(',')[0].rstrip('^') or match.group('target')
+    if match.group('macro') is not None:
+        return match.group('macro_text').split(',')[-1]
+    if match.group('xref') is not None:
+        return match.group('xref_text') or match.group('xref_id')
+    if match.group('escape') is not None:
+        return match.group('escaped')
+    # images, anchors and unresolved attribute references
+    return ''
+
+
+def _strip_asciidoc_inline(line):
+    """Strip inline AsciiDoc markup from a line of text."""
+    if line.endswith(' +'):
+        # hard line break
+        line = line[:-2]
+    line = _ADOC_INLINE_RE.sub(_asciidoc_inline_replacement, line)
+    line = _strip_formatting(_ADOC_UNCONSTRAINED_RE, line)
+    line = _strip_formatting(_ADOC_CONSTRAINED_RE, line)
+    if '&' in line:
+        line = html.unescape(line)
+    return line
+
+
+def strip_asciidoc(content):
+    # pylint: disable=too-many-branches,too-many-statements
+    """Turn AsciiDoc to plain text in one pass, without rendering it.
+
+    Titles, inline formatting, macros, lists, admonitions and tables are stripped, text of
+    listing and literal blocks is kept as is. Comments, attribute entries, images and
+    block macros are omitted.
+
+    :param content: AsciiDoc content
+    :type content: str
+    :return: plain text
+    :rtype: str
+    """
+    result = []
+    # closing delimiter and kind of delimited block with non-AsciiDoc content
+    block = None
+    in_table = False
+    # previous paragraph line, a candidate for a two-line section title
+    previous = None
+
+    for line in content.splitlines():
+        if block is not None:
+            if line.rstrip() == block[0]:
+                block = None
+            elif block[1] == 'verbatim':
+                result.append(line)
+            elif block[1] == 'passthrough':
+                result.append(_strip_tags(line))
+            continue
+
+        stripped = line.strip()
+        if not stripped:
+            result.append('')
+            previous = None
+            continue
+
+        if previous is not None and _ADOC_SETEXT_UNDERLINE_RE.match(line) and \
+                len(stripped) > 1 and abs(len(stripped) - len(previous)) <= 2:
+            previous = None
+            continue
+        previous = None
+
+        match = _ADOC_BLOCK_DELIMITER_RE.match(line)
+        if match:
+            delimiter = match.group(1)
+            kind = _ADOC_DELIMITED_BLOCKS.get(delimiter[0])
+            if delimiter[0] == '`':
+                # language of code block is kept, it is a valuable hint for tagging
+                info = delimiter.lstrip('`')
+                if info:
+                    result.append(info)
+                delimiter = delimiter[:len(delimiter) - len(info)]
+            if kind is not None:
+                block = (delimiter, kind)
+            continue
+
+        if stripped.startswith('|==='):
+            in_table = not in_table
+            continue
+
+        if line.startswith('//') or _ADOC_ATTRIBUTE_ENTRY_RE.match(line) or \
+                _ADOC_BLOCK_ATTRIBUTES_RE.match(line) or _ADOC_BLOCK_MACRO_RE.match(line):
+            continue
+
+        match = _ADOC_SECTION_TITLE_RE.match(line)
+        if match:
+            title = match.group(1).rstrip()
+            # closing marks of symmetric titles
+            end = _ADOC_SECTION_TITLE_END_RE.search(title) if title.endswith('=') else None
+            result.append(_strip_asciidoc_inline(title[:end.start()] if end else title))
+            continue
+
+        match = _ADOC_BLOCK_TITLE_RE.match(line)
+        if match:
+            result.append(_strip_asciidoc_inline(match.group(1)))
+            continue
+
+        if in_table:
+            stripped = _ADOC_TABLE_CELL_RE.sub(' ', stripped).strip()
+        else:
+            match = _ADOC_ADMONITION_RE.match(stripped) or _ADOC_LIST_ITEM_RE.match(stripped)
+            if match:
+                stripped = stripped[match.end():]
+            elif '::' in stripped or ';;' in stripped:
+                match = _ADOC_LABELED_LIST_ITEM_RE.match(stripped)
+                if match:
+                    stripped = ' '.join(part for part in match.groups() if part)
+            else:
+                previous = stripped
+
+        result.append(_strip_asciidoc_inline(stripped))
+
+    return '\n'.join(result)
+
+
+_TEXTILE_ATTRIBUTES = r'(?:\([^()\n]*\)|\{[^{}\n]*\}|\[[^\[\]\n]*\]|[<>=()])*'
+_TEXTILE_BLOCK_RE = re.compile(r'^(?P<tag>h[1-6]|p|bq|bc|pre|fn\d+|notextile|clear|table|###)'
+                               r'%s(?P<extended>\.)?\.(?:[ \t]+|$)' % _TEXTILE_ATTRIBUTES)
+_TEXTILE_LINK_ALIAS_RE = re.compile(r'^\[[^\]\s]+\]\S+[ \t]*$')
+_TEXTILE_LIST_ITEM_RE = re.compile(r'^[ \t]*(?:[*#]+|[-;:])%s[ \t]+' % _TEXTILE_ATTRIBUTES)
+_TEXTILE_TABLE_ROW_RE = re.compile(r'^%s\.?[ \t]*\|' % _TEXTILE_ATTRIBUTES)
+_TEXTILE_TABLE_CELL_RE = re.compile(r'^(?:[_<>=^~]|\\\d+|/\d+|\([^()]*\)|\{[^{}]*\}|\[[^\[\]]*\])+'
+                                    r'\.(?:[ \t]+|$)')
+_TEXTILE_INLINE_RE = re.compile(r'''
+    (?P<link>\[?"(?P<link_text>[^"\n]+?)(?:\([^()\n]*\))?":[^\s<>"\]]*[^\s<>".,;:!?)\]]\]?)
+  | (?P<image>!(?:[<>=]|\([^()\n]*\)|\{[^{}\n]*\})*[^\s!(]+(?:\([^()\n]*\))?!
+      (?::[^\s<>"]*[^\s<>".,;:!?)])?)
+  | (?P<footnote>(?<=\S)\[\d+\])
+  | (?P<notextile>==(?P<notextile_text>.{1,%d}?)==)
+''' % _MAX_FORMATTING_SPAN, re.VERBOSE)
+_TEXTILE_FORMATTING_RE = re.compile(r'''(?:^|(?<=[\s(\[{'"-]))(?P<mark>\*\*|__|\?\?|[*_+\-^~@%%])'''
+                                    r'(?:\([^()\n]*\)|\{[^{}\n]*\}|\[[^\[\]\n]*\])*'
+                                    r'(?=\S)(?P<text>.{1,%d}?)(?<=\S)(?P=mark)'
+                                    r'''(?=[\s)\]}'".,;:!?-]|$)''' % _MAX_FORMATTING_SPAN)
+
+
+def _textile_inline_replacement(match):
+    """Replace inline Textile construct with its text."""
+    if match.group('link') is not None:
+        return match.group('link_text')
+    if match.group('notextile') is not None:
+        return match.group('notextile_text')
+    # images and footnote references
+    return ''
+
+
+def _strip_textile_inline(line):
+    """Strip inline Textile markup from a line of text."""
+    line = _TEXTILE_INLINE_RE.sub(_textile_inline_replacement, line)
+    line = _strip_formatting(_TEXTILE_FORMATTING_RE, line)
+    return _strip_tags(line)
+
+
+def strip_textile(content):
+    # pylint: disable=too-many-branches
+    """Turn Textile to plain text in one pass, without rendering it to HTML.
+
+    Block signatures, inline formatting, links, lists, tables and raw HTML markup are
+    stripped, text of code blocks is kept as is. Comments, images, link aliases and footnote
+    references are omitted.
+
+    :param content: Textile content
+    :type content: str
+    :return: plain text
+    :rtype: str
+    """
+    result = []
+    # 'verbatim' or 'comment' inside code, pre or comment blocks
+    block = None
+    extended = False
+
+    for line in content.splitlines():
+        match = _TEXTILE_BLOCK_RE.match(line)
+        if block is not None:
+            # extended blocks continue until the next block signature, others until a blank line
+            if (extended and not match) or (not extended and line.strip()):
+                if block == 'verbatim':
+                    result.append(line)
+                continue
+            block = None
+
+        if match:
+            tag = match.group('tag')
+            extended = match.group('extended') is not None
+            line = line[match.end():]
+            if tag == '###':
+                block = 'comment'
+                continue
+            if tag in ('bc', 'pre', 'notextile'):
+                block = 'verbatim'
+                if line.strip():
+                    result.append(line)
+                continue
+            if tag == 'table':
+                continue
+
+        stripped = line.strip()
+        if not stripped:
+            result.append('')
+            continue
+
+        if _TEXTILE_LINK_ALIAS_RE.match(stripped):
+            continue
+
+        match = _TEXTILE_TABLE_ROW_RE.match(stripped)
+        if match and stripped.endswith('|'):
+            cells = stripped[match.end():-1].split('|')
+            stripped = ' '.join(_TEXTILE_TABLE_CELL_RE.sub('', cell.strip()) for cell in cells)
+        else:
+            match = _TEXTILE_LIST_ITEM_RE.match(stripped)
+            if match:
+                stripped = stripped[match.end():].replace(':=', '')
+
+        result.append(_strip_textile_inline(stripped).strip())
+
+    return '\n'.join(result)
+
+
+_RDOC_RULE_RE = re.compile(r'^-{3,}[ \t]*$')
+_RDOC_DIRECTIVE_RE = re.compile(r'^[ \t]*:[\w-]+:(?:[ \t]|$)')
+_RDOC_LIST_ITEM_RE = re.compile(r'^[ \t]*(?:[*-]|\d+\.|[a-zA-Z]\.)[ \t]+')
+_RDOC_LABELED_LIST_ITEM_RE = re.compile(r'^[ \t]*(?:\[([^\]]+)\]|(\S[^:]*?)::)(?:[ \t]+|$)')
+_RDOC_INLINE_RE = re.compile(r'''
+    (?P<link>\{(?P<link_text>[^{}\n]+)\}\[[^\[\]\s]+\])
+  | (?P<word_link>(?<![\w.+-])(?P<word>[\w.+-]+)
+      \[(?:https?:|ftp:|mailto:|link:|rdoc-ref:|rdoc-label:|www\.)[^\[\]\s]*\])
+  | (?P<reference>(?:rdoc-ref|link):(?P<reference_target>\S+))
+  | (?P<label>rdoc-label:\S+)
+  | (?P<escape>\\(?P<escaped>[*_+<\\#:]))
+''', re.VERBOSE)
+_RDOC_FORMATTING_RE = re.compile(r'(?<![\w\\])(?P<mark>[*_+])(?P<text>[\w#:./-]*\w)(?P=mark)(?!\w)')
+
+
+def _rdoc_inline_replacement(match):
+    """Replace inline RDoc construct with its text."""
+    if match.group('link') is not None:
+        return match.group('link_text')
+    if match.group('word_link') is not None:
+        return match.group('word')
+    if match.group('reference') is not None:
+        return match.group('reference_target')
+    if match.group('escape') is not None:
+        return match.group('escaped')
+    # labels of cross references
+    return ''
+
+
+def _strip_rdoc_inline(line):
+    """Strip inline RDoc markup from a line of text."""
+    line = _RDOC_INLINE_RE.sub(_rdoc_inline_replacement, line)
+    line = _RDOC_FORMATTING_RE.sub(r'\g<text>', line)
+    return _strip_tags(line)
+
+
+def strip_rdoc(content):
+    """Turn RDoc markup to plain text in one pass, without rendering it.
+
+    Headings, inline formatting, links and lists are stripped, text of verbatim blocks is
+    kept as is. Directives, rules and text excluded from documentation using -- and ++ are
+    omitted.
+
+    :param content: RDoc content
+    :type content: str
+    :return: plain text
+    :rtype: str
+    """
+    result = []
+    stopped = False
+    in_list = False
+    previous_blank = True
+
+    for line in content.splitlines():
+        stripped = line.strip()
+        if stopped or stripped == '--':
+            stopped = stripped != '++'
+            continue
+
+        if not stripped:
+            result.append('')
+            previous_blank = True
+            continue
+
+        if previous_blank and not in_list and line[0].isspace():
+            # verbatim text, continues until the next non-indented line
+            result.append(line.rstrip())
+            continue
+        previous_blank = False
+
+        if _RDOC_RULE_RE.match(line) or _RDOC_DIRECTIVE_RE.match(line):
+            continue
+
+        if line.startswith('='):
+            result.append(_strip_rdoc_inline(stripped.lstrip('=').strip()))
+            in_list = False
+            continue
+
+        match = _RDOC_LIST_ITEM_RE.match(line)
+        label_match = _RDOC_LABELED_LIST_ITEM_RE.match(line) if not match else None
+        if match or label_match:
+            stripped = line[(match or label_match).end():].strip()
+            if label_match:
+                label = label_match.group(1) or label_match.group(2)
+                stripped = (label + ' ' + stripped).strip()
+            in_list = True
+        elif not line[0].isspace():
+            in_list = False
+
+        result.append(_strip_rdoc_inline(stripped))
+
+    return '\n'.join(result)
+
+
+_ORG_HEADLINE_RE = re.compile(r'^\*+[ \t]+(?:(?:TODO|DONE|NEXT|WAITING|CANCELL?ED)(?:[ \t]+|$))?'
+                              r'(?:\[#[A-Za-z0-9]\][ \t]*)?')
+_ORG_TAGS_RE = re.compile(r'[ \t]+:((?:[\w@#%]+:)+)[ \t]*$')
+_ORG_KEYWORD_RE = re.compile(r'^[ \t]*#\+(\w+)(?:\[[^\]]*\])?:[ \t]*(.*)$')
+_ORG_BLOCK_BEGIN_RE = re.compile(r'^[ \t]*#\+begin_(\w+)[ \t]*(\S*)', re.IGNORECASE)
+# keywords whose values are a part of the document text
+_ORG_TEXT_KEYWORDS = ('TITLE', 'SUBTITLE', 'DESCRIPTION', 'KEYWORDS', 'CAPTION')
+_ORG_COMMENT_RE = re.compile(r'^[ \t]*#(?:[ \t]|$)')
+_ORG_FIXED_WIDTH_RE = re.compile(r'^[ \t]*:(?:[ \t]|$)')
+_ORG_DRAWER_RE = re.compile(r'^[ \t]*:([\w-]+):[ \t]*$')
+_ORG_PLANNING_RE = re.compile(r'^[ \t]*(?:SCHEDULED|DEADLINE|CLOSED):')
+_ORG_RULE_RE = re.compile(r'^[ \t]*-{5,}[ \t]*$')
+_ORG_TABLE_RULE_RE = re.compile(r'^[ \t]*\|[-+]')
+_ORG_LIST_ITEM_RE = re.compile(r'^(?:[ \t]*[-+]|[ \t]+\*|[ \t]*(?:\d+|[a-zA-Z])[.)])[ \t]+'
+                               r'(?:\[@\d+\][ \t]+)?(?:\[[ Xx-]\][ \t]+)?')
+_ORG_IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.svg', '.bmp', '.tif', '.tiff')
+_ORG_INLINE_RE = re.compile(r'''
+    (?P<link>\[\[(?P<target>[^\[\]\n]+)\](?:\[(?P<description>[^\[\]\n]*)\])?\])
+  | (?P<target_definition><<<?(?P<target_text>[^<>\n]+)>>>?)
+  | (?P<footnote>\[fn:[\w-]*(?::(?P<footnote_text>[^\[\]\n]*))?\])
+  | (?P<macro>\{\{\{[^{}\n]*\}\}\})
+  | (?P<statistics>\[\d*(?:%|/\d*)\])
+''', re.VERBOSE)
+_ORG_FORMATTING_RE = re.compile(r'''(?:^|(?<=[\s\-({'"]))(?P<mark>[*/_=~+])(?=\S)'''
+                                r'(?P<text>.{1,%d}?)(?<=\S)(?P=mark)'
+                                r'''(?=[\s\-.,;:!?')}\["]|$)''' % _MAX_FORMATTING_SPAN)
+
+
+def _org_inline_replacement(match):
+    """Replace inline Org construct with its text."""
+    if match.group('link') is not None:
+        if match.group('description') is not None:
+            return match.group('description')
+        target = match.group('target')
+        if target.lower().endswith(_ORG_IMAGE_EXTENSIONS):
+            return ''
+        return target[5:] if target.startswith('file:') else target
+    if match.group('target_definition') is not None:
+        return match.group('target_text')
+    if match.group('footnote') is not None:
+        return match.group('footnote_text') or ''
+    # macros and statistics cookies
+    return ''
+
+
+def _strip_org_inline(line):
+    """Strip inline Org markup from a line of text."""
+    if line.endswith('\\\\'):
+        # hard line break
+        line = line[:-2]
+    line = _ORG_INLINE_RE.sub(_org_inline_replacement, line)
+    return _strip_formatting(_ORG_FORMATTING_RE, line)
+
+
+def strip_org(content):
+    # pylint: disable=too-many-branches,too-many-statements
+    """Turn Org mode markup to plain text in one pass, without exporting it.
+
+    Headlines (their tags are kept as words), inline formatting, links, lists and tables are
+    stripped, text of source and example blocks is kept as is. Comments, drawers, planning
+    lines and keywords not carrying document text are omitted.
+
+    :param content: Org content
+    :type content: str
+    :return: plain text
+    :rtype: str
+    """
+    result = []
+    # end line of block and its kind - 'verbatim', 'export' or 'comment'
+    block = None
+    in_drawer = False
+
+    for line in content.splitlines():
+        if block is not None:
+            if line.strip().lower() == block[0]:
+                block = None
+            elif block[1] == 'verbatim':
+                result.append(line)
+            elif block[1] == 'export':
+                result.append(_strip_tags(line))
+            continue
+
+        if in_drawer:
+            in_drawer = line.strip().upper() != ':END:'
+            continue
+
+        stripped = line.strip()
+        if not stripped:
+            result.append('')
+            continue
+
+        if line.startswith('*'):
+            match = _ORG_HEADLINE_RE.match(line)
+            if match:
+                title = line[match.end():]
+                tags = _ORG_TAGS_RE.search(title)
+                if tags:
+                    title = title[:tags.start()] + ' ' + tags.group(1).replace(':', ' ')
+                result.append(_strip_org_inline(title.strip()).strip())
+                continue
+
+        if stripped.startswith('#'):
+            match = _ORG_BLOCK_BEGIN_RE.match(line)
+            if match:
+                kind = match.group(1).lower()
+                if kind in ('src', 'example'):
+                    # language of source block is kept, it is a valuable hint for tagging
+                    if match.group(2) and kind == 'src':
+                        result.append(match.group(2))
+                    block = ('#+end_' + kind, 'verbatim')
+                elif kind in ('export', 'comment'):
+                    block = ('#+end_' + kind, kind)
+                continue
+
+            match = _ORG_KEYWORD_RE.match(line)
+            if match:
+                if match.group(1).upper() in _ORG_TEXT_KEYWORDS:
+                    result.append(_strip_org_inline(match.group(2)))
+                continue
+
+            if _ORG_COMMENT_RE.match(line) or stripped.startswith('#+'):
+                continue
+
+        if stripped.startswith(':'):
+            if _ORG_FIXED_WIDTH_RE.match(line):
+                result.append(stripped[2:])
+                continue
+            if _ORG_DRAWER_RE.match(line):
+                in_drawer = True
+                continue
+
+        if _ORG_PLANNING_RE.match(line) or _ORG_RULE_RE.match(line) or \
+                _ORG_TABLE_RULE_RE.match(line):
+            continue
+
+        if stripped.startswith('|'):
+            stripped = ' '.join(cell.strip() for cell in stripped.strip('|').split('|'))
+        else:
+            match = _ORG_LIST_ITEM_RE.match(line)
+            if match:
+                stripped = line[match.end():].strip().replace(' :: ', ' ')
+
+        result.append(_strip_org_inline(stripped))
+
+    return '\n'.join(result)
+
+
+_CREOLE_LIST_ITEM_RE = re.compile(r'^[ \t]*[*#]+[ \t]+')
+_CREOLE_RULE_RE = re.compile(r'^[ \t]*-{4,}[ \t]*$')
+_CREOLE_INLINE_RE = re.compile(r'''
+    (?P<nowiki>\{\{\{(?P<nowiki_text>.{0,%d}?)\}\}\}(?!\}))
+  | (?P<image>\{\{[^{}\n]*\}\})
+  | (?P<link>\[\[(?P<target>[^\[\]|\n]*)(?:\|(?P<link_text>[^\[\]\n]*))?\]\])
+  | (?P<placeholder><<<.{0,%d}?>>>)
+  | (?P<line_break>\\\\)
+  | (?P<escape>~(?P<escaped>\S))
+''' % (_MAX_FORMATTING_SPAN, _MAX_FORMATTING_SPAN), re.VERBOSE)
+_CREOLE_FORMATTING_RE = re.compile(r'(?P<mark>\*\*|(?<!:)//|\#\#|__)(?P<text>.{1,%d}?)'
+                                   r'(?<!:)(?P=mark)' % _MAX_FORMATTING_SPAN)
+# bold and italic are closed at the end of paragraph implicitly
+_CREOLE_UNCLOSED_FORMATTING_RE = re.compile(r'\*\*|(?<!:)//')
+
+
+def _creole_inline_replacement(match):
+    """Replace inline Creole construct with its text."""
+    if match.group('nowiki') is not None:
+        return match.group('nowiki_text')
+    if match.group('link') is not None:
+        return match.group('link_text') or match.group('target')
+    if match.group('line_break') is not None:
+        return ' '
+    if match.group('escape') is not None:
+        return match.group('escaped')
+    # images and placeholders
+    return ''
+
+
+def _strip_creole_inline(line):
+    """Strip inline Creole markup from a line of text."""
+    line = _CREOLE_INLINE_RE.sub(_creole_inline_replacement, line)
+    line = _strip_formatting(_CREOLE_FORMATTING_RE, line)
+    return _CREOLE_UNCLOSED_FORMATTING_RE.sub('', line)
+
+
+def strip_creole(content):
+    """Turn Creole to plain text in one pass, without rendering it.
+
+    Headings, inline formatting, links, lists and tables are stripped, text of preformatted
+    blocks is kept as is. Images, placeholders and horizontal rules are omitted.
+
+    :param content: Creole content
+    :type content: str
+    :return: plain text
+    :rtype: str
+    """
+    result = []
+    preformatted = False
+
+    for line in content.splitlines():
+        stripped = line.strip()
+        if preformatted:
+            if stripped == '}}}':
+                preformatted = False
+            else:
+                result.append(line)
+            continue
+
+        if stripped == '{{{':
+            preformatted = True
+            continue
+
+        if not stripped or _CREOLE_RULE_RE.match(line):
+            result.append('')
+            continue
+
+        if stripped.startswith('='):
+            stripped = stripped.strip('=').strip()
+        elif stripped.startswith('|'):
+            cells = _strip_creole_inline(stripped.strip('|')).split('|')
+            result.append(' '.join(cell.lstrip('=').strip() for cell in cells))
+            continue
+        else:
+            match = _CREOLE_LIST_ITEM_RE.match(line)
+            if match:
+                stripped = line[match.end():].strip()
+
+        result.append(_strip_creole_inline(stripped))
+
+    return '\n'.join(result)
+
+
+_MEDIAWIKI_TEMPLATE_RE = re.compile(r'\{\{|\}\}')
+_MEDIAWIKI_RULE_RE = re.compile(r'^-{4,}[ \t]*$')
+_MEDIAWIKI_LIST_ITEM_RE = re.compile(r'^[*#:;]+[ \t]*')
+_MEDIAWIKI_TABLE_CELL_SEPARATOR_RE = re.compile(r'\|\||!!')
+# namespaces of links which are not rendered as a text
+_MEDIAWIKI_MEDIA_NAMESPACES = ('file', 'image', 'media')
+_MEDIAWIKI_INLINE_RE = re.compile(r'''
+    (?P<link>\[\[(?P<target>[^\[\]|\n]*)(?:\|(?P<link_text>[^\[\]\n]*))?\]\](?P<trail>[a-z]*))
+  | (?P<external>\[(?:(?:https?|ftp|mailto|irc|news):|//)[^\s\[\]]*
+      (?:[ \t]+(?P<external_text>[^\[\]\n]*))?\])
+  | (?P<formatting>'{2,5})
+  | (?P<switch>__[A-Z]+__)
+  | (?P<signature>~{3,5})
+''', re.VERBOSE)
+
+
+def _mediawiki_inline_replacement(match):
+    """Replace inline MediaWiki construct with its text."""
+    if match.group('link') is not None:
+        target = match.group('target').strip().lstrip(':')
+        namespace, _, name = target.partition(':')
+        namespace = namespace.strip().lower()
+        if name and namespace in _MEDIAWIKI_MEDIA_NAMESPACES:
+            return ''
+        if name and namespace == 'category':
+            return name
+        return (match.group('link_text') or target) + match.group('trail')
+    if match.group('external') is not None:
+        return match.group('external_text') or ''
+    # formatting, behavior switches and signatures
+    return ''
+
+
+def _strip_mediawiki_templates(line, depth):
+    """Remove templates which can be nested and span multiple lines.
+
+    :param line: line to process
+    :param depth: nesting level of templates opened on previous lines
+    :return: tuple - line without templates, nesting level of templates left open
+    """
+    result = []
+    position = 0
+    for match in _MEDIAWIKI_TEMPLATE_RE.finditer(line):
+        if depth == 0:
+            result.append(line[position:match.start()])
+        if match.group() == '{{':
+            depth += 1
+        elif depth > 0:
+            depth -= 1
+        else:
+            # stray closing braces are a part of text
+            result.append('}}')
+        position = match.end()
+
+    if depth == 0:
+        result.append(line[position:])
+    return ''.join(result), depth
+
+
+def _strip_mediawiki_inline(line):
+    """Strip inline MediaWiki markup from a line of text."""
+    for _ in range(3):
+        # links can be nested in captions of images
+        line, count = _MEDIAWIKI_INLINE_RE.subn(_mediawiki_inline_replacement, line)
+        if not count:
+            break
+    return _strip_tags(line)
+
+
+def strip_mediawiki(content):
+    # pylint: disable=too-many-branches
+    """Turn MediaWiki markup to plain text in one pass, without rendering it.
+
+    Headings, inline formatting, links, lists, tables and raw HTML markup are stripped.
+    Templates, comments, images and behavior switches are omitted.
+
+    :param content: MediaWiki content
+    :type content: str
+    :return: plain text
+    :rtype: str
+    """
+    result = []
+    hidden_end = None
+    template_depth = 0
+
+    for line in content.splitlines():
+        visible = line
+        if hidden_end is not None or '<' in visible:
+            visible, hidden_end = _strip_hidden(visible, hidden_end)
+        if template_depth or '{{' in visible or '}}' in visible:
+            visible, template_depth = _strip_mediawiki_templates(visible, template_depth)
+
+        stripped = visible.strip()
+        if not stripped:
+            if not line.strip():
+                result.append('')
+            continue
+
+        if _MEDIAWIKI_RULE_RE.match(stripped) or stripped.startswith(('{|', '|}', '|-')):
+            continue
+
+        if stripped[0] in '|!':
+            if stripped.startswith('|+'):
+                # table caption
+                stripped = stripped[2:]
+            else:
+                cells = []
+                for cell in _MEDIAWIKI_TABLE_CELL_SEPARATOR_RE.split(stripped[1:]):
+                    cell = _strip_mediawiki_inline(cell)
+                    # attributes of cell are separated by a single pipe
+                    cells.append(cell.rpartition('|')[2].strip())
+                result.append(' '.join(cells))
+                continue
+        elif stripped[0] == '=' and stripped[-1] == '=':
+            stripped = stripped.strip('=').strip()
+        else:
+            match = _MEDIAWIKI_LIST_ITEM_RE.match(stripped)
+            if match:
+                stripped = stripped[match.end():]
+
+        result.append(_strip_mediawiki_inline(stripped).strip())
+
+    return '\n'.join(result)
+
+
+_POD_COMMAND_RE = re.compile(r'^=([a-zA-Z]\w*)(?:[ \t]+(.*))?$')
+_POD_ITEM_BULLET_RE = re.compile(r'^(?:\*|\d+\.?)(?:[ \t]+|$)')
+_POD_FORMATTING_CODE_RE = re.compile(r'(?P<open>[A-Z](?:<<+[ \t]+|<))|'
+                                     r'(?P<close>(?<![ \t])[ \t]+>>+|>)')
+_POD_ENTITIES = {'lt': '<', 'gt': '>', 'verbar': '|', 'sol': '/'}
+
+
+def _pod_code_text(code, text):
+    """Get text of POD formatting code."""
+    if code in ('X', 'Z'):
+        # index entries and null codes
+        return ''
+    if code == 'E':
+        if text in _POD_ENTITIES:
+            return _POD_ENTITIES[text]
+        try:
+            return chr(int(text, 0) if text.startswith('0x') else int(text))
+        except (ValueError, OverflowError):
+            return html.unescape('&%s;' % text)
+    if code == 'L':
+        if '|' in text:
+            return text.split('|', 1)[0]
+        if '://' not in text:
+            # links to sections, e.g. perlfunc/"open"
+            return text.replace('/', ' ').replace('"', '').strip()
+    return text
+
+
+def _strip_pod_formatting(line):
+    """Strip POD formatting codes, nested ones included, from a line of text."""
+    # formatting codes opened - code letter, number of angle brackets and text parts
+    stack = [(None, 0, [])]
+    position = 0
+
+    for match in _POD_FORMATTING_CODE_RE.finditer(line):
+        stack[-1][2].append(line[position:match.start()])
+        position = match.end()
+        token = match.group()
+
+        if match.group('open') is not None:
+            stack.append((token[0], token.count('<'), []))
+            continue
+
+        whitespace = token.rstrip('>')
+        brackets = len(token) - len(whitespace)
+        if stack[-1][1] > 1 and whitespace and brackets >= stack[-1][1]:
+            code, count, parts = stack.pop()
+            stack[-1][2].append(_pod_code_text(code, ''.join(parts)))
+            brackets -= count
+        else:
+            stack[-1][2].append(whitespace)
+
+        while brackets and stack[-1][1] == 1:
+            code, _, parts = stack.pop()
+            stack[-1][2].append(_pod_code_text(code, ''.join(parts)))
+            brackets -= 1
+        stack[-1][2].append('>' * brackets)
+
+    stack[-1][2].append(line[position:])
+    # text of formatting codes left open is kept, it follows text of the enclosing ones
+    return ''.join(part for _, _, parts in stack for part in parts)
+
+
+def strip_pod(content):
+    # pylint: disable=too-many-branches
+    """Turn Perl POD to plain text in one pass, without rendering it.
+
+    Headings, list items and formatting codes are stripped, text of verbatim paragraphs is
+    kept as is. Code outside of POD, index entries and content for other formatters than
+    text (e.g. HTML or comments) are omitted.
+
+    :param content: POD content
+    :type content: str
+    :return: plain text
+    :rtype: str
+    """
+    result = []
+    in_pod = True
+    # format of =begin region skipped, if any
+    skipped_region = None
+    skipped_paragraph = False
+
+    for line in content.splitlines():
+        match = _POD_COMMAND_RE.match(line) if line.startswith('=') else None
+        if match:
+            command, text = match.group(1), (match.group(2) or '').strip()
+            if skipped_region is not None:
+                if command == 'end' and text.split()[:1] == [skipped_region]:
+                    skipped_region = None
+                continue
+
+            in_pod = command != 'cut'
+            skipped_paragraph = False
+            if command.startswith('head'):
+                result.append(_strip_pod_formatting(text))
+            elif command == 'item':
+                bullet = _POD_ITEM_BULLET_RE.match(text)
+                if bullet:
+                    text = text[bullet.end():]
+                if text:
+                    result.append(_strip_pod_formatting(text))
+            elif command in ('begin', 'for'):
+                target, _, text = text.partition(' ')
+                # regions for formatters starting with a colon contain POD
+                if target != 'text' and not target.startswith(':'):
+                    if command == 'begin':
+                        skipped_region = target
+                    else:
+                        skipped_paragraph = True
+                elif text.strip():
+                    result.append(_strip_pod_formatting(text.strip()))
+            continue
+
+        if not in_pod or skipped_region is not None:
+            continue
+
+        if not line.strip():
+            skipped_paragraph = False
+            result.append('')
+        elif skipped_paragraph:
+            continue
+        elif line[0].isspace():
+            # verbatim paragraph
+            result.append(line.rstrip())
+        else:
+            result.append(_strip_pod_formatting(line.strip()))
+
+    return '\n'.join(result)
@@ -1,44 +1,62 @@
 #!/usr/bin/env python3
 """Keywords extraction/tagging for fabric8-analytics."""
 
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from itertools import chain
 import os
 
-import anymarkup
 import daiquiri
 from f8a_tagger.collectors import CollectorBase
+from f8a_tagger.compiled_keywords_chief import CompiledKeywordsChief
 import f8a_tagger.defaults as defaults
 from f8a_tagger.errors import InvalidInputError
+from f8a_tagger.keywords_aggregator import KeywordsAggregator
 from f8a_tagger.keywords_chief import KeywordsChief
+from f8a_tagger.keywords_diff import KeywordsDelta
 from f8a_tagger.keywords_set import KeywordsSet
 from f8a_tagger.lemmatizer import Lemmatizer
+from f8a_tagger.lookup_pool import LookupPool
 from f8a_tagger.parsers import CoreParser
+from f8a_tagger.parsers import SandboxedParser
+from f8a_tagger.result_cache import ResultCache
 from f8a_tagger.scoring import Scoring
 from f8a_tagger.stemmer import Stemmer
 from f8a_tagger.tokenizer import Tokenizer
 from f8a_tagger.utils import iter_files
+from f8a_tagger.utils import iter_keywords_file
 from f8a_tagger.utils import progressbarize
 
 _logger = daiquiri.getLogger(__name__)
 
 
 def _prepare_lookup(keywords_file=None, stopwords_file=None, ngram_size=None, lemmatize=False,
-                    stemmer=None):
+                    stemmer=None, parser_options=None):
     # pylint: disable=too-many-arguments
     """Prepare resources for keywords lookup.
 
-    :param keywords_file: keywords file to be used
+    :param keywords_file: keywords file or compiled keywords database to be used
     :param stopwords_file: stopwords file to be used
     :param ngram_size: size of ngrams, if None, ngram size is computed
     :param lemmatize: use lemmatizer
     :type lemmatize: bool
     :param stemmer: stemmer to be used
     :type stemmer: str
+    :param parser_options: additional arguments for markup parsers keyed by content type
+    :type parser_options: dict
     """
     stemmer_instance = Stemmer.get_stemmer(stemmer) if stemmer is not None else None
     lemmatizer_instance = Lemmatizer.get_lemmatizer() if lemmatize else None
 
-    chief = KeywordsChief(keywords_file, lemmatizer=lemmatizer_instance, stemmer=stemmer_instance)
+    if CompiledKeywordsChief.is_compiled_keywords_file(keywords_file):
+        chief = CompiledKeywordsChief(keywords_file)
+        if chief.metadata != _get_compile_metadata(lemmatize, stemmer):
+            _logger.warning("Compiled keywords database '%s' was compiled with different "
+                            "stemmer or lemmatizer configuration (%s)",
+                            keywords_file, chief.metadata)
+    else:
+        chief = KeywordsChief(keywords_file, lemmatizer=lemmatizer_instance,
+                              stemmer=stemmer_instance)
     computed_ngram_size = chief.compute_ngram_size()
     if ngram_size is not None and computed_ngram_size > ngram_size:
         _logger.warning("Computed ngram size (%d) does not reflect supplied ngram size (%d), "
@@ -49,10 +67,46 @@ def _prepare_lookup(keywords_file=None, stopwords_file=None, ngram_size=None, le
     tokenizer = Tokenizer(stopwords_file, ngram_size, lemmatizer=lemmatizer_instance,
                           stemmer=stemmer_instance)
 
-    return ngram_size, tokenizer, chief, CoreParser()
+    return ngram_size, tokenizer, chief, CoreParser(parser_options)
+
+
+def _compute_digest(ngram_size, tokenizer, chief, lemmatize, stemmer, scorer):
+    # pylint: disable=too-many-arguments
+    """Compute digest of lookup configuration, equal configurations give equal results.
+
+    :return: digest of effective keywords, stopwords and lookup options
+    :rtype: str
+    """
+    # keywords and stopwords are already lemmatized and stemmed
+    if isinstance(chief, CompiledKeywordsChief):
+        keywords = chief.digest
+    else:
+        keywords = dict(chief.keywords)
+    return ResultCache.compute_fingerprint(keywords=keywords,
+                                           raw_stopwords=tokenizer.raw_stopwords,
+                                           regexp_stopwords=tokenizer.regexp_stopwords,
+                                           ngram_size=ngram_size,
+                                           lemmatize=bool(lemmatize),
+                                           stemmer=stemmer,
+                                           scorer=scorer or defaults.DEFAULT_SCORER)
+
+
+def _get_fingerprint(result_cache, ngram_size, tokenizer, chief, lemmatize, stemmer, scorer):
+    # pylint: disable=too-many-arguments
+    """Compute fingerprint of lookup configuration for result cache.
+
+    :param result_cache: result cache to be used, if any
+    :return: fingerprint of lookup configuration, None if no result cache is used
+    """
+    if result_cache is None:
+        return None
+
+    return _compute_digest(ngram_size, tokenizer, chief, lemmatize, stemmer, scorer)
 
 
-def _perform_lookup(content, tokenizer, chief, scorer):
+def _perform_lookup(content, tokenizer, chief, scorer, result_cache=None, fingerprint=None,
+                    corpus=None, name=None):
+    # pylint: disable=too-many-arguments
     """Perform actual keyword lookup.
 
     :param content: content on which keyword lookup should be performed
@@ -60,19 +114,152 @@ def _perform_lookup(content, tokenizer, chief, scorer):
     :param chief: keywords chief instance to be used
     :param scorer: name of scorer to be used
     :type scorer: str
+    :param result_cache: result cache to be used, if any
+    :type result_cache: f8a_tagger.result_cache.ResultCache
+    :param fingerprint: fingerprint of lookup configuration, see _get_fingerprint()
+    :param corpus: corpus to which extracted tokens should be added, if any
+    :type corpus: f8a_tagger.corpus.Corpus
+    :param name: name of corpus entry
     """
+    # tokens are needed for corpus even if the result is cached
+    if result_cache is not None and corpus is None:
+        result = result_cache.get(fingerprint, content)
+        if result is not None:
+            return result
+
     tokens = tokenizer.tokenize(content)
     # We do not perform any analysis on sentences now, so treat all tokens as
     # one array (sentences of tokens).
     tokens = chain(*tokens)
-    keywords = chief.extract_keywords(tokens)
+    if corpus is not None:
+        tokens = list(tokens)
+        corpus.add(name, tokens)
+    keyword_ids = chief.extract_keyword_ids(tokens)
     scorer = Scoring.get_scoring(scorer or defaults.DEFAULT_SCORER)
-    return scorer.score(chief, keywords)
+    result = scorer.score_ids(chief, keyword_ids)
+
+    if result_cache is not None:
+        result_cache.store(fingerprint, content, result)
+
+    return result
+
+
+def _parse_file(core_parser, file_name):
+    """Parse file in the current process.
+
+    :return: tuple - file name, parsed content (None on failure), exception (None on success)
+    """
+    try:
+        return file_name, core_parser.parse_file(file_name), None
+    except Exception as exc:  # pylint: disable=broad-except
+        return file_name, None, exc
+
+
+def _get_file_size(item):
+    """Get size of a file as yielded by iter_files() in bytes, 0 if it cannot be determined."""
+    file = item[1]
+    try:
+        return os.path.getsize(file if isinstance(file, str) else file.name)
+    except OSError:
+        return 0
+
+
+def _iter_parsed_files(files, core_parser, sandbox=None):
+    """Parse files yielded by iter_files(), remove temporary files once they are processed.
+
+    :param files: files as yielded by iter_files()
+    :param core_parser: core parser instance to be used if no sandbox is used
+    :param sandbox: sandboxed parser to be used for parsing, if any
+    :return: generator of tuples - project, file name, parsed content (None on failure)
+             and exception (None on success)
+    """
+    projects = {}
+
+    def iter_file_names():
+        for project, file in files:
+            file_name = file
+            if not isinstance(file, str):
+                file_name = file.name
+            _logger.info("Processing file '%s' for project '%s'", file_name, project)
+            projects[file_name] = (project, file)
+            yield file_name
+
+    if sandbox is not None:
+        results = sandbox.imap(iter_file_names())
+    else:
+        results = (_parse_file(core_parser, file_name) for file_name in iter_file_names())
+
+    for file_name, content, error in results:
+        project, file = projects.pop(file_name)
+        try:
+            yield project, file_name, content, error
+        finally:
+            # Remove temporary file here so we can use safely progressbar
+            if not isinstance(file, str):
+                _logger.debug("Removing temporary file '%s' for project '%s'", file_name, project)
+                os.remove(file_name)
+
+
+def _iter_lookup_results(parsed_files, tokenizer, chief, scorer, result_cache=None,
+                         fingerprint=None, corpus=None, lookup_pool=None):
+    # pylint: disable=too-many-arguments
+    """Perform keywords lookup on parsed files, in lookup pool workers if provided.
+
+    :param parsed_files: parsed files as yielded by _iter_parsed_files()
+    :param lookup_pool: lookup pool to be used, lookup is done in the current process if None
+    :type lookup_pool: f8a_tagger.lookup_pool.LookupPool
+    :return: generator of tuples - project, file name, found keywords (None on failure) and
+             exception (None on success); results of lookup pool may be reordered
+    """
+    if lookup_pool is None:
+        for project, file_name, content, error in parsed_files:
+            keywords = None
+            if error is None:
+                try:
+                    keywords = _perform_lookup(content, tokenizer, chief, scorer, result_cache,
+                                               fingerprint, corpus, project)
+                except Exception as exc:  # pylint: disable=broad-except
+                    error = exc
+            yield project, file_name, keywords, error
+        return
+
+    # failed and cached files are reported without waiting for results of lookup pool
+    done = deque()
+
+    def iter_items():
+        for project, file_name, content, error in parsed_files:
+            if error is None and result_cache is not None and corpus is None:
+                keywords = result_cache.get(fingerprint, content)
+                if keywords is not None:
+                    done.append((project, file_name, keywords, None))
+                    continue
+            if error is not None:
+                done.append((project, file_name, None, error))
+                continue
+            # content is needed to store the result in cache
+            yield (project, file_name, content if result_cache is not None else None), content
+
+    for metadata, keywords, tokens, error in lookup_pool.imap(iter_items(), corpus is not None):
+        while done:
+            yield done.popleft()
+
+        project, file_name, content = metadata
+        if error is None:
+            if corpus is not None:
+                corpus.add(project, tokens)
+            if result_cache is not None:
+                result_cache.store(fingerprint, content, keywords)
+        yield project, file_name, keywords, error
+
+    while done:
+        yield done.popleft()
 
 
 def lookup_file(path, keywords_file=None, stopwords_file=None,
                 ignore_errors=False, ngram_size=None, use_progressbar=False,
-                lemmatize=False, stemmer=None, scorer=None):
+                lemmatize=False, stemmer=None, scorer=None, parser_options=None,
+                parse_workers=None, parse_timeout=None, parse_max_rss=None, result_cache=None,
+                corpus=None, lookup_workers=None, include=None, exclude=None):
     # pylint: disable=too-many-arguments,too-many-locals
     """Perform keywords lookup on a file or directory tree of files.
 
@@ -88,6 +275,23 @@ def lookup_file(path, keywords_file=None, stopwords_file=None,
     :type stemmer: str
     :param scorer: scorer to be used
     :type scorer: f8a_tagger.scoring.Scoring
+    :param parser_options: additional arguments for markup parsers keyed by content type
+    :type parser_options: dict
+    :param parse_workers: parse files in the given number of worker processes, if any of
+                          parse_* arguments is set, files are parsed in worker processes
+    :param parse_timeout: time limit for parsing a file in seconds
+    :param parse_max_rss: memory (resident set size) limit of a worker process in bytes
+    :param result_cache: cache of lookup results, files with unchanged text are not looked up
+                         again
+    :type result_cache: f8a_tagger.result_cache.ResultCache
+    :param corpus: corpus to which tokens of each project should be added, see retag()
+    :type corpus: f8a_tagger.corpus.Corpus
+    :param lookup_workers: perform lookup in the given number of worker processes, forked ones
+                           share lookup resources with the current process
+    :param include: glob patterns, look up only files in directory tree whose name or relative
+                    path matches any of them
+    :param exclude: glob patterns, skip files and directories in directory tree whose name or
+                    relative path matches any of them
     :return: found keywords, reported per file
     """
     ret = {}
@@ -95,33 +299,72 @@ def lookup_file(path, keywords_file=None, stopwords_file=None,
                                                                 stopwords_file,
                                                                 ngram_size,
                                                                 lemmatize,
-                                                                stemmer)
-    for project, file in progressbarize(iter_files(path, ignore_errors), progress=use_progressbar):
-        file_name = file
-        if not isinstance(file, str):
-            file_name = file.name
-        _logger.info("Processing file '%s' for project '%s'", file_name, project)
-        try:
-            content = core_parser.parse_file(file_name)
-            keywords = _perform_lookup(content, tokenizer, chief, scorer)
-        except Exception as exc:  # pylint: disable=broad-except
-            if not ignore_errors:
-                raise
-            _logger.exception("Failed to parse content in file '%s': %s", file_name, str(exc))
-            continue
-        finally:
-            # Remove temporary file here so we can use safely progressbar
-            if not isinstance(file, str):
-                _logger.debug("Removing temporary file '%s' for project '%s'", file_name, project)
-                os.remove(file_name)
+                                                                stemmer,
+                                                                parser_options)
+    fingerprint = _get_fingerprint(result_cache, ngram_size, tokenizer, chief, lemmatize,
+                                   stemmer, scorer)
+    lookup_pool = None
+    if lookup_workers is not None:
+        # fork before parsing workers are started, so they do not inherit their pipes
+        lookup_pool = LookupPool(tokenizer, chief, scorer, lookup_workers)
+    sandbox = None
+    if parse_workers is not None or parse_timeout is not None or parse_max_rss is not None:
+        sandbox = SandboxedParser(parse_workers, parse_timeout, parse_max_rss, parser_options)
+
+    # files in directory tree which cannot be parsed are skipped
+    walk_options = {'extensions': core_parser.get_supported_extensions(),
+                    'include': include, 'exclude': exclude}
+    total = None
+    if use_progressbar:
+        # walking directory tree is cheap compared to lookup, files are counted for ETA
+        total = sum(1 for _ in iter_files(path, True, **walk_options)) \
+            if os.path.isdir(path) else 1
+    files = iter_files(path, ignore_errors, **walk_options)
+    files = progressbarize(files, progress=use_progressbar, total=total,
+                           item_size=_get_file_size)
+    parsed_files = _iter_parsed_files(files, core_parser, sandbox)
+    results = _iter_lookup_results(parsed_files, tokenizer, chief, scorer, result_cache,
+                                   fingerprint, corpus, lookup_pool)
+    try:
+        for project, file_name, keywords, error in results:
+            if error is not None:
+                if not ignore_errors:
+                    raise error
+                _logger.error("Failed to parse content in file '%s': %s", file_name, str(error),
+                              exc_info=error)
+                continue
 
-        ret[project] = keywords
+            ret[project] = keywords
+    finally:
+        results.close()
+        parsed_files.close()
+        if sandbox is not None:
+            sandbox.close()
+        if lookup_pool is not None:
+            lookup_pool.close()
 
     return ret
 
 
+def _get_readme_content(readme):
+    """Get content and content type of a parsed README.json dict, validate them."""
+    if not isinstance(readme, dict):
+        raise InvalidInputError("Invalid README passed '%s' (type: %s), should be dict or JSON"
+                                % (readme, type(readme)))
+
+    content = readme.get('content')
+    content_type = readme.get('type')
+    if not content:
+        raise InvalidInputError("No content provided in README: '%s'" % readme)
+    if not content_type:
+        raise InvalidInputError("No content type provided in README.json")
+
+    return content, content_type
+
+
 def lookup_readme(readme, keywords_file=None, stopwords_file=None, ngram_size=None,
-                  lemmatize=False, stemmer=None, scorer=None):
+                  lemmatize=False, stemmer=None, scorer=None, parser_options=None,
+                  result_cache=None):
     # pylint: disable=too-many-arguments
     """Perform keywords lookup in a parsed README.json dict.
 
@@ -135,29 +378,28 @@ def lookup_readme(readme, keywords_file=None, stopwords_file=None, ngram_size=No
     :type stemmer: str
     :param scorer: scorer to be used
     :type scorer: f8a_tagger.scoring.Scoring
+    :param parser_options: additional arguments for markup parsers keyed by content type
+    :type parser_options: dict
+    :param result_cache: cache of lookup results, unchanged text is not looked up again
+    :type result_cache: f8a_tagger.result_cache.ResultCache
     :return: found keywords
     """
     ngram_size, tokenizer, chief, core_parser = _prepare_lookup(keywords_file,
                                                                 stopwords_file,
                                                                 ngram_size,
                                                                 lemmatize,
-                                                                stemmer)
-    if not isinstance(readme, dict):
-        raise InvalidInputError("Invalid README passed '%s' (type: %s), should be dict or JSON"
-                                % (readme, type(readme)))
-
-    content = readme.get('content')
-    content_type = readme.get('type')
-    if not content:
-        raise InvalidInputError("No content provided in README: '%s'" % readme)
-    if not content_type:
-        raise InvalidInputError("No content type provided in README.json")
-
-    return _perform_lookup(core_parser.parse(content, content_type), tokenizer, chief, scorer)
+                                                                stemmer,
+                                                                parser_options)
+    content, content_type = _get_readme_content(readme)
+    fingerprint = _get_fingerprint(result_cache, ngram_size, tokenizer, chief, lemmatize,
+                                   stemmer, scorer)
+    return _perform_lookup(core_parser.parse(content, content_type), tokenizer, chief, scorer,
+                           result_cache, fingerprint)
 
 
 def lookup_text(text, keywords_file=None, stopwords_file=None, ngram_size=None,
-                lemmatize=False, stemmer=None, scorer=None):
+                lemmatize=False, stemmer=None, scorer=None, parser_options=None,
+                result_cache=None):
     # pylint: disable=too-many-arguments
     """Perform keywords lookup on a plain text.
 
@@ -171,40 +413,136 @@ def lookup_text(text, keywords_file=None, stopwords_file=None, ngram_size=None,
     :type stemmer: str
     :param scorer: scorer to be used
     :type scorer: f8a_tagger.scoring.Scoring
+    :param parser_options: additional arguments for markup parsers keyed by content type
+    :type parser_options: dict
+    :param result_cache: cache of lookup results, unchanged text is not looked up again
+    :type result_cache: f8a_tagger.result_cache.ResultCache
     :return: found keywords
     """
     ngram_size, tokenizer, chief, core_parser = _prepare_lookup(keywords_file,
                                                                 stopwords_file,
                                                                 ngram_size,
                                                                 lemmatize,
-                                                                stemmer)
+                                                                stemmer,
+                                                                parser_options)
     if not isinstance(text, str):
         raise InvalidInputError("Invalid text passed '%s' (type: %s), should be string" %
                                 (text, type(text)))
-    return _perform_lookup(core_parser.parse(text, 'txt'), tokenizer, chief, scorer)
+    fingerprint = _get_fingerprint(result_cache, ngram_size, tokenizer, chief, lemmatize,
+                                   stemmer, scorer)
+    return _perform_lookup(core_parser.parse(text, 'txt'), tokenizer, chief, scorer,
+                           result_cache, fingerprint)
 
 
-def collect(collector=None, ignore_errors=False, use_progressbar=False):
-    """Collect keywords from external resources.
+def retag(corpus, previous_results, old_keywords_file, keywords_file=None, lemmatize=False,
+          stemmer=None, use_progressbar=False):
+    # pylint: disable=too-many-arguments
+    """Update results of lookup after keywords file changed without looking up files again.
+
+    Only tokens which can match keywords that were added, removed or whose synonyms or regexps
+    changed are looked up again in the corpus.
+
+    :param corpus: corpus with tokens of projects as collected by lookup_file()
+    :type corpus: f8a_tagger.corpus.Corpus
+    :param previous_results: results of lookup_file() with 'Count' scorer on the same projects
+    :type previous_results: dict
+    :param old_keywords_file: keywords file used to compute previous results
+    :param keywords_file: updated keywords file
+    :param lemmatize: use lemmatizer, has to match configuration used to compute corpus
+    :type lemmatize: bool
+    :param stemmer: stemmer to be used, has to match configuration used to compute corpus
+    :type stemmer: str
+    :param use_progressbar: use progressbar to report progress
+    :return: found keywords, reported per project
+    """
+    stemmer_instance = Stemmer.get_stemmer(stemmer) if stemmer is not None else None
+    lemmatizer_instance = Lemmatizer.get_lemmatizer() if lemmatize else None
+
+    old_chief = KeywordsChief(old_keywords_file, lemmatizer=lemmatizer_instance,
+                              stemmer=stemmer_instance)
+    new_chief = KeywordsChief(keywords_file, lemmatizer=lemmatizer_instance,
+                              stemmer=stemmer_instance)
+    if new_chief.compute_ngram_size() > old_chief.compute_ngram_size():
+        _logger.warning("Ngram size computed on the new keywords file (%d) is greater than the "
+                        "one used to compute corpus (%d), some synonyms will be omitted",
+                        new_chief.compute_ngram_size(), old_chief.compute_ngram_size())
+
+    delta = KeywordsDelta(old_chief, new_chief)
+    _logger.info("Keywords added: %d, removed: %d, changed: %d",
+                 len(delta.added), len(delta.removed), len(delta.changed))
+
+    ret = {}
+    for project, tokens in progressbarize(corpus.items(), use_progressbar):
+        ret[project] = delta.apply(tokens, previous_results.get(project) or {})
+
+    return ret
+
+
+def _get_compile_metadata(lemmatize, stemmer):
+    """Get metadata stored in compiled keywords database, lookup configuration has to match."""
+    return {'lemmatize': bool(lemmatize), 'stemmer': stemmer}
+
+
+def compile_keywords(output_file, keywords_file=None, stemmer=None, lemmatize=False):
+    """Compile keywords file to a memory mapped keywords database for lookup.
+
+    The database can be passed as keywords file to lookup functions, it is shared by all lookup
+    workers instead of parsing the keywords file in each of them.
+
+    :param output_file: path to keywords database to be written
+    :param keywords_file: keywords file to be compiled
+    :param stemmer: stemmer to be used, has to match configuration used on lookup
+    :type stemmer: str
+    :param lemmatize: use lemmatizer, has to match configuration used on lookup
+    :type lemmatize: bool
+    """
+    stemmer_instance = Stemmer.get_stemmer(stemmer) if stemmer is not None else None
+    lemmatizer_instance = Lemmatizer.get_lemmatizer() if lemmatize else None
+
+    chief = KeywordsChief(keywords_file, lemmatizer=lemmatizer_instance, stemmer=stemmer_instance)
+    CompiledKeywordsChief.compile(chief, output_file, _get_compile_metadata(lemmatize, stemmer))
+
+
+def collect_keywords_set(collector=None, ignore_errors=False, use_progressbar=False,
+                         resume=False):
+    """Collect keywords from external resources to a keywords set.
+
+    The keywords set can be serialized directly using its dump() method.
 
     :param collector: a list/tuple of collectors to be used
     :param ignore_errors: if True, ignore all errors, but report them
     :param use_progressbar: use progressbar if True
-    :return: all collected keywords
+    :param resume: continue from the last checkpoint of collectors
+    :return: all collected keywords, occurrence counts of keywords found by more collectors are
+             summed
+    :rtype: f8a_tagger.keywords_set.KeywordsSet
     """
     keywords_set = KeywordsSet()
     for col in (collector or CollectorBase.get_registered_collectors()):
         # pylint: disable=superfluous-parens
         try:
             collector_instance = CollectorBase.get_collector_class(col)()
-            keywords_set.union(collector_instance.execute(ignore_errors, use_progressbar))
+            keywords_set.merge(collector_instance.execute(ignore_errors, use_progressbar, resume))
         except Exception as exc:
             if ignore_errors:
                 _logger.exception("Collection of keywords for '%s' failed: %s" % (col, str(exc)))
                 continue
             raise
 
-    return keywords_set.keywords
+    return keywords_set
+
+
+def collect(collector=None, ignore_errors=False, use_progressbar=False, resume=False):
+    """Collect keywords from external resources.
+
+    :param collector: a list/tuple of collectors to be used
+    :param ignore_errors: if True, ignore all errors, but report them
+    :param use_progressbar: use progressbar if True
+    :param resume: continue from the last checkpoint of collectors
+    :return: all collected keywords, occurrence counts of keywords found by more collectors are
+             summed
+    """
+    return collect_keywords_set(collector, ignore_errors, use_progressbar, resume).to_dict()
 
 
 def check_input_keywords_file(input_keywords_file):
@@ -213,62 +551,49 @@ def check_input_keywords_file(input_keywords_file):
         raise ValueError('No input keywords files provided')
 
 
+def _aggregate_file(input_file):
+    """Aggregate keywords of a single keywords file.
+
+    :param input_file: path to keywords file
+    :return: aggregated keywords
+    :rtype: f8a_tagger.keywords_aggregator.KeywordsAggregator
+    """
+    aggregator = KeywordsAggregator()
+    aggregator.update(iter_keywords_file(input_file))
+    return aggregator
+
+
 def aggregate(input_keywords_file, no_synonyms=None, use_progressbar=False,
-              occurrence_count_filter=None):
-    # pylint: disable=too-many-branches
+              occurrence_count_filter=None, workers=None):
     """Aggregate available topics.
 
     :param input_keywords_file: a list/tuple of input keywords files to process
     :param no_synonyms: do not compute synonyms for keywords
     :param use_progressbar: use progressbar to report progress
     :param occurrence_count_filter: filter out keywords with low occurrence count
+    :param workers: number of processes parsing input files in parallel, number of CPUs if not
+                    provided
     :return:
     """
     check_input_keywords_file(input_keywords_file)
 
-    occurrence_count_filter = occurrence_count_filter or 0
-
-    all_keywords = {}
-    for input_file in progressbarize(input_keywords_file or [], use_progressbar):
-        input_content = anymarkup.parse_file(input_file)
-        for keyword, value in input_content.items():
-            keyword = str(keyword)
-
-            if not KeywordsChief.matches_keyword_pattern(keyword):
-                _logger.debug("Dropping keyword '%s' as it does not match keyword pattern.",
-                              keyword)
-                continue
-
-            if keyword in all_keywords.keys() and value is not None and \
-               all_keywords[keyword] is not None:
-                all_keywords[keyword]['occurrence_count'] = \
-                    value.pop('occurrence_count', 0) + \
-                    all_keywords[keyword].get('occurrence_count', 0)
-                for conf, items in value.items():
-                    all_keywords[keyword][str(conf)] = list(
-                        set(items or []) | set(all_keywords[keyword][str(conf)] or []))
-            else:
-                all_keywords[keyword] = value if value is not None else {}
-
-            if not no_synonyms:
-                synonyms = list(set(all_keywords[keyword].get('synonyms') or []) |
-                                set(KeywordsChief.compute_synonyms(keyword)))
-
-                if synonyms:
-                    if all_keywords[str(keyword)] is None:
-                        all_keywords[str(keyword)] = {}
-                    all_keywords[str(keyword)]['synonyms'] = synonyms
-
-    # filter out keywords with low occurrence count
-    if occurrence_count_filter > 1:
-        result = {}
-        for keyword, value in all_keywords.items():
-            if value.get('occurrence_count', 1) > occurrence_count_filter:
-                result[keyword] = value
+    input_keywords_file = list(input_keywords_file)
+    workers = min(workers or os.cpu_count() or 1, len(input_keywords_file))
 
-        return result
+    aggregator = KeywordsAggregator()
+    if workers <= 1:
+        for input_file in progressbarize(input_keywords_file, use_progressbar):
+            aggregator.update(iter_keywords_file(input_file))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_aggregate_file, input_file)
+                       for input_file in input_keywords_file]
+            for idx in progressbarize(range(len(futures)), use_progressbar):
+                aggregator.merge(futures[idx].result())
+                # do not keep merged results in memory
+                futures[idx] = None
 
-    return all_keywords
+    return aggregator.get_keywords(no_synonyms, occurrence_count_filter)
 
 
 def reckon(keywords_file=None, stopwords_file=None, stemmer=None, lemmatize=False):
@@ -288,7 +613,7 @@ def reckon(keywords_file=None, stopwords_file=None, stemmer=None, lemmatize=Fals
     chief = KeywordsChief(keywords_file, lemmatizer=lemmatizer_instance, stemmer=stemmer_instance)
     tokenizer = Tokenizer(stopwords_file, lemmatizer=lemmatizer_instance, stemmer=stemmer_instance)
 
-    result['keywords'] = chief.keywords
+    result['keywords'] = dict(chief.keywords)
     result['stopwords'] = sorted(tokenizer.raw_stopwords) + sorted(tokenizer.regexp_stopwords)
 
     return result
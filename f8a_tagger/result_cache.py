@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""Persistent cache of keywords lookup results keyed by content of documents."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import daiquiri
+import f8a_tagger.defaults as defaults
+from f8a_tagger.utils import get_files_dir
+
+_logger = daiquiri.getLogger(__name__)
+
+
+class ResultCache(object):
+    """Persistent on-disk cache of keywords lookup results.
+
+    Results are keyed by a hash of the parsed text and a fingerprint of lookup configuration
+    (keywords, stopwords, ngram size, stemmer, lemmatizer and scorer), so an unchanged document
+    looked up with unchanged configuration is not tokenized and matched again. The total size
+    of cached results is bounded, least recently used results are evicted first.
+    """
+
+    _INDEX_FILE = 'results.sqlite'
+    # bump when format of cached results or the way they are computed changes
+    _VERSION = 1
+
+    def __init__(self, cache_dir=None, max_size=None):
+        """Construct.
+
+        :param cache_dir: directory where cached results should be stored
+        :param max_size: maximum size of cached results in bytes
+        """
+        self._cache_dir = cache_dir or os.path.join(get_files_dir(), 'result-cache')
+        self._max_size = max_size if max_size is not None else defaults.RESULT_CACHE_MAX_SIZE
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(self._cache_dir, exist_ok=True)
+        self._connection = sqlite3.connect(os.path.join(self._cache_dir, self._INDEX_FILE),
+                                           check_same_thread=False)
+        # results can be always computed again, durability is not needed
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS results ("
+                                 "key TEXT PRIMARY KEY, result TEXT, size INTEGER, "
+                                 "last_access REAL)")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS results_last_access "
+                                 "ON results (last_access)")
+        self._connection.commit()
+        self._total_size = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+
+    def __enter__(self):
+        """Use result cache as a context manager, see close()."""
+        return self
+
+    def __exit__(self, *args):
+        """Close the cache."""
+        self.close()
+
+    def close(self):
+        """Close the cache, statistics are logged."""
+        if self._connection is None:
+            return
+
+        _logger.info("Result cache: %d hits, %d misses, %d bytes cached",
+                     self.hits, self.misses, self._total_size)
+        with self._lock:
+            self._connection.close()
+            self._connection = None
+
+    @property
+    def total_size(self):
+        """Get total size of cached results in bytes."""
+        return self._total_size
+
+    @property
+    def stats(self):
+        """Get statistics of cache usage since the cache was constructed.
+
+        :return: number of cache hits and misses, and size of cached results in bytes
+        :rtype: dict
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'size': self._total_size}
+
+    @classmethod
+    def compute_fingerprint(cls, **configuration):
+        """Compute fingerprint of lookup configuration.
+
+        :param configuration: JSON serializable values affecting lookup results
+        :return: fingerprint to be used with get() and store()
+        :rtype: str
+        """
+        configuration['version'] = cls._VERSION
+        serialized = json.dumps(configuration, sort_keys=True, default=str)
+        return hashlib.sha256(serialized.encode()).hexdigest()
+
+    @staticmethod
+    def _key(fingerprint, text):
+        """Compute cache key for the given text looked up with the given configuration."""
+        digest = hashlib.sha256(fingerprint.encode())
+        digest.update(text.encode('utf-8', errors='surrogatepass'))
+        return digest.hexdigest()
+
+    def get(self, fingerprint, text):
+        """Get cached lookup result, mark it as recently used.
+
+        :param fingerprint: fingerprint of lookup configuration, see compute_fingerprint()
+        :param text: parsed text on which lookup is performed
+        :return: cached result, None if the text was not looked up yet
+        """
+        key = self._key(fingerprint, text)
+        with self._lock:
+            entry = self._connection.execute("SELECT result FROM results WHERE key = ?",
+                                             (key,)).fetchone()
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._connection.execute("UPDATE results SET last_access = ? WHERE key = ?",
+                                     (time.time(), key))
+            self._connection.commit()
+
+        return json.loads(entry[0])
+
+    def store(self, fingerprint, text, result):
+        """Store lookup result in the cache.
+
+        :param fingerprint: fingerprint of lookup configuration, see compute_fingerprint()
+        :param text: parsed text on which lookup was performed
+        :param result: lookup result, JSON serializable
+        """
+        key = self._key(fingerprint, text)
+        serialized = json.dumps(result)
+        size = len(key) + len(serialized)
+
+        with self._lock:
+            previous = self._connection.execute("SELECT size FROM results WHERE key = ?",
+                                                (key,)).fetchone()
+            self._connection.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                                     (key, serialized, size, time.time()))
+            self._total_size += size - (previous[0] if previous else 0)
+            self._evict(keep=key)
+
+    def _evict(self, keep=None):
+        """Evict least recently used results until the cache fits in its size limit."""
+        while self._total_size > self._max_size:
+            entry = self._connection.execute(
+                "SELECT key, size FROM results WHERE key != ? ORDER BY last_access LIMIT 1",
+                (keep or '',)).fetchone()
+            if entry is None:
+                break
+
+            _logger.debug("Evicting cached result '%s' of size %d", entry[0], entry[1])
+            self._connection.execute("DELETE FROM results WHERE key = ?", (entry[0],))
+            self._total_size -= entry[1]
+
+        self._connection.commit()
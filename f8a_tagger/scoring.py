@@ -54,6 +54,17 @@ class Scoring(metaclass=abc.ABCMeta):
         :return: keywords with computed score
         """
 
+    def score_ids(self, chief, keyword_ids):
+        """Compute keywords score on ids of keywords.
+
+        :param chief: keywords chief instance
+        :param keyword_ids: ids of keywords with their occurrence count computed on lookup, see
+                            KeywordsChief.extract_keyword_ids()
+        :return: keywords with computed score
+        """
+        return self.score(chief, {chief.get_keyword_name(keyword_id): count
+                                  for keyword_id, count in keyword_ids.items()})
+
 
 class CountScoring(Scoring):
     """Count scoring."""
@@ -67,6 +78,16 @@ class CountScoring(Scoring):
         """
         return keywords
 
+    def score_ids(self, chief, keyword_ids):
+        """Compute keywords score on ids of keywords.
+
+        :param chief: keywords chief instance
+        :param keyword_ids: ids of keywords with their occurrence count computed on lookup
+        :return: keywords with computed score
+        """
+        return {chief.get_keyword_name(keyword_id): count
+                for keyword_id, count in keyword_ids.items()}
+
 
 class RelativeUsageScoring(Scoring):
     """Relative usage scoring."""
@@ -118,6 +139,29 @@ class RelativeUsageScoring(Scoring):
                 total_average_occurrence_count)
         return ret
 
+    def score_ids(self, chief, keyword_ids):
+        """Compute keywords score on ids of keywords.
+
+        :param chief: keywords chief instance
+        :param keyword_ids: ids of keywords with their occurrence count computed on lookup
+        :return: keywords with computed score
+        """
+        ret = {}
+        total_average_occurrence_count = chief.get_average_occurrence_count()
+        total_occurrence_counts = [(keyword_id, chief.get_occurrence_count(keyword_id), count)
+                                   for keyword_id, count in keyword_ids.items()]
+        keywords_avg_occurrence_count = sum([count / total_occurrence_count
+                                             for _, total_occurrence_count, count
+                                             in total_occurrence_counts])
+
+        for keyword_id, total_occurrence_count, count in total_occurrence_counts:
+            ret[chief.get_keyword_name(keyword_id)] = self._scoring_func(
+                total_occurrence_count,
+                count,
+                keywords_avg_occurrence_count,
+                total_average_occurrence_count)
+        return ret
+
 
 class TfIdfScoring(Scoring):
     """Scoring based on TF-IDF."""
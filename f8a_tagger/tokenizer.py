@@ -36,6 +36,8 @@ class Tokenizer(object):
 
         self._regexp_stopwords = []
         self._raw_stopwords = []
+        # lemmatized and stemmed tokens keyed by tokens as extracted from content
+        self._normalized_tokens = {}
         self._stemmer = stemmer or defaults.DEFAULT_STEMMER
         self._lemmatizer = lemmatizer or defaults.DEFAULT_LEMMATIZER
 
@@ -113,6 +115,43 @@ class Tokenizer(object):
         else:
             _logger.debug("Stemming will not be performed.")
 
+    def _normalize_token(self, token):
+        """Lemmatize and stem a token.
+
+        :param token: token to be normalized
+        :return: normalized token
+        """
+        new_token = token
+        if self._lemmatizer:
+            new_token = self._lemmatizer.lemmatize(new_token)
+        if self._stemmer:
+            new_token = self._stemmer.stem(new_token)
+
+        if new_token != token:
+            _logger.debug("Lemmatized and stemmed token '%s' to '%s'", token, new_token)
+
+        return new_token
+
+    def _normalize(self, tokens):
+        """Lemmatize and stem a list of tokens in place.
+
+        Tokens repeat a lot in text, so each distinct token is lemmatized and stemmed only once,
+        results are kept for subsequent calls.
+
+        :param tokens: a list of tokens to normalize
+        """
+        if not self._lemmatizer and not self._stemmer:
+            return
+
+        normalized_tokens = self._normalized_tokens
+        for idx, token in enumerate(tokens):
+            new_token = normalized_tokens.get(token)
+            if new_token is None:
+                if len(normalized_tokens) >= defaults.NORMALIZED_TOKENS_CACHE_SIZE:
+                    normalized_tokens.clear()
+                new_token = normalized_tokens[token] = self._normalize_token(token)
+            tokens[idx] = new_token
+
     def remove_stopwords(self, tokens):
         """Remove stopwords from token list.
 
@@ -160,9 +199,8 @@ class Tokenizer(object):
 
         _logger.debug('Extracted tokens without lemmatization and stemming: %s', sentences)
 
-        for idx, sentence in enumerate(sentences):
-            self._lemmatize(sentence)
-            self._stem(sentence)
+        for sentence in sentences:
+            self._normalize(sentence)
         _logger.debug('Extracted tokens with lemmatization and stemming: %s', sentences)
 
         if remove_stopwords:
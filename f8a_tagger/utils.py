@@ -3,6 +3,7 @@
 
 from collections import deque
 from contextlib import contextmanager
+from fnmatch import fnmatch
 import json
 import os
 from os import chdir
@@ -10,14 +11,19 @@ from os import getcwd
 from pathlib import Path
 import tempfile
 
-import requests
-
 import daiquiri
 from f8a_tagger.errors import RemoteResourceMissingError
 import progressbar
+import yaml
 
 _logger = daiquiri.getLogger(__name__)
 
+# libyaml based loader is considerably faster, if available
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+_YAML_STR_TAG = 'tag:yaml.org,2002:str'
+_YAML_SEQ_TAG = 'tag:yaml.org,2002:seq'
+_YAML_MAP_TAG = 'tag:yaml.org,2002:map'
+
 
 def _get_remote_resource(item):
     """Get remote resource (e.g. README file).
@@ -25,7 +31,10 @@ def _get_remote_resource(item):
     :param item: remote resource location
     :return: tuple - content and content extension based on content type
     """
-    response = requests.get(item)
+    # Imported here as HTTP cache uses utilities from this module
+    from f8a_tagger.http_cache import get_http_cache
+
+    response = get_http_cache().get(item)
     if response.status_code != 200:
         raise RemoteResourceMissingError("Server returned HTTP status code: %d"
                                          % response.status_code)
@@ -37,42 +46,311 @@ def _get_remote_resource(item):
     return response.text, '.html'
 
 
-def iter_files(path, ignore_errors=True):
+def _matches_any(name, relative_path, patterns):
+    """Check whether an entry matches any of glob patterns, by its name or relative path."""
+    return any(fnmatch(name, pattern) or fnmatch(relative_path, pattern) for pattern in patterns)
+
+
+def _walk_directory(path, ignore_errors, extensions, include, exclude):
+    """Yield files in a directory tree, using file types reported by os.scandir().
+
+    :param path: path to a directory tree
+    :param ignore_errors: do not raise exceptions but rather report them
+    :param extensions: yield only files with the given extensions (lowercase), if any
+    :param include: yield only files matching any of glob patterns, if any
+    :param exclude: skip files and directories matching any of glob patterns
+    :return: paths to files
+    """
+    # directories to be scanned - path and path relative to the walked directory
+    stack = deque([(path, '')])
+
+    while stack:
+        directory, relative_directory = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError as exc:
+            if not ignore_errors:
+                raise
+            _logger.warning("Ignoring content in '%s': %s", directory, str(exc))
+            continue
+
+        for entry in entries:
+            relative_path = relative_directory + entry.name
+            if exclude and _matches_any(entry.name, relative_path, exclude):
+                continue
+
+            try:
+                is_dir = entry.is_dir()
+                is_file = not is_dir and entry.is_file()
+            except OSError:
+                is_dir = is_file = False
+
+            if is_dir:
+                stack.append((entry.path, relative_path + '/'))
+            elif is_file:
+                if extensions is not None and \
+                        os.path.splitext(entry.name)[1].lower() not in extensions:
+                    continue
+                if include and not _matches_any(entry.name, relative_path, include):
+                    continue
+                yield entry.path
+            else:
+                if not ignore_errors:
+                    raise ValueError("Not a directory nor file '%s'" % entry.path)
+
+                _logger.warning("Ignoring content in '%s'", entry.path)
+
+
+def iter_files(path, ignore_errors=True, extensions=None, include=None, exclude=None):
     """Yield each file in a directory tree.
 
+    Filters apply only to files found in a directory tree, a file passed as path is always
+    yielded.
+
     :param path: path to a directory tree to yield files
     :param ignore_errors: do not raise exceptions but rather report them
+    :param extensions: yield only files with the given extensions (e.g. '.md'), case
+                       insensitive; all files if None
+    :param include: glob patterns, yield only files whose name or path relative to the
+                    directory tree matches any of them
+    :param exclude: glob patterns, skip files and directories whose name or path relative
+                    to the directory tree matches any of them
     :return: file
     """
-    stack = deque([path])
+    if extensions is not None:
+        extensions = frozenset(extension.lower() for extension in extensions)
 
-    while stack:
-        item = stack.pop()
-
-        if os.path.isfile(item):
-            yield item, item
-        elif os.path.isdir(item):
-            for entry in os.listdir(item):
-                stack.append(os.path.join(item, entry))
-        elif item.startswith(('http://', 'https://')):
+    if os.path.isdir(path):
+        for file_path in _walk_directory(path, ignore_errors, extensions, include or (),
+                                         exclude or ()):
+            yield file_path, file_path
+    elif os.path.isfile(path):
+        yield path, path
+    elif path.startswith(('http://', 'https://')):
+        try:
+            content, suffix = _get_remote_resource(path)
+            temp_file = tempfile.NamedTemporaryFile(mode='w+t', delete=False, suffix=suffix)
+            temp_file.write(content)
+            temp_file.close()
+        except Exception as exc:  # pylint: disable=broad-except
+            error_msg = "Failed to retrieve remote file for '%s': %s" % (path, str(exc))
+            if not ignore_errors:
+                raise RuntimeError(error_msg) from exc
+
+            _logger.warning(error_msg)
+            return
+        yield path, temp_file
+    else:
+        if not ignore_errors:
+            raise ValueError("Not a directory nor file '%s'" % path)
+
+        _logger.warning("Ignoring content in '%s'", path)
+
+
+def iter_json_array(stream, chunk_size=64 * 1024):
+    """Yield items of a JSON array read from a text stream one by one.
+
+    Only the item being decoded is kept in memory, so arrays of any size can be processed.
+
+    :param stream: text stream with JSON array
+    :param chunk_size: number of characters read from stream at once
+    :return: decoded array items
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    started = False
+    eof = False
+
+    while True:
+        while position < len(buffer) and buffer[position] in ' \t\r\n':
+            position += 1
+
+        item = None
+        need_more = position == len(buffer)
+        if not need_more and not started:
+            if buffer[position] != '[':
+                raise ValueError("Expected JSON array, got '%s'" % buffer[position:position + 20])
+            started = True
+            position += 1
+            continue
+        elif not need_more and buffer[position] == ']':
+            return
+        elif not need_more and buffer[position] == ',':
+            position += 1
+            continue
+        elif not need_more:
             try:
-                content, suffix = _get_remote_resource(item)
-                temp_file = tempfile.NamedTemporaryFile(mode='w+t', delete=False, suffix=suffix)
-                temp_file.write(content)
-                temp_file.close()
-            except Exception as exc:  # pylint: disable=broad-except
-                error_msg = "Failed to retrieve remote file for '%s': %s" % (item, str(exc))
-                if not ignore_errors:
-                    raise RuntimeError(error_msg) from exc
+                item, end = decoder.raw_decode(buffer, position)
+                # the item is complete only if followed by a delimiter, it could be a number
+                # truncated at the end of buffer otherwise
+                delimiter = end
+                while delimiter < len(buffer) and buffer[delimiter] in ' \t\r\n':
+                    delimiter += 1
+                need_more = delimiter == len(buffer) or buffer[delimiter] not in ',]'
+            except ValueError:
+                need_more = True
 
-                _logger.warning(error_msg)
-                continue
-            yield item, temp_file
+        if need_more:
+            if eof:
+                raise ValueError("Unexpected end of JSON array or malformed JSON array")
+            chunk = stream.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+
+        yield item
+        position = end
+
+
+def iter_json_object(stream, chunk_size=64 * 1024):
+    """Yield key-value pairs of a JSON object read from a text stream one by one.
+
+    Only the value being decoded is kept in memory, so objects of any size can be processed.
+
+    :param stream: text stream with JSON object
+    :param chunk_size: number of characters read from stream at once
+    :return: tuples - decoded key and value
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    started = False
+    eof = False
+
+    while True:
+        while position < len(buffer) and buffer[position] in ' \t\r\n':
+            position += 1
+
+        key = value = None
+        need_more = position == len(buffer)
+        if not need_more and not started:
+            if buffer[position] != '{':
+                raise ValueError("Expected JSON object, got '%s'" % buffer[position:position + 20])
+            started = True
+            position += 1
+            continue
+        elif not need_more and buffer[position] == '}':
+            return
+        elif not need_more and buffer[position] == ',':
+            position += 1
+            continue
+        elif not need_more:
+            try:
+                key, end = decoder.raw_decode(buffer, position)
+                while end < len(buffer) and buffer[end] in ' \t\r\n':
+                    end += 1
+                if buffer[end:end + 1] != ':':
+                    raise ValueError("Expected ':' after key in JSON object")
+                end += 1
+                while end < len(buffer) and buffer[end] in ' \t\r\n':
+                    end += 1
+                value, end = decoder.raw_decode(buffer, end)
+                # the value is complete only if followed by a delimiter, it could be a number
+                # truncated at the end of buffer otherwise
+                delimiter = end
+                while delimiter < len(buffer) and buffer[delimiter] in ' \t\r\n':
+                    delimiter += 1
+                need_more = delimiter == len(buffer) or buffer[delimiter] not in ',}'
+            except ValueError:
+                need_more = True
+
+        if need_more:
+            if eof:
+                raise ValueError("Unexpected end of JSON object or malformed JSON object")
+            chunk = stream.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+
+        if not isinstance(key, str):
+            raise ValueError("Expected string key in JSON object, got '%s'" % key)
+
+        yield key, value
+        position = end
+
+
+def _construct_yaml(loader, event, anchors):
+    """Construct object from YAML events, the given event starts the object.
+
+    Objects are constructed directly from parser events, which is considerably faster than
+    composing and constructing representation graph. Only core YAML tags are supported.
+    """
+    if isinstance(event, yaml.AliasEvent):
+        return anchors[event.anchor]
+
+    if isinstance(event, yaml.ScalarEvent):
+        tag = event.tag
+        if tag is None or tag == '!':
+            tag = loader.resolve(yaml.ScalarNode, event.value, event.implicit)
+        if tag == _YAML_STR_TAG:
+            result = event.value
         else:
-            if not ignore_errors:
-                raise ValueError("Not a directory nor file '%s'" % item)
+            result = loader.construct_object(yaml.ScalarNode(tag, event.value, event.start_mark,
+                                                             event.end_mark, event.style))
+    elif isinstance(event, yaml.SequenceStartEvent) and event.tag in (None, '!', _YAML_SEQ_TAG):
+        result = []
+        while not loader.check_event(yaml.SequenceEndEvent):
+            result.append(_construct_yaml(loader, loader.get_event(), anchors))
+        loader.get_event()
+    elif isinstance(event, yaml.MappingStartEvent) and event.tag in (None, '!', _YAML_MAP_TAG):
+        result = {}
+        while not loader.check_event(yaml.MappingEndEvent):
+            key = _construct_yaml(loader, loader.get_event(), anchors)
+            result[key] = _construct_yaml(loader, loader.get_event(), anchors)
+        loader.get_event()
+    else:
+        raise ValueError("Unsupported YAML construct with tag '%s' at %s"
+                         % (getattr(event, 'tag', None), event.start_mark))
 
-            _logger.warning("Ignoring content in '%s'", item)
+    if event.anchor is not None:
+        anchors[event.anchor] = result
+
+    return result
+
+
+def iter_yaml_mapping(stream):
+    """Yield key-value pairs of a top-level YAML mapping read from a stream one by one.
+
+    Only the value being constructed is kept in memory, so mappings of any size can be processed.
+
+    :param stream: stream with YAML document
+    :return: tuples - constructed key and value
+    """
+    loader = _YAML_LOADER(stream)
+    anchors = {}
+    try:
+        loader.get_event()  # stream start
+        if loader.check_event(yaml.StreamEndEvent):
+            return
+        loader.get_event()  # document start
+
+        event = loader.get_event()
+        if not isinstance(event, yaml.MappingStartEvent):
+            if _construct_yaml(loader, event, anchors) is None:
+                return  # empty document
+            raise ValueError("Expected YAML mapping at %s" % event.start_mark)
+
+        while not loader.check_event(yaml.MappingEndEvent):
+            key = _construct_yaml(loader, loader.get_event(), anchors)
+            yield key, _construct_yaml(loader, loader.get_event(), anchors)
+    finally:
+        loader.dispose()
+
+
+def iter_keywords_file(path):
+    """Yield keywords and their configuration from a YAML or JSON keywords file one by one.
+
+    :param path: path to keywords file, JSON is expected for files with .json extension
+    :return: tuples - keyword and its configuration
+    """
+    with open(path, 'r') as f:
+        if path.endswith('.json'):
+            yield from iter_json_object(f)
+        else:
+            yield from iter_yaml_mapping(f)
 
 
 def json_dumps(dictionary, pretty=True):
@@ -93,23 +371,86 @@ def json_dumps(dictionary, pretty=True):
     return json.dumps(dictionary, **pretty_json_kwargs)
 
 
-def progressbarize(iterable, progress=False):
+class _ThroughputSpeed(progressbar.FileTransferSpeed):
+    """Widget showing throughput in bytes of processed items, counted by _iter_progress()."""
+
+    # progressbar copies widgets, counter of processed bytes has to stay shared
+    copy = False
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.processed_bytes = 0
+
+    def __call__(self, progress, data, value=None, total_seconds_elapsed=None):
+        """Report speed computed from processed bytes instead of processed items."""
+        return super().__call__(progress, data, self.processed_bytes, total_seconds_elapsed)
+
+
+def _iter_progress(iterable, total, item_size):
+    """Yield items of iterable, report progress as they are consumed.
+
+    :param iterable: iterable to use, it is not materialized
+    :param total: number of items, None if unknown
+    :param item_size: function computing size of an item in bytes, None if not applicable
+    """
+    widgets = [progressbar.Timer(), ', ']
+    if total is not None:
+        widgets += [progressbar.Percentage(), ', ', progressbar.SimpleProgress(), ', ']
+    else:
+        widgets += [progressbar.AnimatedMarker(), ' ', progressbar.Counter(), ', ']
+    # items are documents in most cases, sizes are not scaled to keep the unit readable
+    widgets.append(progressbar.FileTransferSpeed(unit='docs', prefixes=('',)))
+    throughput = None
+    if item_size is not None:
+        throughput = _ThroughputSpeed()
+        widgets += [', ', throughput]
+    if total is not None:
+        widgets += [', ', progressbar.ETA()]
+
+    bar = progressbar.ProgressBar(widgets=widgets,
+                                  max_value=total if total is not None else
+                                  progressbar.UnknownLength)
+    bar.start()
+    count = 0
+    try:
+        for item in iterable:
+            # size is computed before the item is handed over, it can be e.g. removed afterwards
+            size = item_size(item) if throughput is not None else 0
+            yield item
+            count += 1
+            if throughput is not None:
+                throughput.processed_bytes += size
+            if total is not None and count > total:
+                # items were added after they were counted
+                bar.max_value = total = count
+            bar.update(count)
+    finally:
+        bar.finish()
+
+
+def progressbarize(iterable, progress=False, total=None, item_size=None):
     """Construct progressbar for loops if progressbar requested, otherwise return directly iterable.
 
+    Iterable is not materialized, so items can be produced lazily (e.g. files found in
+    a directory tree). Percentage and ETA are reported if the number of items is known,
+    otherwise only the number of items processed and the rate.
+
     :param iterable: iterable to use
     :param progress: True if print progressbar
+    :param total: number of items in iterable, len() of iterable is used if not provided
+    :param item_size: function computing size of an item in bytes, throughput is reported
+                      if provided
     """
-    if progress:
-        # The casting to list is due to possibly yielded value that prevents
-        # ProgressBar to compute overall ETA
-        return progressbar.ProgressBar(widgets=[
-            progressbar.Timer(), ', ',
-            progressbar.Percentage(), ', ',
-            progressbar.SimpleProgress(), ', ',
-            progressbar.ETA()
-        ])(list(iterable))
-
-    return iterable
+    if not progress:
+        return iterable
+
+    if total is None:
+        try:
+            total = len(iterable)
+        except TypeError:
+            pass
+
+    return _iter_progress(iterable, total, item_size)
 
 
 @contextmanager
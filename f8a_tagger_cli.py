@@ -12,13 +12,19 @@ import yaml
 import anymarkup
 import daiquiri
 from f8a_tagger import aggregate
-from f8a_tagger import collect
+from f8a_tagger import collect_keywords_set
+from f8a_tagger import compile_keywords
+from f8a_tagger import Corpus
 from f8a_tagger import get_registered_collectors
 from f8a_tagger import get_registered_scorers
 from f8a_tagger import get_registered_stemmers
 from f8a_tagger import lookup_file
 from f8a_tagger import reckon
+from f8a_tagger import retag
+from f8a_tagger import ResultCache
 import f8a_tagger.defaults as defaults
+from f8a_tagger.keywords_diff import diff_keywords_entries
+from f8a_tagger.keywords_diff import diff_keywords_files
 from f8a_tagger.utils import json_dumps
 
 _logger = daiquiri.getLogger(__name__)
@@ -43,6 +49,36 @@ def _print_result(result, output_file, fmt=None):
         anymarkup.serialize_file(result, output_file, format=fmt)
 
 
+def _dump_keywords_set(keywords_set, output_file, fmt=None):
+    if not output_file or output_file == '-':
+        keywords_set.dump(sys.stdout, fmt or 'json')
+        print()
+        return
+
+    if fmt is None:  # try to guess format by file extension
+        extension = output_file.split('.')[-1]
+        fmt = extension if extension in ('yaml', 'yml', 'json') else defaults.DEFAULT_OUTPUT_FORMAT
+    elif fmt not in ('yaml', 'yml', 'json'):
+        # checked before the output file is truncated
+        raise ValueError("Unknown output format '%s'" % fmt)
+    _logger.debug("Serializing output to file '%s'", output_file)
+    with open(output_file, 'w') as f:
+        keywords_set.dump(f, fmt)
+
+
+def _dump_corpus(corpus, corpus_file):
+    if corpus_file.endswith('.json'):
+        corpus.dump_json(corpus_file)
+    else:
+        corpus.dump_pickle(corpus_file)
+
+
+def _load_corpus(corpus_file):
+    if corpus_file.endswith('.json'):
+        return Corpus.load_json(corpus_file)
+    return Corpus.load_pickle(corpus_file)
+
+
 @click.group()
 @click.option('-v', '--verbose', count=True,
               help='Level of verbosity, can be applied multiple times.')
@@ -58,7 +94,7 @@ def cli(verbose=0):
 @click.option('-o', '--output-file',
               help='Output file with found keywords.')
 @click.option('--keywords-file', type=click.Path(exists=True, file_okay=True, dir_okay=False),
-              help='Path to keywords file.')
+              help='Path to keywords file or compiled keywords database.')
 @click.option('--stopwords-file', type=click.Path(exists=True, file_okay=True, dir_okay=False),
               help='Path to stopwords file.')
 @click.option('--ignore-errors', is_flag=True,
@@ -76,12 +112,57 @@ def cli(verbose=0):
               help='Keywords scoring mechanism to be used, default: %s' % defaults.DEFAULT_SCORER)
 @click.option('--summary', '-s', is_flag=True,
               help='Print sorted summary.')
+@click.option('--markdown-backend', type=click.Choice(('lxml', 'beautifulsoup', 'text')),
+              help='Markdown to text conversion, "text" strips markup without rendering '
+                   'Markdown to HTML, default: lxml.')
+@click.option('--drop-code', is_flag=True,
+              help='Omit content of code blocks in Markdown files.')
+@click.option('--parse-workers', type=int,
+              help='Parse files in the given number of worker processes.')
+@click.option('--parse-timeout', type=float,
+              help='Time limit for parsing a file in seconds, implies parsing in worker '
+                   'processes.')
+@click.option('--parse-max-rss', type=int,
+              help='Limit of memory (MiB) a worker process can allocate while parsing a file, '
+                   'implies parsing in worker processes.')
+@click.option('--result-cache', type=click.Path(file_okay=False, dir_okay=True),
+              help='Directory with cached lookup results, unchanged files are not looked up '
+                   'again.')
+@click.option('--lookup-workers', type=int,
+              help='Perform lookup in the given number of worker processes sharing keywords, '
+                   'stopwords and NLTK data with the main process.')
+@click.option('--include', multiple=True,
+              help='Look up only files whose name or path relative to the given directory '
+                   'matches the glob pattern, can be applied multiple times.')
+@click.option('--exclude', multiple=True,
+              help='Skip files and directories whose name or path relative to the given '
+                   'directory matches the glob pattern, can be applied multiple times.')
+@click.option('--corpus-file', type=click.Path(file_okay=True, dir_okay=False),
+              help='Store tokens of looked up files to the given file for the retag command, '
+                   'JSON is used for files with .json extension, pickle otherwise.')
 def cli_lookup(path, **kwargs):
     """Perform keywords lookup."""
     output_file = kwargs.pop('output_file')
     output_format = kwargs.pop('output_format')
     summary = kwargs.pop('summary')
-    ret = lookup_file(path, use_progressbar=True, **kwargs)
+    markdown_options = {'drop_code': kwargs.pop('drop_code')}
+    markdown_backend = kwargs.pop('markdown_backend')
+    if markdown_backend:
+        markdown_options['backend'] = markdown_backend
+    kwargs['parser_options'] = {'markdown': markdown_options}
+    if kwargs['parse_max_rss'] is not None:
+        kwargs['parse_max_rss'] *= 1024 ** 2
+    corpus_file = kwargs.pop('corpus_file')
+    if corpus_file:
+        kwargs['corpus'] = Corpus()
+    result_cache_dir = kwargs.pop('result_cache')
+    if result_cache_dir:
+        with ResultCache(result_cache_dir) as result_cache:
+            ret = lookup_file(path, use_progressbar=True, result_cache=result_cache, **kwargs)
+    else:
+        ret = lookup_file(path, use_progressbar=True, **kwargs)
+    if corpus_file:
+        _dump_corpus(kwargs['corpus'], corpus_file)
     if summary:
         total = {}
         for f in ret:
@@ -100,12 +181,27 @@ def cli_lookup(path, **kwargs):
               help='Output keywords format/type.')
 @click.option('--ignore-errors', is_flag=True,
               help='Ignore errors, but report them.')
+@click.option('--resume', is_flag=True,
+              help='Continue from the last checkpoint of an interrupted run.')
 def cli_collect(**kwargs):
     """Collect keywords from external resources."""
     output_keywords_file = kwargs.pop('output_keywords_file')
     output_format = kwargs.pop('output_format')
-    ret = collect(use_progressbar=True, **kwargs)
-    _print_result(ret, output_keywords_file, output_format)
+    keywords_set = collect_keywords_set(use_progressbar=True, **kwargs)
+    _dump_keywords_set(keywords_set, output_keywords_file, output_format)
+
+
+@cli.command('compile')
+@click.argument('output_file', type=click.Path(file_okay=True, dir_okay=False))
+@click.option('--keywords-file', type=click.Path(exists=True, file_okay=True, dir_okay=False),
+              help='Path to keywords file.')
+@click.option('--stemmer', type=click.Choice(get_registered_stemmers()), multiple=False,
+              help='Stemmer type to be used, default: %s.' % defaults.DEFAULT_STEMMER)
+@click.option('--lemmatize', is_flag=True,
+              help='Use lemmatizer, default: %s' % defaults.DEFAULT_LEMMATIZER)
+def cli_compile(output_file, **kwargs):
+    """Compile keywords file to a keywords database for lookup."""
+    compile_keywords(output_file, **kwargs)
 
 
 @cli.command('aggregate')
@@ -120,6 +216,9 @@ def cli_collect(**kwargs):
 @click.option('--occurrence-count-filter', type=int,
               help="Filter out synonyms with low occurrence count (default: %d)." %
               defaults.OCCURRENCE_COUNT_FILTER)
+@click.option('--workers', type=int,
+              help='Number of processes parsing input keywords files in parallel, '
+                   'default: number of CPUs.')
 def cli_aggregate(**kwargs):
     """Aggregate keywords to a single file."""
     output_keywords_file = kwargs.pop('output_keywords_file')
@@ -130,37 +229,57 @@ def cli_aggregate(**kwargs):
     _print_result(ret, output_keywords_file, output_format)
 
 
-def find_diffs(keywords1, keywords2, keywords1_file_path, keywords2_file_path,
-               synonyms_only, keywords_only, regexp_only):
-    """Compute diff on keyword files."""
+def _select_diff_sections(diff, synonyms_only, keywords_only, regexp_only):
+    """Select sections of keywords diff based on diff command options."""
+    sections = []
+    if keywords_only or not (synonyms_only or regexp_only):
+        sections += ['added_keywords', 'removed_keywords']
+    if synonyms_only or not (keywords_only or regexp_only):
+        sections += ['added_synonyms', 'removed_synonyms']
+    if regexp_only or not (keywords_only or synonyms_only):
+        sections += ['added_regexps', 'removed_regexps']
+    if not (keywords_only or synonyms_only or regexp_only):
+        sections.append('changed_occurrence_counts')
+
+    return {section: diff[section] for section in sections}
+
+
+def _print_diff(diff, keywords1_file_path, keywords2_file_path):
+    """Print keywords diff in a human readable form.
+
+    :return: True if there are any differences
+    """
     differ = False
 
-    for action, keywords_a, keywords_b, file_path in (('Removed', keywords1, keywords2,
-                                                       keywords1_file_path),
-                                                      ('Added', keywords2, keywords1,
-                                                       keywords2_file_path)):
-        for keyword, value in keywords_a.items():
-            if not synonyms_only and not regexp_only and keyword not in keywords_b.keys():
-                print("%s keyword '%s' in file '%s'" % (action, keyword, file_path))
-                differ = True
-                continue
-
-            if not keywords_only and not regexp_only and value is not None:
-                for synonym in (value.get('synonyms') or[]):  # pylint: disable=superfluous-parens
-                    if synonym not in keywords_b[keyword].get('synonyms', []):
-                        print("%s synonym '%s' for keyword '%s' in file '%s'" %
-                              (action, synonym, keyword, file_path))
-                        differ = True
-
-            if not keywords_only and not synonyms_only and value is not None:
-                for regexp in (value.get('regexp') or []):  # pylint: disable=superfluous-parens
-                    if regexp not in keywords_b[keyword].get('regexp', []):
-                        print("%s regexp '%s' for keyword '%s' in file '%s'" %
-                              (action, regexp, keyword, file_path))
-                        differ = True
+    for action, file_path in (('Removed', keywords1_file_path), ('Added', keywords2_file_path)):
+        for keyword in diff.get(action.lower() + '_keywords', []):
+            print("%s keyword '%s' in file '%s'" % (action, keyword, file_path))
+            differ = True
+
+        for item_type, section in (('synonym', '_synonyms'), ('regexp', '_regexps')):
+            for keyword, items in sorted(diff.get(action.lower() + section, {}).items()):
+                for item in items:
+                    print("%s %s '%s' for keyword '%s' in file '%s'" %
+                          (action, item_type, item, keyword, file_path))
+                    differ = True
+
+    for keyword, (old_count, new_count) in sorted(diff.get('changed_occurrence_counts',
+                                                           {}).items()):
+        print("Changed occurrence count for keyword '%s' from %s to %s" %
+              (keyword, old_count, new_count))
+        differ = True
+
     return differ
 
 
+def find_diffs(keywords1, keywords2, keywords1_file_path, keywords2_file_path,
+               synonyms_only, keywords_only, regexp_only):
+    """Compute diff on keyword files."""
+    diff = diff_keywords_entries(keywords1.items(), keywords2.items())
+    diff = _select_diff_sections(diff, synonyms_only, keywords_only, regexp_only)
+    return _print_diff(diff, keywords1_file_path, keywords2_file_path)
+
+
 @cli.command('diff')
 @click.argument('keywords1_file_path', type=click.Path(exists=True, file_okay=True, dir_okay=False))
 @click.argument('keywords2_file_path', type=click.Path(exists=True, file_okay=True, dir_okay=False))
@@ -170,19 +289,25 @@ def find_diffs(keywords1, keywords2, keywords1_file_path, keywords2_file_path,
               help='Print only changes in keywords.')
 @click.option('-r', '--regexp-only', default=False, is_flag=True,
               help='Print only changes in regular expressions.')
+@click.option('-o', '--output-file',
+              help='Output file with structured diff.')
+@click.option('-f', '--output-format',
+              help='Output structured diff in the given format (json or yaml) instead of '
+                   'printing changes.')
 def cli_diff(keywords1_file_path, keywords2_file_path, synonyms_only=False, keywords_only=False,
-             regexp_only=False):
+             regexp_only=False, output_file=None, output_format=None):
     """Retrieve diff on keyword files."""
-    # pylint: disable=too-many-locals
+    # pylint: disable=too-many-arguments
     if synonyms_only and keywords_only:
         raise ValueError('Cannot use --synonyms-only and --keywords-only at the same time')
 
-    keywords1 = anymarkup.parse_file(keywords1_file_path)
-    keywords2 = anymarkup.parse_file(keywords2_file_path)
+    # the second file is streamed, it is never loaded to memory as a whole
+    diff = diff_keywords_files(keywords1_file_path, keywords2_file_path)
+    diff = _select_diff_sections(diff, synonyms_only, keywords_only, regexp_only)
 
-    differ = find_diffs(keywords1, keywords2, keywords1_file_path, keywords2_file_path,
-                        synonyms_only, keywords_only, regexp_only)
-    if not differ:
+    if output_file or output_format:
+        _print_result(diff, output_file, output_format)
+    elif not _print_diff(diff, keywords1_file_path, keywords2_file_path):
         print("Files '%s' and '%s' do not differ" % (keywords1_file_path, keywords2_file_path))
 
 
@@ -207,5 +332,32 @@ def cli_reckon(**kwargs):
     _print_result(ret, output_file, output_format)
 
 
+@cli.command('retag')
+@click.argument('corpus_file', type=click.Path(exists=True, file_okay=True, dir_okay=False))
+@click.argument('previous_results_file',
+                type=click.Path(exists=True, file_okay=True, dir_okay=False))
+@click.option('--old-keywords-file', type=click.Path(exists=True, file_okay=True, dir_okay=False),
+              help='Path to keywords file used to compute previous results, default keywords '
+                   'file if not provided.')
+@click.option('--keywords-file', type=click.Path(exists=True, file_okay=True, dir_okay=False),
+              help='Path to updated keywords file.')
+@click.option('-o', '--output-file',
+              help='Output file with found keywords.')
+@click.option('-f', '--output-format',
+              help='Output keywords format/type.')
+@click.option('--stemmer', type=click.Choice(get_registered_stemmers()), multiple=False,
+              help='Stemmer type used to compute corpus, default: %s.' % defaults.DEFAULT_STEMMER)
+@click.option('--lemmatize', is_flag=True,
+              help='Lemmatizer was used to compute corpus, default: %s'
+                   % defaults.DEFAULT_LEMMATIZER)
+def cli_retag(corpus_file, previous_results_file, **kwargs):
+    """Update lookup results (Count scorer) after keywords file changed."""
+    output_file = kwargs.pop('output_file')
+    output_format = kwargs.pop('output_format')
+    ret = retag(_load_corpus(corpus_file), anymarkup.parse_file(previous_results_file),
+                use_progressbar=True, **kwargs)
+    _print_result(ret, output_file, output_format)
+
+
 if __name__ == '__main__':
     sys.exit(cli())
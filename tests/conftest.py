@@ -1 +1,81 @@
 """Definition of fixtures for static data, sessions etc. used by unit tests."""
+
+from http.server import BaseHTTPRequestHandler
+from http.server import HTTPServer
+from socketserver import ThreadingMixIn
+import threading
+
+from f8a_tagger.http_cache import HttpCache
+import pytest
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    """HTTP server handling each connection in a separate thread."""
+
+    daemon_threads = True
+
+
+class StandInServer(object):
+    """Local stand-in for remote HTTP resources used by collectors and utilities.
+
+    Routes are registered as path -> (status code, headers, body), body can be also a callable
+    that accepts request headers and returns the whole (status code, headers, body) triplet.
+    """
+
+    def __init__(self):
+        """Start server on a random free port."""
+        self.routes = {}
+        self.requests = []
+        server = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):  # pylint: disable=invalid-name
+                """Serve GET request based on registered routes."""
+                server.requests.append((self.path, dict(self.headers)))
+                route = server.routes.get(self.path, (404, {}, b'Not Found'))
+                if callable(route):
+                    route = route(self.headers)
+                status, headers, body = route
+                if isinstance(body, str):
+                    body = body.encode()
+                self.send_response(status)
+                for header, value in headers.items():
+                    self.send_header(header, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):  # pylint: disable=arguments-differ
+                """Keep test output clean."""
+
+        self._httpd = _ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    @property
+    def url(self):
+        """Get base URL of the server."""
+        return 'http://127.0.0.1:%d' % self._httpd.server_address[1]
+
+    def stop(self):
+        """Stop the server."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def http_server():
+    """Provide a local stand-in HTTP server."""
+    server = StandInServer()
+    yield server
+    server.stop()
+
+
+@pytest.fixture(autouse=True)
+def shared_http_cache(tmpdir_factory, monkeypatch):
+    """Keep responses cached by the shared HTTP cache in a temporary directory."""
+    http_cache = HttpCache(str(tmpdir_factory.mktemp('http-cache')))
+    monkeypatch.setattr('f8a_tagger.http_cache._HTTP_CACHE', http_cache)
+    return http_cache
@@ -0,0 +1,55 @@
+"""Tests for the Checkpoint class."""
+
+import json
+
+from f8a_tagger.collectors.checkpoint import Checkpoint
+
+
+def test_initial_state(tmpdir):
+    """Check the initial state of Checkpoint."""
+    path = str(tmpdir.join('checkpoint.json'))
+    checkpoint = Checkpoint(path)
+    assert checkpoint.path == path
+    assert checkpoint.keywords_set.keywords == {}
+    assert not checkpoint.is_processed('foo')
+
+
+def test_save_and_load(tmpdir):
+    """Check that checkpoint can be saved and loaded."""
+    path = str(tmpdir.join('checkpoints', 'checkpoint.json'))
+    checkpoint = Checkpoint(path)
+    checkpoint.keywords_set.add('python', 2)
+    checkpoint.mark_processed('foo')
+    checkpoint.save()
+
+    with open(path, 'r') as f:
+        content = json.load(f)
+    assert content['processed'] == ['foo']
+
+    loaded = Checkpoint.load(path)
+    assert loaded.is_processed('foo')
+    assert not loaded.is_processed('bar')
+    assert loaded.keywords_set.keywords == {'python': {'occurrence_count': 2}}
+
+    loaded.remove()
+    assert not tmpdir.join('checkpoints', 'checkpoint.json').check()
+    # removing non-existing checkpoint is not an error
+    loaded.remove()
+
+
+def test_load_missing(tmpdir):
+    """Check that missing checkpoint starts from scratch."""
+    checkpoint = Checkpoint.load(str(tmpdir.join('checkpoint.json')))
+    assert checkpoint.keywords_set.keywords == {}
+
+
+def test_periodic_save(tmpdir):
+    """Check that checkpoint is saved once the interval elapses."""
+    path = tmpdir.join('checkpoint.json')
+    checkpoint = Checkpoint(str(path), interval=3600)
+    checkpoint.mark_processed('foo')
+    assert not path.check()
+
+    checkpoint = Checkpoint(str(path), interval=0)
+    checkpoint.mark_processed('foo')
+    assert path.check()
@@ -0,0 +1,124 @@
+"""Tests for the CompiledKeywordsChief class."""
+
+import io
+import multiprocessing
+import pickle
+
+import pytest
+from f8a_tagger.compiled_keywords_chief import CompiledKeywordsChief
+from f8a_tagger.errors import InvalidInputError
+from f8a_tagger.keywords_chief import KeywordsChief
+
+_KEYWORDS = """
+python:
+  synonyms:
+    - py
+    - python3
+  occurrence_count: 10
+django:
+  regexp:
+    - '.*django.*'
+flask:
+  synonyms:
+    - py
+    - flask-app
+machine-learning:
+  synonyms:
+    - machine learning
+"""
+
+_TOKENS = ["python", "py", "python3", "django", "mydjango", "flask", "flask-app",
+           "machine learning", "machine", "unknown", "ždjango", "Python"]
+
+
+def _compile(tmpdir, keywords=_KEYWORDS):
+    chief = KeywordsChief(io.StringIO(keywords))
+    database_file = str(tmpdir.join('keywords.db'))
+    CompiledKeywordsChief.compile(chief, database_file, {'stemmer': None})
+    return chief, CompiledKeywordsChief(database_file)
+
+
+def test_lookup(tmpdir):
+    """Test that compiled keywords are looked up the same way as by KeywordsChief."""
+    chief, compiled_chief = _compile(tmpdir)
+
+    for token in _TOKENS:
+        assert compiled_chief.get_keyword(token) == chief.get_keyword(token)
+
+    assert compiled_chief.extract_keywords(_TOKENS) == chief.extract_keywords(_TOKENS)
+    assert compiled_chief.extract_keyword_ids(_TOKENS) == chief.extract_keyword_ids(_TOKENS)
+    for keyword_id in range(chief.get_keywords_count()):
+        assert compiled_chief.get_keyword_name(keyword_id) == chief.get_keyword_name(keyword_id)
+        assert compiled_chief.get_occurrence_count(keyword_id) == \
+            chief.get_occurrence_count(keyword_id)
+    assert compiled_chief.get_keyword("py") == "python"
+    assert compiled_chief.get_keyword("mydjango") == "django"
+    assert compiled_chief.get_keyword("unknown") is None
+    assert compiled_chief.is_keyword("flask")
+    assert not compiled_chief.is_keyword("flask-app")
+
+
+def test_regexp_precedence(tmpdir):
+    """Test that regexps of preceding keywords take precedence over synonyms."""
+    chief, compiled_chief = _compile(tmpdir, "a1:\n  regexp:\n    - 'b.*'\nb2:\n  synonyms:\n"
+                                             "    - bx\nc3:\n  regexp:\n    - 'c.*'\n")
+
+    assert chief.get_keyword("bx") == "a1"
+    assert compiled_chief.get_keyword("bx") == "a1"
+    assert compiled_chief.get_keyword("b2") == "b2"
+    assert compiled_chief.get_keyword("cx") == "c3"
+
+
+def test_keywords(tmpdir):
+    """Test access to keywords and their configuration."""
+    chief, compiled_chief = _compile(tmpdir)
+
+    assert dict(compiled_chief.keywords) == chief.keywords
+    assert list(compiled_chief.keywords) == list(chief.keywords)
+    assert compiled_chief.keywords["python"]["occurrence_count"] == 10
+    assert "flask-app" not in compiled_chief.keywords
+    assert compiled_chief.get_keywords_count() == chief.get_keywords_count() == 4
+    assert compiled_chief.get_average_occurrence_count() == chief.get_average_occurrence_count()
+    assert compiled_chief.compute_ngram_size() == chief.compute_ngram_size() == 2
+    assert compiled_chief.get_synonyms("python") == chief.get_synonyms("python")
+    assert compiled_chief.get_synonyms("unknown") == []
+    assert compiled_chief.metadata == {'stemmer': None}
+
+
+def test_pickle(tmpdir):
+    """Test that only path to the database is pickled."""
+    _, compiled_chief = _compile(tmpdir)
+
+    serialized = pickle.dumps(compiled_chief)
+    assert b"python" not in serialized
+    unpickled_chief = pickle.loads(serialized)
+    assert unpickled_chief.get_keyword("py") == "python"
+    assert unpickled_chief.digest == compiled_chief.digest
+
+
+def test_spawned_workers(tmpdir):
+    """Test that spawned workers map the database."""
+    chief, compiled_chief = _compile(tmpdir)
+
+    with multiprocessing.get_context('spawn').Pool(2) as pool:
+        assert pool.map(compiled_chief.get_keyword, _TOKENS) == \
+            [chief.get_keyword(token) for token in _TOKENS]
+
+
+def test_invalid_database(tmpdir):
+    """Test that files which are not compiled keywords databases are rejected."""
+    assert not CompiledKeywordsChief.is_compiled_keywords_file("test_data/keywords.yaml")
+    assert not CompiledKeywordsChief.is_compiled_keywords_file(None)
+    assert not CompiledKeywordsChief.is_compiled_keywords_file("test_data/non_existing_file")
+
+    with pytest.raises(InvalidInputError):
+        CompiledKeywordsChief("test_data/keywords.yaml")
+
+    empty_file = tmpdir.join('empty.db')
+    empty_file.write('')
+    with pytest.raises(InvalidInputError):
+        CompiledKeywordsChief(str(empty_file))
+
+    _, compiled_chief = _compile(tmpdir)
+    compiled_chief.close()
+    assert CompiledKeywordsChief.is_compiled_keywords_file(str(tmpdir.join('keywords.db')))
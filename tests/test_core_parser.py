@@ -2,6 +2,7 @@
 
 import pytest
 from f8a_tagger.parsers.core_parser import CoreParser
+from f8a_tagger.parsers.parsers import MarkdownParser
 
 
 def test_initial_state():
@@ -31,6 +32,63 @@ def test_parse_method():
         c.parse("", "txt")
 
 
+def test_parser_options():
+    """Check that parser options are passed to parsers based on content type."""
+    c = CoreParser(parser_options={'markdown': {'backend': 'text', 'drop_code': True}})
+    parsed = c.parse("*markdown*\n\n```\ncode\n```", "markdown")
+    assert parsed == "markdown\n"
+
+    # explicitly passed arguments take precedence
+    parsed = c.parse("*markdown*\n\n```\ncode\n```", "markdown", drop_code=False)
+    assert parsed == "markdown\n\ncode"
+
+    parsed = c.parse_file("test_data/README_markdown.json")
+    assert parsed is not None
+
+    with pytest.raises(ValueError):
+        CoreParser(parser_options={'unknown-content-type': {}})
+
+
+def test_parser_reuse():
+    """Check that parser instances are reused for the same content type and arguments."""
+    c = CoreParser()
+    assert c._get_parser(MarkdownParser, 'markdown', {}) is \
+        c._get_parser(MarkdownParser, 'markdown', {})
+    assert c._get_parser(MarkdownParser, 'markdown', {}) is not \
+        c._get_parser(MarkdownParser, 'markdown', {'backend': 'text'})
+    assert c._get_parser(MarkdownParser, 'markdown', {'backend': 'text'}) is \
+        c._get_parser(MarkdownParser, 'markdown', {'backend': 'text'})
+
+
+def test_get_file_content_type():
+    """Check resolving content type based on file extension."""
+    c = CoreParser()
+    assert c.get_file_content_type("README.md") == 'markdown'
+    assert c.get_file_content_type("path/to/README.RST") == 'restructuredtext'
+    assert c.get_file_content_type("README.json") is None
+    assert c.get_file_content_type("README.pod") == 'pod'
+
+    with pytest.raises(ValueError):
+        c.get_file_content_type("README")
+
+    with pytest.raises(ValueError):
+        c.get_file_content_type("keywords.yaml")
+
+
+def test_parse_many():
+    """Check parsing files in bulk."""
+    c = CoreParser()
+    paths = ["test_data/README.txt", "test_data/keywords.yaml", "test_data/README_rst.json"]
+
+    with pytest.raises(ValueError):
+        list(c.parse_many(paths))
+
+    parsed = list(c.parse_many(paths, ignore_errors=True))
+    assert [path for path, _ in parsed] == ["test_data/README.txt", "test_data/README_rst.json"]
+    assert parsed[0][1] == c.parse_file("test_data/README.txt")
+    assert parsed[1][1] == c.parse_file("test_data/README_rst.json")
+
+
 def test_parse_file_method_positive():
     """Check the method parse_file()."""
     c = CoreParser()
@@ -41,16 +99,17 @@ def test_parse_file_method_positive():
     parsed = c.parse_file("test_data/README.md")
     assert parsed is not None
 
+    parsed = c.parse_file("test_data/README.asciidoc")
+    assert parsed is not None
+
+    parsed = c.parse_file("test_data/README.pod")
+    assert parsed is not None
+
 
 def test_parse_file_method_negative():
     """Check the method parse_file()."""
     c = CoreParser()
 
-    # Asciidoc parser is not implemented yet
-    with pytest.raises(NotImplementedError):
-        parsed = c.parse_file("test_data/README.asciidoc")
-        print(parsed)
-
     with pytest.raises(ValueError):
         parsed = c.parse_file("test_data/keywords.yaml")
         print(parsed)
@@ -106,6 +165,10 @@ def test_parse_readme_json_method_negative():
 if __name__ == '__main__':
     test_initial_state()
     test_parse_method()
+    test_parser_options()
+    test_parser_reuse()
+    test_get_file_content_type()
+    test_parse_many()
     test_parse_file_method_positive()
     test_parse_file_method_negative()
     test_parse_file_method_json_fallback()
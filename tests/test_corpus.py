@@ -27,6 +27,15 @@ def test_add_method():
     assert c.get_size() == 3
 
 
+def test_items_method():
+    """Check the method Corpus.items()."""
+    c = Corpus()
+    assert list(c.items()) == []
+    c.add("file1", ["token1", "token2"])
+    c.add("file2", ["token3"])
+    assert list(c.items()) == [("file1", ["token1", "token2"]), ("file2", ["token3"])]
+
+
 def test_get_memory_usage_method():
     """Check the method Corpus.get_memory_usage()."""
     c = Corpus()
@@ -90,6 +99,7 @@ def test_load_json_method():
 if __name__ == '__main__':
     test_initial_state()
     test_add_method()
+    test_items_method()
     test_get_memory_usage_method()
     test_dump_pickle_method()
     test_dump_json_method()
@@ -0,0 +1,124 @@
+"""Tests for the HttpCache class."""
+
+import os
+
+from f8a_tagger.http_cache import HttpCache, get_http_cache
+
+
+def _validated(etag, body):
+    def handler(headers):
+        if headers.get('If-None-Match') == etag:
+            return 304, {'ETag': etag}, b''
+        return 200, {'ETag': etag, 'Content-Type': 'text/plain; charset=utf-8'}, body
+    return handler
+
+
+def test_initial_state(tmpdir):
+    """Check the initial state of HttpCache."""
+    cache = HttpCache(str(tmpdir))
+    assert cache.enabled
+    assert cache.total_size == 0
+    assert cache.get_conditional_headers('http://localhost/foo') == {}
+    assert cache.lookup('http://localhost/foo') == (None, None)
+
+
+def test_shared_cache():
+    """Check that the shared cache is always the same instance."""
+    assert get_http_cache() is get_http_cache()
+
+
+def test_conditional_requests(http_server, tmpdir):
+    """Check that not modified responses are served from the cache."""
+    http_server.routes['/foo'] = _validated('"v1"', 'foo content')
+    url = http_server.url + '/foo'
+    cache = HttpCache(str(tmpdir))
+
+    response = cache.get(url)
+    assert response.ok
+    assert not response.from_cache
+    assert response.text == 'foo content'
+    assert cache.get_conditional_headers(url) == {'If-None-Match': '"v1"'}
+
+    response = cache.get(url)
+    assert response.ok
+    assert response.from_cache
+    assert response.text == 'foo content'
+    assert http_server.requests[-1][1]['If-None-Match'] == '"v1"'
+
+    # cache persists across instances
+    assert HttpCache(str(tmpdir)).get(url).from_cache
+
+    # modified resource is fetched again
+    http_server.routes['/foo'] = _validated('"v2"', 'new content')
+    response = cache.get(url)
+    assert not response.from_cache
+    assert response.text == 'new content'
+    assert cache.get_conditional_headers(url) == {'If-None-Match': '"v2"'}
+
+
+def test_last_modified(http_server, tmpdir):
+    """Check that Last-Modified is used for conditional requests as well."""
+    last_modified = 'Wed, 21 Oct 2015 07:28:00 GMT'
+    http_server.routes['/foo'] = (200, {'Last-Modified': last_modified}, 'foo')
+    cache = HttpCache(str(tmpdir))
+
+    cache.get(http_server.url + '/foo')
+    assert cache.get_conditional_headers(http_server.url + '/foo') == \
+        {'If-Modified-Since': last_modified}
+
+
+def test_not_cacheable(http_server, tmpdir):
+    """Check that responses without validators or with errors are not cached."""
+    http_server.routes['/foo'] = (200, {}, 'foo')
+    cache = HttpCache(str(tmpdir))
+
+    response = cache.get(http_server.url + '/foo')
+    assert response.text == 'foo'
+    assert response.path is None
+    assert cache.total_size == 0
+
+    response = cache.get(http_server.url + '/bar')
+    assert not response.ok
+    assert response.status_code == 404
+    assert cache.total_size == 0
+
+
+def test_lru_eviction(http_server, tmpdir):
+    """Check that least recently used responses are evicted first."""
+    for name in ('a', 'b', 'c'):
+        http_server.routes['/' + name] = _validated(name, name * 10)
+    cache = HttpCache(str(tmpdir), max_size=25)
+
+    cache.get(http_server.url + '/a')
+    cache.get(http_server.url + '/b')
+    assert cache.total_size == 20
+    # make 'a' recently used
+    assert cache.get(http_server.url + '/a').from_cache
+
+    cache.get(http_server.url + '/c')
+    assert cache.total_size == 20
+    assert cache.get_conditional_headers(http_server.url + '/a')
+    assert not cache.get_conditional_headers(http_server.url + '/b')
+    assert cache.get_conditional_headers(http_server.url + '/c')
+
+
+def test_disabled(http_server, tmpdir):
+    """Check that disabled cache passes requests directly."""
+    http_server.routes['/foo'] = _validated('"v1"', 'foo content')
+    cache = HttpCache(str(tmpdir.join('cache')), enabled=False)
+
+    assert cache.get(http_server.url + '/foo').text == 'foo content'
+    assert not cache.get(http_server.url + '/foo').from_cache
+    assert not tmpdir.join('cache').check()
+
+
+def test_to_file(http_server, tmpdir):
+    """Check that not cacheable responses can be streamed to a temporary file."""
+    http_server.routes['/foo'] = (200, {}, 'foo content')
+    cache = HttpCache(str(tmpdir))
+
+    with cache.get(http_server.url + '/foo', to_file=True) as response:
+        path = response.path
+        with open(path, 'r') as f:
+            assert f.read() == 'foo content'
+    assert not os.path.exists(path)
@@ -0,0 +1,56 @@
+"""Tests for the KeywordsAggregator class."""
+
+from f8a_tagger.keywords_aggregator import KeywordsAggregator
+
+
+def test_initial_state():
+    """Check the initial state of KeywordsAggregator."""
+    aggregator = KeywordsAggregator()
+    assert len(aggregator) == 0
+    assert aggregator.get_keywords() == {}
+
+
+def test_add():
+    """Check adding keywords."""
+    aggregator = KeywordsAggregator()
+    aggregator.add('python', {'occurrence_count': 2, 'synonyms': ['py', 'python3']})
+    aggregator.add('python', {'occurrence_count': 3, 'synonyms': ['py', 'cpython'],
+                              'regexp': None})
+    aggregator.add('django', None)
+    # does not match keyword pattern
+    aggregator.add('x', {'occurrence_count': 3})
+    assert len(aggregator) == 2
+
+    assert aggregator.get_keywords(no_synonyms=True) == {
+        'python': {'occurrence_count': 5, 'synonyms': ['cpython', 'py', 'python3'], 'regexp': []},
+        'django': {}
+    }
+
+    keywords = aggregator.get_keywords(occurrence_count_filter=4)
+    assert list(keywords.keys()) == ['python']
+    # synonyms are computed
+    assert 'python' in keywords['python']['synonyms']
+    assert 'py' in keywords['python']['synonyms']
+
+
+def test_merge():
+    """Check merging aggregators."""
+    first = KeywordsAggregator()
+    first.update([('python', {'occurrence_count': 2, 'synonyms': ['py']}), ('flask', None)])
+    second = KeywordsAggregator()
+    second.update([('python', {'occurrence_count': 1, 'regexp': ['python[0-9]']}),
+                   ('django', {'synonyms': ['dj']})])
+
+    assert first.merge(second) is first
+    assert len(second) == 0
+    assert first.get_keywords(no_synonyms=True) == {
+        'python': {'occurrence_count': 3, 'synonyms': ['py'], 'regexp': ['python[0-9]']},
+        'flask': {},
+        'django': {'synonyms': ['dj']}
+    }
+
+
+if __name__ == '__main__':
+    test_initial_state()
+    test_add()
+    test_merge()
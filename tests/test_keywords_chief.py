@@ -153,6 +153,27 @@ def test_keywords_property():
     assert keywords["django"]["regexp"] == [".*django.*"]
 
 
+def test_keywords_view():
+    """Check that the 'keywords' property is a read-only view of keywords."""
+    keywordsChief = KeywordsChief("test_data/keywords.yaml")
+
+    # counts are computed on load, no view is needed
+    assert keywordsChief.get_keywords_count() == 6
+    assert keywordsChief.get_average_occurrence_count() == 1
+    assert keywordsChief._keywords_prop is None
+
+    keywords = keywordsChief.keywords
+    assert keywords is keywordsChief.keywords
+    assert len(keywords) == 6
+    assert list(keywords) == ["machine-learning", "django", "url", "python",
+                              "functional-programming", "utilities"]
+    assert keywords == dict(keywords)
+    assert keywords.get("unknown") is None
+    assert "ml" not in keywords
+    with pytest.raises(TypeError):
+        keywords["python"] = {}
+
+
 def test_get_keywords_count_method():
     """Check the get_keywords_count() method."""
     keywordsChief1 = KeywordsChief("test_data/keywords.yaml")
@@ -262,6 +283,39 @@ def test_extract_keywords():
         {'python': 1, 'functional-programming': 1, 'machine-learning': 1}
 
 
+def test_keyword_ids():
+    """Test the methods working with keyword ids."""
+    keywordsChief = KeywordsChief("test_data/keywords.yaml")
+
+    keyword_id = keywordsChief.get_keyword_id("ml")
+    assert keywordsChief.get_keyword_name(keyword_id) == "machine-learning"
+    assert keywordsChief.get_keyword_id("machine-learning") == keyword_id
+    assert keywordsChief.get_occurrence_count(keyword_id) == 1
+    assert keywordsChief.get_keyword_id("unknown") is None
+
+    keyword_ids = keywordsChief.extract_keyword_ids(["python", "ml", "python", "XXdjango", "x"])
+    assert {keywordsChief.get_keyword_name(keyword_id): count
+            for keyword_id, count in keyword_ids.items()} == \
+        {"python": 2, "machine-learning": 1, "django": 1}
+    # keywords are reported in order of their first occurrence
+    assert list(keyword_ids) == [keywordsChief.get_keyword_id("python"), keyword_id,
+                                 keywordsChief.get_keyword_id("django")]
+
+
+def test_keyword_ids_precedence():
+    """Test that keywords are matched in order of keywords in keywords file."""
+    keywordsChief = KeywordsChief(io.StringIO("a1:\n  occurrence_count: 5\n  regexp:\n"
+                                              "    - 'b.*'\nb2:\n  synonyms:\n    - bx\n"
+                                              "    - cx\nc3:\n  synonyms:\n    - cx\n"))
+
+    # regexps of preceding keywords take precedence over synonyms, keywords over anything
+    assert keywordsChief.get_keyword("bx") == "a1"
+    assert keywordsChief.get_keyword("b2") == "b2"
+    assert keywordsChief.get_keyword("cx") == "b2"
+    assert keywordsChief.get_keyword("c3") == "c3"
+    assert keywordsChief.get_occurrence_count(keywordsChief.get_keyword_id("a1")) == 5
+
+
 def test_filter_keywords():
     """Test the static method filter_keyword()."""
     assert KeywordsChief.filter_keyword("") == ("", [], [])
@@ -339,6 +393,7 @@ if __name__ == '__main__':
     test_keyword_file_check()
     test_keyword_loading_from_bytestream()
     test_keywords_property()
+    test_keywords_view()
     test_get_keywords_count_method()
     test_get_average_occurence_count_method()
     test_compute_ngram_size_method()
@@ -348,6 +403,8 @@ if __name__ == '__main__':
     test_get_keyword_method_negative()
     test_get_keyword_special_cases()
     test_extract_keywords()
+    test_keyword_ids()
+    test_keyword_ids_precedence()
     test_filter_keywords()
     test_compute_synonyms()
     test_is_keyword_positive()
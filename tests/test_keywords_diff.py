@@ -0,0 +1,124 @@
+"""Tests for the keywords_diff module."""
+
+import io
+
+from f8a_tagger.keywords_chief import KeywordsChief
+from f8a_tagger.keywords_diff import diff_keywords
+from f8a_tagger.keywords_diff import diff_keywords_entries
+from f8a_tagger.keywords_diff import diff_keywords_files
+from f8a_tagger.keywords_diff import KeywordsDelta
+
+_OLD_KEYWORDS = """
+python:
+  synonyms:
+    - py
+django:
+  occurrence_count: 5
+flask:
+"""
+
+_NEW_KEYWORDS = """
+python:
+  synonyms:
+    - py
+    - python3
+django:
+  occurrence_count: 10
+pyramid:
+"""
+
+
+def _chief(content):
+    return KeywordsChief(io.StringIO(content))
+
+
+def test_diff_keywords():
+    """Check computing added, removed and changed keywords."""
+    added, removed, changed = diff_keywords(_chief(_OLD_KEYWORDS).keywords,
+                                            _chief(_NEW_KEYWORDS).keywords)
+    assert added == {'pyramid'}
+    assert removed == {'flask'}
+    # occurrence count does not affect matching
+    assert changed == {'python'}
+
+    assert diff_keywords(_chief(_OLD_KEYWORDS).keywords,
+                         _chief(_OLD_KEYWORDS).keywords) == (set(), set(), set())
+
+
+def test_diff_keywords_entries():
+    """Check computing structured differences of keywords databases."""
+    old = {
+        'python': {'synonyms': ['py', 'python3'], 'occurrence_count': 3},
+        'django': {'regexp': ['.*django.*']},
+        'flask': None,
+        2017: None
+    }
+    new = {
+        'python': {'synonyms': ['py', 'cpython'], 'occurrence_count': 4},
+        'django': None,
+        'pyramid': {'synonyms': ['pyramid-web']},
+        '2017': None
+    }
+
+    diff = diff_keywords_entries(old.items(), iter(new.items()))
+    assert diff == {
+        'added_keywords': ['pyramid'],
+        'removed_keywords': ['flask'],
+        'added_synonyms': {'python': ['cpython']},
+        'removed_synonyms': {'python': ['python3']},
+        'added_regexps': {},
+        'removed_regexps': {'django': ['.*django.*']},
+        'changed_occurrence_counts': {'python': [3, 4]}
+    }
+
+    diff = diff_keywords_entries(old.items(), old.items())
+    assert not any(diff.values())
+
+
+def test_diff_keywords_files(tmpdir):
+    """Check computing differences of keywords files."""
+    new_file = tmpdir.join('keywords.json')
+    new_file.write('{"python": {"synonyms": ["py"]}, "django": {"regexp": [".*django.*"]}}')
+
+    diff = diff_keywords_files("test_data/keywords.yaml", str(new_file))
+    assert diff['removed_keywords'] == ['functional-programming', 'machine-learning', 'url',
+                                        'utilities']
+    assert diff['added_keywords'] == []
+    assert diff['added_synonyms'] == {'python': ['py']}
+    assert not diff['removed_regexps']
+
+
+def test_keywords_delta():
+    """Check updating lookup results based on keywords changes."""
+    old_chief = _chief(_OLD_KEYWORDS)
+    new_chief = _chief(_NEW_KEYWORDS)
+    delta = KeywordsDelta(old_chief, new_chief)
+    assert delta.affected_keywords == {'pyramid', 'flask', 'python'}
+
+    tokens = ["python3", "py", "flask", "django", "pyramid", "hello", "flask"]
+    old_result = old_chief.extract_keywords(tokens)
+    assert old_result == {'python': 1, 'flask': 2, 'django': 1}
+    assert delta.apply(tokens, old_result) == new_chief.extract_keywords(tokens)
+    # previous results are not modified
+    assert old_result == {'python': 1, 'flask': 2, 'django': 1}
+
+    # nothing to do
+    delta = KeywordsDelta(old_chief, _chief(_OLD_KEYWORDS))
+    assert delta.apply(tokens, old_result) == old_result
+
+
+def test_keywords_delta_regexp():
+    """Check that tokens matching changed regular expressions are tagged again."""
+    old_chief = _chief("python:\n  regexp:\n    - 'python[0-9]'\n")
+    new_chief = _chief("python:\n  regexp:\n    - 'python[0-9]+'\n")
+    tokens = ["python3", "python38", "python"]
+
+    result = KeywordsDelta(old_chief, new_chief).apply(tokens, old_chief.extract_keywords(tokens))
+    assert result == {'python': 3}
+
+
+if __name__ == '__main__':
+    test_diff_keywords()
+    test_diff_keywords_entries()
+    test_keywords_delta()
+    test_keywords_delta_regexp()
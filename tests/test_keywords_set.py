@@ -1,5 +1,10 @@
 """Tests for the KeywordsSet class."""
 
+import io
+import json
+import pytest
+import yaml
+
 from f8a_tagger.keywords_set import KeywordsSet
 
 
@@ -169,6 +174,78 @@ def test_union_method_for_empty_data():
     assert keywordsSet2.keywords == {}
 
 
+def test_update_method():
+    """Check the method KeywordsSet.update()."""
+    keywordsSet = KeywordsSet()
+    assert keywordsSet.update(["python", "django", "python"]) is keywordsSet
+    assert keywordsSet.update({"python": 10, "flask": 2}) is keywordsSet
+    assert len(keywordsSet.keywords) == 3
+    assert "django" in keywordsSet
+    assert keywordsSet.get_occurrence_count("python") == 12
+    assert keywordsSet.get_occurrence_count("django") == 1
+    assert keywordsSet.get_occurrence_count("flask") == 2
+    assert keywordsSet.get_occurrence_count("pyramid") == 0
+
+
+def test_interning():
+    """Check that keywords are interned."""
+    keywordsSet1 = KeywordsSet()
+    keywordsSet1.add("".join(["key", "word"]))
+    keywordsSet2 = KeywordsSet()
+    keywordsSet2.update(["".join(["key", "word"])])
+
+    assert list(keywordsSet1.keywords)[0] is list(keywordsSet2.keywords)[0]
+
+
+def test_merge_method():
+    """Check the method KeywordsSet.merge() sums occurrence counts."""
+    keywordsSet1 = KeywordsSet()
+    keywordsSet1.add("keyword", 10)
+    keywordsSet1.add("keyword1")
+
+    keywordsSet2 = KeywordsSet()
+    keywordsSet2.add("keyword", 20)
+    keywordsSet2.add("keyword2", 2)
+
+    assert keywordsSet1.merge(keywordsSet2) is keywordsSet1
+    assert keywordsSet1.keywords == {
+        "keyword": {"occurrence_count": 30},
+        "keyword1": {"occurrence_count": 1},
+        "keyword2": {"occurrence_count": 2}
+    }
+    assert keywordsSet2.keywords == {
+        "keyword": {"occurrence_count": 20},
+        "keyword2": {"occurrence_count": 2}
+    }
+
+
+def test_to_dict_from_dict():
+    """Check conversion from and to keywords file form."""
+    keywordsSet = KeywordsSet.from_dict({"keyword": {"occurrence_count": 3}, "keyword2": None})
+    assert keywordsSet.to_dict() == {
+        "keyword": {"occurrence_count": 3},
+        "keyword2": {"occurrence_count": 1}
+    }
+    assert KeywordsSet.from_dict(keywordsSet.to_dict()).to_dict() == keywordsSet.to_dict()
+
+
+def test_dump_method():
+    """Check serialization of KeywordsSet."""
+    keywordsSet = KeywordsSet()
+    keywordsSet.update({"python": 3, "machine-learning": 1})
+
+    stream = io.StringIO()
+    keywordsSet.dump(stream)
+    assert yaml.safe_load(stream.getvalue()) == keywordsSet.to_dict()
+
+    stream = io.StringIO()
+    keywordsSet.dump(stream, 'json')
+    assert json.loads(stream.getvalue()) == keywordsSet.to_dict()
+
+    with pytest.raises(ValueError):
+        keywordsSet.dump(io.StringIO(), 'xml')
+
+
 if __name__ == '__main__':
     test_initial_state()
     test_add_method()
@@ -178,3 +255,8 @@ if __name__ == '__main__':
     test_union_method_and_occurrence_count_2()
     test_union_method_for_overlapping_data()
     test_union_method_for_empty_data()
+    test_update_method()
+    test_interning()
+    test_merge_method()
+    test_to_dict_from_dict()
+    test_dump_method()
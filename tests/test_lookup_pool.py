@@ -0,0 +1,87 @@
+"""Tests for the LookupPool class."""
+
+import gc
+import io
+import os
+
+import pytest
+from unittest.mock import patch
+from f8a_tagger.compiled_keywords_chief import CompiledKeywordsChief
+from f8a_tagger.keywords_chief import KeywordsChief
+from f8a_tagger.lookup_pool import get_unique_memory
+from f8a_tagger.lookup_pool import LookupPool
+from f8a_tagger.tokenizer import Tokenizer
+
+
+def _get_rss():
+    with open('/proc/self/statm', 'r') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+@patch('f8a_tagger.tokenizer.Tokenizer.tokenize', return_value=[["python", "is", "py"]])
+def test_imap(_mocked_function):
+    """Check lookup in worker processes."""
+    chief = KeywordsChief(io.StringIO("python:\n  synonyms:\n    - py\ndjango:\n"))
+
+    with LookupPool(Tokenizer(), chief, workers=2) as pool:
+        results = list(pool.imap(((idx, "content") for idx in range(10)), with_tokens=True))
+
+    assert [result[0] for result in results] == list(range(10))
+    for _, keywords, tokens, error in results:
+        assert keywords == {'python': 2}
+        assert tokens == ["python", "is", "py"]
+        assert error is None
+
+
+@patch('f8a_tagger.tokenizer.Tokenizer.tokenize', side_effect=[[["python"]], ValueError("oops")])
+def test_imap_error(_mocked_function):
+    """Check reporting errors raised in worker processes."""
+    chief = KeywordsChief(io.StringIO("python:\n"))
+
+    # the first call preloads resources in the parent
+    with LookupPool(Tokenizer(), chief, workers=1) as pool:
+        (metadata, keywords, tokens, error), = pool.imap([('file', "content")])
+
+    assert metadata == 'file'
+    assert keywords is None
+    assert tokens is None
+    assert isinstance(error, ValueError)
+
+
+def test_spawn(tmpdir):
+    """Check starting workers which do not inherit lookup resources."""
+    database_file = str(tmpdir.join('keywords.db'))
+    CompiledKeywordsChief.compile(KeywordsChief(io.StringIO("python:\n")), database_file)
+
+    with LookupPool(Tokenizer(), CompiledKeywordsChief(database_file), workers=1,
+                    start_method='spawn') as pool:
+        assert pool.apply(os.getpid) in pool.pids
+
+
+def test_wrong_workers():
+    """Check validation of number of workers."""
+    with pytest.raises(ValueError):
+        LookupPool(Tokenizer(), KeywordsChief(io.StringIO("python:\n")), workers=0)
+
+
+@pytest.mark.skipif(not os.path.isfile('/proc/self/smaps_rollup'),
+                    reason="Unique memory of processes cannot be measured")
+@patch('f8a_tagger.tokenizer.Tokenizer.tokenize', return_value=[["keyword1"]])
+def test_unique_memory(_mocked_function):
+    """Check that workers share lookup resources with the parent process."""
+    keywords = "".join("keyword%d:\n  synonyms:\n    - synonym%d\n    - other-synonym%d\n"
+                       % (idx, idx, idx) for idx in range(10000))
+    rss = _get_rss()
+    chief = KeywordsChief(io.StringIO(keywords))
+    assert chief.get_keywords_count() == 10000
+    resources_size = _get_rss() - rss
+
+    with LookupPool(Tokenizer(), chief, workers=1) as pool:
+        (_, keywords, _, _), = pool.imap([(None, "keyword1")])
+        assert keywords == {'keyword1': 1}
+        unique_memory = get_unique_memory(pool.pids[0])
+        assert unique_memory is not None
+
+        # full collection would touch (and copy) all objects if they were not frozen
+        pool.apply(gc.collect)
+        assert get_unique_memory(pool.pids[0]) - unique_memory < resources_size / 20
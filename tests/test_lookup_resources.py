@@ -0,0 +1,111 @@
+"""Tests for the LookupResources class."""
+
+import os
+import threading
+
+import pytest
+from unittest.mock import patch
+from f8a_tagger.errors import InvalidInputError
+from f8a_tagger.lookup_resources import LookupResources
+from f8a_tagger.result_cache import ResultCache
+
+
+def _write_keywords(path, content, mtime):
+    path.write(content)
+    # make sure modification is noticed regardless of file system timestamp resolution
+    os.utime(str(path), ns=(mtime, mtime))
+
+
+@patch('f8a_tagger.tokenizer.Tokenizer.tokenize', return_value=[["python", "is", "flask"]])
+def test_reload(_mocked_function, tmpdir):
+    """Test reloading keywords file."""
+    keywords_file = tmpdir.join('keywords.yaml')
+    _write_keywords(keywords_file, "python:\n", 1000000000)
+
+    with LookupResources(str(keywords_file)) as resources:
+        version = resources.version
+        assert version['generation'] == 1
+        assert version['keywords_count'] == 1
+        assert version['keywords_file'] == str(keywords_file)
+        assert resources.lookup_text("Python is flask") == {'python': 1}
+        assert resources.reload_if_changed() is None
+
+        _write_keywords(keywords_file, "python:\nflask:\n", 2000000000)
+        snapshot = resources.reload_if_changed().result()
+        assert snapshot.generation == 2
+        assert resources.snapshot is snapshot
+        assert resources.version['digest'] != version['digest']
+        assert resources.lookup_text("Python is flask") == {'python': 1, 'flask': 1}
+        assert resources.lookup_readme({'content': 'Flask', 'type': 'txt'}) == \
+            {'python': 1, 'flask': 1}
+        assert resources.reload_if_changed() is None
+
+        with pytest.raises(InvalidInputError):
+            resources.lookup_text(None)
+        with pytest.raises(InvalidInputError):
+            resources.lookup_readme({'content': 'Flask'})
+
+
+@patch('f8a_tagger.tokenizer.Tokenizer.tokenize', return_value=[["python", "is", "flask"]])
+def test_reload_failure(_mocked_function, tmpdir):
+    """Test that resources stay live if reload fails."""
+    keywords_file = tmpdir.join('keywords.yaml')
+    _write_keywords(keywords_file, "python:\n", 1000000000)
+
+    with LookupResources(str(keywords_file)) as resources:
+        with pytest.raises(FileNotFoundError):
+            resources.reload(str(tmpdir.join('non_existing_file.yaml'))).result()
+
+        assert resources.version['generation'] == 1
+        assert resources.lookup_text("Python is flask") == {'python': 1}
+
+
+@patch('f8a_tagger.tokenizer.Tokenizer.tokenize', return_value=[["python", "is", "flask"]])
+def test_lookup_during_reload(mocked_function, tmpdir):
+    """Test that lookup in progress finishes with resources it started with."""
+    keywords_file = tmpdir.join('keywords.yaml')
+    _write_keywords(keywords_file, "python:\n", 1000000000)
+    tokenizing = threading.Event()
+    reloaded = threading.Event()
+
+    def tokenize(_content):
+        tokenizing.set()
+        reloaded.wait(10)
+        return [["python", "is", "flask"]]
+
+    with LookupResources(str(keywords_file)) as resources:
+        mocked_function.side_effect = tokenize
+        result = []
+        thread = threading.Thread(target=lambda: result.append(resources.lookup_text("text")))
+        thread.start()
+        assert tokenizing.wait(10)
+
+        _write_keywords(keywords_file, "python:\nflask:\n", 2000000000)
+        resources.reload().result()
+        reloaded.set()
+        thread.join()
+
+        assert result == [{'python': 1}]
+        assert resources.lookup_text("text") == {'python': 1, 'flask': 1}
+
+
+@patch('f8a_tagger.tokenizer.Tokenizer.tokenize', return_value=[["python"]])
+def test_result_cache(mocked_function, tmpdir):
+    """Test that results cached for previous resources are not used after reload."""
+    keywords_file = tmpdir.join('keywords.yaml')
+    _write_keywords(keywords_file, "python:\n", 1000000000)
+
+    with ResultCache(str(tmpdir.join('cache'))) as result_cache, \
+            LookupResources(str(keywords_file), result_cache=result_cache) as resources:
+        assert resources.lookup_text("text") == {'python': 1}
+        assert resources.lookup_text("text") == {'python': 1}
+        assert mocked_function.call_count == 1
+
+        _write_keywords(keywords_file, "python:\n  synonyms:\n    - py\n", 2000000000)
+        resources.reload().result()
+        assert resources.lookup_text("text") == {'python': 1}
+        assert mocked_function.call_count == 2
+
+        # digest does not depend on result cache being used
+        with LookupResources(str(keywords_file)) as uncached_resources:
+            assert uncached_resources.version['digest'] == resources.version['digest']
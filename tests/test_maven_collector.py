@@ -1,8 +1,14 @@
 """Tests for the MavenCollector class."""
 
+import io
+import json
 import pytest
 from os import path, remove
+from subprocess import CalledProcessError
+from unittest.mock import patch
+from f8a_tagger.collectors.checkpoint import Checkpoint
 from f8a_tagger.collectors.maven import MavenCollector
+from f8a_tagger.collectors.rate_limiter import TokenBucket
 from f8a_tagger.errors import InstallPrepareError
 from f8a_tagger.utils import get_files_dir
 
@@ -29,6 +35,114 @@ def test_execute_method():
         c.execute()
 
 
+class _process:
+
+    def __init__(self, output, returncode=0):
+        self.stdout = io.BytesIO(output.encode())
+        self.returncode = None
+        self._returncode = returncode
+        self.killed = False
+
+    def poll(self):
+        return self.returncode
+
+    def kill(self):
+        self.killed = True
+
+    def wait(self):
+        self.returncode = self._returncode
+        return self.returncode
+
+
+_INDEX = json.dumps([
+    {'groupId': 'junit', 'artifactId': 'junit', 'version': '4.12'},
+    {'groupId': 'junit', 'artifactId': 'junit', 'version': '4.11'},
+    {'groupId': 'org.mockito', 'artifactId': 'mockito-core', 'version': '2.8.9'},
+    {'groupId': 'junit', 'artifactId': 'junit', 'version': '4.10'}
+])
+
+
+def test_iter_index_artifacts():
+    """Test streaming and deduplication of Maven index checker output."""
+    with patch('f8a_tagger.collectors.maven.Popen', return_value=_process(_INDEX)) as popen:
+        artifacts = list(MavenCollector.iter_index_artifacts('/tmp/maven-index-checker.jar'))
+
+    assert artifacts == ['junit/junit', 'org.mockito/mockito-core']
+    assert popen.call_args[1]['cwd'] == '/tmp'
+
+    with patch('f8a_tagger.collectors.maven.Popen', return_value=_process('[]', 1)):
+        with pytest.raises(CalledProcessError):
+            list(MavenCollector.iter_index_artifacts('/tmp/maven-index-checker.jar'))
+
+
+def test_iter_index_artifacts_interrupted():
+    """Test that index checker is killed if artifacts are not consumed."""
+    process = _process(_INDEX)
+    with patch('f8a_tagger.collectors.maven.Popen', return_value=process):
+        artifacts = MavenCollector.iter_index_artifacts('/tmp/maven-index-checker.jar')
+        assert next(artifacts) == 'junit/junit'
+        artifacts.close()
+
+    assert process.killed
+
+
+
+def test_execute_method_interrupted(tmpdir, monkeypatch):
+    """Test that index checker is stopped and original errors are reported on failure."""
+    tmpdir.join('maven-index-checker.jar').write('')
+    checkpoint_path = str(tmpdir.join('checkpoints', 'maven.json'))
+    monkeypatch.setattr(MavenCollector, 'get_checkpoint_path', lambda _self: checkpoint_path)
+
+    def fetch_keywords(_self, package_names, _checkpoint, _ignore_errors):
+        next(iter(package_names))
+        raise RuntimeError("fetching failed")
+
+    process = _process(_INDEX)
+    with patch('f8a_tagger.collectors.maven.get_files_dir', return_value=str(tmpdir)), \
+            patch('f8a_tagger.collectors.maven.Popen', return_value=process), \
+            patch.object(MavenCollector, 'fetch_keywords', fetch_keywords):
+        with pytest.raises(RuntimeError, match='fetching failed'):
+            MavenCollector().execute(ignore_errors=False)
+    assert process.killed
+
+    # index checker failed before unpacking maven index
+    with patch('f8a_tagger.collectors.maven.get_files_dir', return_value=str(tmpdir)), \
+            patch('f8a_tagger.collectors.maven.Popen', return_value=_process('[]', 1)):
+        with pytest.raises(CalledProcessError):
+            MavenCollector().execute(ignore_errors=False)
+_ARTIFACT_PAGE = """
+    <html><body>
+    <a class="b tag" href="/tags/testing">testing</a>
+    <a class="b tag" href="/tags/mock">mock</a>
+    </body></html>"""
+
+
+def test_fetch_keywords(http_server, tmpdir):
+    """Test fetching keywords for artifacts from mvnrepository."""
+    http_server.routes['/artifact/org.mockito/mockito-core'] = (200, {}, _ARTIFACT_PAGE)
+    http_server.routes['/artifact/junit/junit'] = (200, {}, _ARTIFACT_PAGE)
+
+    c = MavenCollector(mvnrepository_url=http_server.url + '/artifact/',
+                       rate_limiter=TokenBucket(1000, burst=5), workers=2)
+    checkpoint = Checkpoint(str(tmpdir.join('maven.json')))
+    c.fetch_keywords(['org.mockito/mockito-core', 'junit/junit', 'foo/bar'], checkpoint)
+    assert checkpoint.keywords_set.keywords == {
+        'testing': {'occurrence_count': 2},
+        'mock': {'occurrence_count': 2}
+    }
+    assert checkpoint.is_processed('junit/junit')
+    assert not checkpoint.is_processed('foo/bar')
+
+    # already processed artifacts are not fetched again
+    requests_count = len(http_server.requests)
+    c.fetch_keywords(['org.mockito/mockito-core', 'junit/junit'], checkpoint)
+    assert len(http_server.requests) == requests_count
+
+    with pytest.raises(RuntimeError):
+        c.fetch_keywords(['org.mockito/mockito-core', 'foo/bar'],
+                         Checkpoint(str(tmpdir.join('maven2.json'))), ignore_errors=False)
+
+
 if __name__ == '__main__':
     test_initial_state()
     test_execute_method()
@@ -1,6 +1,9 @@
 """Tests for all currently supported parser classes."""
 
+import json
+import re
 import pytest
+from f8a_tagger.keywords_chief import KeywordsChief
 from f8a_tagger.parsers.parsers import TextParser, MarkdownParser, HtmlParser, AsciidocParser
 from f8a_tagger.parsers.parsers import ReStructuredTextParser, TextileParser, RdocParser
 from f8a_tagger.parsers.parsers import OrgParser, CreoleParser, MediawikiParser, PodParser
@@ -68,6 +71,63 @@ def test_html_parser():
     parsed = p.parse("<div>two</div> <div>divs</div>")
     assert parsed == "two divs"
 
+    parsed = p.parse("<head><style>p {}</style><script>var x;</script></head>"
+                     "<p>HTML <!-- comment -->content</p><script>var y;</script>")
+    assert parsed == "HTML content"
+
+    assert p.parse(" ") == ""
+
+    with pytest.raises(ValueError):
+        HtmlParser(backend='foo')
+
+
+def test_html_backends_parity():
+    """Test that all HTML backends extract the same text."""
+    with open('test_data/README.md') as f:
+        markdown_content = f.read()
+    with open('test_data/README_rst.json') as f:
+        rst_content = json.load(f)['content']
+    html_content = """<html><head><title>Title</title></head><body>
+        <h1>Header</h1>\n\n<p>a &amp; b <b>bold</b>tail</p>
+        <pre>\n\n  preformatted\n</pre>\n\n<p> </p><span>a</span> <span>b</span>
+        </body></html>"""
+
+    for parser_class, content in ((MarkdownParser, markdown_content),
+                                  (ReStructuredTextParser, rst_content),
+                                  (HtmlParser, html_content)):
+        parsed = parser_class(backend='lxml').parse(content)
+        assert parsed
+        assert parsed == parser_class(backend='beautifulsoup').parse(content)
+
+
+def test_markdown_parser_text_backend():
+    """Test the MarkdownParser parser stripping markup directly."""
+    p = MarkdownParser(backend='text')
+
+    parsed = p.parse("# markdown *content*\n\n```\ncode\n```")
+    assert parsed == "markdown content\n\ncode"
+
+    parsed = MarkdownParser(backend='text', drop_code=True).parse("markdown\n\n```\ncode\n```")
+    assert parsed == "markdown\n"
+
+
+def test_markdown_backends_keywords_parity():
+    """Test that keywords found in Markdown do not depend on backend."""
+    chief = KeywordsChief()
+    with open('test_data/README.md') as f:
+        readme = f.read()
+    with open('test_data/README_markdown.json') as f:
+        readme_json = json.load(f)['content']
+
+    for content in (readme, readme_json):
+        found = []
+        for backend in ('lxml', 'text'):
+            parsed = MarkdownParser(backend=backend).parse(content)
+            found.append(chief.extract_keywords(re.findall(r'[\w.+#-]+', parsed.lower())))
+
+        assert found[0]
+        assert found[0] == found[1]
+
 
 def test_restructuredtext_parser():
     """Test the ReStructuredTextParser parser."""
@@ -77,75 +137,145 @@ def test_restructuredtext_parser():
     assert parsed.strip() == "content"
 
 
+def test_restructuredtext_backends_keywords_parity():
+    """Test that keywords found in reStructuredText do not depend on backend."""
+    chief = KeywordsChief()
+    with open('test_data/README_rst.json') as f:
+        content = json.load(f)['content']
+
+    found = []
+    for backend in ('lxml', 'doctree'):
+        parsed = ReStructuredTextParser(backend=backend).parse(content)
+        found.append(chief.extract_keywords(re.findall(r'[\w.+#-]+', parsed.lower())))
+
+    assert found[0]
+    assert found[0] == found[1]
+
+
+def _parse_test_data(parser, file_name):
+    """Parse file from test data directory."""
+    with open('test_data/' + file_name) as f:
+        return parser.parse(f.read())
+
+
 def test_asciidoc_parser():
     """Test the AsciidocParser parser."""
     p = AsciidocParser()
 
-    # this parser is not fully implemented yet
-    with pytest.raises(NotImplementedError):
-        p.parse("content")
+    parsed = p.parse("content")
+    assert parsed.strip() == "content"
+
+    parsed = _parse_test_data(p, 'README.asciidoc')
+    assert 'Tagging workflow' in parsed
+    assert 'the following YAML' in parsed
+    assert '==' not in parsed
+    assert 'link:' not in parsed
 
 
 def test_textile_parser():
     """Test the TextileParser parser."""
     p = TextileParser()
 
-    # this parser is not fully implemented yet
-    with pytest.raises(NotImplementedError):
-        p.parse("content")
+    parsed = p.parse("content")
+    assert parsed.strip() == "content"
+
+    parsed = _parse_test_data(p, 'README.textile')
+    assert 'Tagging workflow' in parsed
+    assert 'collectors that gather' in parsed
+    assert 'h2' not in parsed
+    assert '":http' not in parsed
+    assert '###' not in parsed
 
 
 def test_rdoc_parser():
     """Test the RdocParser parser."""
     p = RdocParser()
 
-    # this parser is not fully implemented yet
-    with pytest.raises(NotImplementedError):
-        p.parse("content")
+    parsed = p.parse("content")
+    assert parsed.strip() == "content"
+
+    parsed = _parse_test_data(p, 'README.rdoc')
+    assert 'Tagging workflow' in parsed
+    assert 'collectors' in parsed
+    assert 'KeywordsChief' in parsed
+    assert '{collectors}' not in parsed
+    assert ':include:' not in parsed
+    assert 'Internal notes' not in parsed
 
 
 def test_org_parser():
     """Test the OrgParser parser."""
     p = OrgParser()
 
-    # this parser is not fully implemented yet
-    with pytest.raises(NotImplementedError):
-        p.parse("content")
+    parsed = p.parse("content")
+    assert parsed.strip() == "content"
+
+    parsed = _parse_test_data(p, 'README.org')
+    assert 'Tagging workflow' in parsed
+    assert 'collectors that gather' in parsed
+    assert '#+' not in parsed
+    assert ':PROPERTIES:' not in parsed
+    assert 'Internal notes' not in parsed
 
 
 def test_creole_parser():
     """Test the CreoleParser parser."""
     p = CreoleParser()
 
-    # this parser is not fully implemented yet
-    with pytest.raises(NotImplementedError):
-        p.parse("content")
+    parsed = p.parse("content")
+    assert parsed.strip() == "content"
+
+    parsed = _parse_test_data(p, 'README.creole')
+    assert 'Tagging workflow' in parsed
+    assert 'collectors that gather' in parsed
+    assert '[[' not in parsed
+    assert '{{' not in parsed
+    assert '//verbose' not in parsed
 
 
 def test_mediawiki_parser():
-    """Test the MediawikiParserparser."""
+    """Test the MediawikiParser parser."""
     p = MediawikiParser()
 
-    # this parser is not fully implemented yet
-    with pytest.raises(NotImplementedError):
-        p.parse("content")
+    parsed = p.parse("content")
+    assert parsed.strip() == "content"
+
+    parsed = _parse_test_data(p, 'README.mediawiki')
+    assert 'Tagging workflow' in parsed
+    assert 'collectors that gather' in parsed
+    assert '{{' not in parsed
+    assert "'''" not in parsed
+    assert 'Infobox' not in parsed
+    assert 'This comment' not in parsed
 
 
 def test_pod_parser():
     """Test the PodParser parser."""
     p = PodParser()
 
-    # this parser is not fully implemented yet
-    with pytest.raises(NotImplementedError):
-        p.parse("content")
+    parsed = p.parse("content")
+    assert parsed.strip() == "content"
+
+    parsed = _parse_test_data(p, 'README.pod')
+    assert 'Tagging workflow' in parsed
+    assert 'collectors' in parsed
+    assert 'LICENSE' in parsed
+    assert '=head' not in parsed
+    assert 'B<' not in parsed
+    assert 'sub lookup' not in parsed
+    assert 'This comment' not in parsed
 
 
 if __name__ == '__main__':
     test_initial_states()
     test_text_parser()
     test_markdown_parser()
+    test_markdown_parser_text_backend()
+    test_markdown_backends_keywords_parity()
     test_html_parser()
+    test_html_backends_parity()
     test_restructuredtext_parser()
+    test_restructuredtext_backends_keywords_parity()
     test_asciidoc_parser()
     test_textile_parser()
     test_rdoc_parser()
@@ -1,10 +1,13 @@
 """Tests for the PypiCollector class."""
 
+import json
+import os
+import threading
+
 import pytest
-from unittest.mock import patch
-import requests
 
 from f8a_tagger.collectors.pypi import PypiCollector
+from f8a_tagger.http_cache import HttpCache
 
 
 def test_initial_state():
@@ -13,84 +16,69 @@ def test_initial_state():
     assert c is not None
 
 
-class _response:
-
-    def __init__(self, status_code, text):
-        self.status_code = status_code
-        self.text = text
-
+_SIMPLE_INDEX = """
+    <html>
+    <head><title>Simple Index</title><meta name="api-version" value="2" /></head><body>
+    <a href='mock'>mock</a><br/>
+    <a href='clojure-py'>clojure_py</a><br/>
+    <a href='behave'>behave</a><br/>
+    <a href='selinon'>selinon</a><br/>
+    </body></html>"""
 
-original_requests_get = requests.get
 
+def _project(keywords):
+    return 200, {'Content-Type': 'application/json'}, json.dumps({'info': {'keywords': keywords}})
 
-def mocked_requests_get(url):
-    """Implement mocked function requests.get()."""
-    if url == PypiCollector._PYPI_SIMPLE_URL:
-        return _response(200, """
-            <html>
-            <head><title>Simple Index</title><meta name="api-version" value="2" /></head><body>
-            <a href='mock'>mock</a><br/>
-            <a href='clojure-py'>clojure_py</a><br/>
-            <a href='behave'>behave</a><br/>
-            <a href='0.0.1'>0.0.1</a><br/>
-            <a href='selinon'>selinon</a><br/>
-            </body></html>""")
-    else:
-        return original_requests_get(url)
 
+def _collector(server, **kwargs):
+    return PypiCollector(simple_url=server.url + '/simple/',
+                         package_json_url=server.url + '/pypi/{}/json',
+                         backoff=0, **kwargs)
 
-# don't run this test! it take forever to finish ;)
-def ___test_original_execute_method():
-    """Test the execute() method."""
-    c = PypiCollector()
 
-    keywords = c.execute()
-    assert keywords is not None
+def _register_projects(server):
+    server.routes['/pypi/mock/json'] = _project('testing, mock')
+    server.routes['/pypi/clojure_py/json'] = _project('clojure lisp')
+    server.routes['/pypi/behave/json'] = _project(None)
+    server.routes['/pypi/selinon/json'] = _project(['flow', 'Celery'])
 
 
-@patch("f8a_tagger.collectors.pypi.requests.get", side_effect=mocked_requests_get)
-def test_execute_method(_mocked_requests_get_obj):
+def test_execute_method(http_server):
     """Test the execute() method."""
-    c = PypiCollector()
+    http_server.routes['/simple/'] = (200, {'Content-Type': 'text/html'}, _SIMPLE_INDEX)
+    _register_projects(http_server)
 
-    keywords = c.execute()
+    keywords = _collector(http_server, concurrency=2).execute()
     assert keywords is not None
+    assert set(keywords.keywords.keys()) == {'testing', 'mock', 'clojure', 'lisp', 'flow',
+                                             'celery'}
+
 
+def test_execute_method_json_index(http_server):
+    """Test the execute() method with JSON simple index."""
+    index = {'projects': [{'name': 'mock'}, {'name': 'selinon'}]}
+    http_server.routes['/simple/'] = (200, {'Content-Type': 'application/vnd.pypi.simple.v1+json'},
+                                      json.dumps(index))
+    _register_projects(http_server)
 
-def mocked_requests_get_2(url):
-    """Implement mocked function requests.get()."""
-    return _response(404, "Not Found")
+    keywords = _collector(http_server).execute()
+    assert set(keywords.keywords.keys()) == {'testing', 'mock', 'flow', 'celery'}
+    assert 'application/vnd.pypi.simple.v1+json' in http_server.requests[0][1]['Accept']
 
 
-@patch("f8a_tagger.collectors.pypi.requests.get", side_effect=mocked_requests_get_2)
-def test_execute_method_negative(_mocked_requests_get_obj):
+def test_execute_method_negative(http_server):
     """Test the execute() method."""
-    c = PypiCollector()
-    assert c is not None
+    c = _collector(http_server)
 
     with pytest.raises(RuntimeError):
         keywords = c.execute()
         assert keywords is not None
 
 
-def mocked_requests_get_3(url):
-    """Implement mocked function requests.get()."""
-    if url == PypiCollector._PYPI_SIMPLE_URL:
-        return _response(200, """
-            <html>
-            <head><title>Simple Index</title><meta name="api-version" value="2" /></head><body>
-            <a href='mock'>mock</a><br/>
-            <a href='clojure-py'>clojure_py</a><br/>
-            <a href='behave'>behave</a><br/>
-            </body></html>""")
-    else:
-        return _response(404, "Not Found")
-
-
-@patch("f8a_tagger.collectors.pypi.requests.get", side_effect=mocked_requests_get_3)
-def test_execute_method_negative2(_mocked_requests_get_obj):
+def test_execute_method_negative2(http_server):
     """Test the execute() method."""
-    c = PypiCollector()
+    http_server.routes['/simple/'] = (200, {'Content-Type': 'text/html'}, _SIMPLE_INDEX)
+    c = _collector(http_server)
 
     with pytest.raises(RuntimeError):
         keywords = c.execute(ignore_errors=False)
@@ -98,10 +86,126 @@ def test_execute_method_negative2(_mocked_requests_get_obj):
 
     keywords = c.execute(ignore_errors=True)
     assert keywords is not None
+    assert not keywords.keywords
+
+
+def test_execute_method_retry(http_server):
+    """Test that failed requests are retried."""
+    responses = [(503, {}, 'Service Unavailable'), _project('retried')]
+    http_server.routes['/simple/'] = (200, {'Content-Type': 'text/html'},
+                                      "<a href='mock'>mock</a>")
+    http_server.routes['/pypi/mock/json'] = lambda _headers: responses.pop(0)
+
+    keywords = _collector(http_server).execute(ignore_errors=False)
+    assert set(keywords.keywords.keys()) == {'retried'}
+    assert not responses
+
+
+def test_execute_method_resume(http_server, tmpdir, monkeypatch):
+    """Test that an interrupted run can be resumed from a checkpoint."""
+    checkpoint_path = str(tmpdir.join('checkpoints', 'pypi.json'))
+    monkeypatch.setattr(PypiCollector, 'get_checkpoint_path', lambda _self: checkpoint_path)
+    http_server.routes['/simple/'] = (200, {'Content-Type': 'text/html'}, _SIMPLE_INDEX)
+    _register_projects(http_server)
+    del http_server.routes['/pypi/selinon/json']
+
+    c = _collector(http_server, concurrency=1)
+    with pytest.raises(RuntimeError):
+        c.execute(ignore_errors=False)
+    assert tmpdir.join('checkpoints', 'pypi.json').check()
+
+    # processed packages are not requested again on resume
+    _register_projects(http_server)
+    del http_server.requests[:]
+    keywords = c.execute(ignore_errors=False, resume=True)
+    assert set(keywords.keywords.keys()) == {'testing', 'mock', 'clojure', 'lisp', 'flow',
+                                             'celery'}
+    assert '/pypi/mock/json' not in [path for path, _ in http_server.requests]
+    assert not tmpdir.join('checkpoints', 'pypi.json').check()
+
+
+def test_execute_method_http_cache(http_server, tmpdir):
+    """Test that unchanged package metadata are served from HTTP cache."""
+    def project(headers):
+        if headers.get('If-None-Match') == '"v1"':
+            return 304, {'ETag': '"v1"'}, ''
+        status, response_headers, body = _project('cached')
+        return status, dict(response_headers, ETag='"v1"'), body
+
+    http_server.routes['/simple/'] = (200, {'Content-Type': 'text/html'},
+                                      "<a href='mock'>mock</a>")
+    http_server.routes['/pypi/mock/json'] = project
+    http_cache = HttpCache(str(tmpdir))
+
+    for _ in range(2):
+        keywords = _collector(http_server, http_cache=http_cache).execute(ignore_errors=False)
+        assert set(keywords.keywords.keys()) == {'cached'}
+
+    assert http_server.requests[-1][0] == '/pypi/mock/json'
+    assert http_server.requests[-1][1]['If-None-Match'] == '"v1"'
+
+
+def test_execute_method_http_cache_evicted(http_server, tmpdir):
+    """Test that a response evicted from HTTP cache is fetched again without retrying."""
+    http_cache = HttpCache(str(tmpdir))
+    url = http_server.url + '/pypi/mock/json'
+
+    def project(headers):
+        if headers.get('If-None-Match') == '"v1"':
+            # evicted after conditional request was sent
+            os.remove(http_cache.lookup(url)[0])
+            return 304, {'ETag': '"v1"'}, ''
+        status, response_headers, body = _project('refetched')
+        return status, dict(response_headers, ETag='"v1"'), body
+
+    http_server.routes['/simple/'] = (200, {'Content-Type': 'text/html'},
+                                      "<a href='mock'>mock</a>")
+    http_server.routes['/pypi/mock/json'] = project
+    _collector(http_server, http_cache=http_cache).execute(ignore_errors=False)
+
+    del http_server.requests[:]
+    keywords = _collector(http_server, http_cache=http_cache,
+                          retries=0).execute(ignore_errors=False)
+    assert set(keywords.keywords.keys()) == {'refetched'}
+    requests = [headers for path, headers in http_server.requests if path == '/pypi/mock/json']
+    assert len(requests) == 2
+    assert requests[0]['If-None-Match'] == '"v1"'
+    assert 'If-None-Match' not in requests[1]
+
+
+def test_execute_method_http_cache_threads(http_server, tmpdir):
+    """Test that HTTP cache is not accessed in the thread running event loop."""
+    threads = set()
+
+    class RecordingHttpCache(HttpCache):
+        def get_conditional_headers(self, url):
+            threads.add(threading.get_ident())
+            return super().get_conditional_headers(url)
+
+        def store(self, url, headers, chunks):
+            threads.add(threading.get_ident())
+            return super().store(url, headers, chunks)
+
+    http_server.routes['/simple/'] = (200, {'Content-Type': 'text/html'},
+                                      "<a href='mock'>mock</a>")
+    status, headers, body = _project('cached')
+    http_server.routes['/pypi/mock/json'] = (status, dict(headers, ETag='"v1"'), body)
+
+    http_cache = RecordingHttpCache(str(tmpdir))
+    keywords = _collector(http_server, http_cache=http_cache).execute(ignore_errors=False)
+    assert set(keywords.keywords.keys()) == {'cached'}
+    assert threads and threading.get_ident() not in threads
+
+
+def test_parse_keywords():
+    """Test parsing keywords from package metadata."""
+    assert PypiCollector.parse_keywords(None) == set()
+    assert PypiCollector.parse_keywords('') == set()
+    assert PypiCollector.parse_keywords('foo bar') == {'foo', 'bar'}
+    assert PypiCollector.parse_keywords('Foo bar, baz,,') == {'foo bar', 'baz'}
+    assert PypiCollector.parse_keywords(['foo', 'bar baz']) == {'foo', 'bar baz'}
 
 
 if __name__ == '__main__':
     test_initial_state()
-    test_execute_method()
-    test_execute_method_negative()
-    test_execute_method_negative2()
+    test_parse_keywords()
@@ -0,0 +1,110 @@
+"""Tests for the TokenBucket class."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from f8a_tagger.collectors.rate_limiter import TokenBucket
+
+
+class _Clock(object):
+    """Fake clock controlled by tests."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_initial_state():
+    """Check the initial state of TokenBucket."""
+    bucket = TokenBucket(2, burst=3)
+    assert bucket.rate == 2.0
+    assert bucket.burst == 3
+
+    bucket = TokenBucket.per_hour(3600)
+    assert bucket.rate == 1.0
+    assert bucket.burst == 1
+
+
+def test_wrong_configuration():
+    """Check that wrong configuration is rejected."""
+    with pytest.raises(ValueError):
+        TokenBucket(0)
+
+    with pytest.raises(ValueError):
+        TokenBucket(1, burst=0)
+
+    with pytest.raises(ValueError):
+        TokenBucket(1, burst=2).reserve(3)
+
+
+def test_reserve():
+    """Check waiting times computed for reserved tokens."""
+    clock = _Clock()
+    bucket = TokenBucket(2, burst=2, clock=clock)
+
+    # burst is available immediately
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    # further requests are spread based on rate, in order of reservations
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+
+    # tokens are refilled with time, but never over burst
+    clock.now = 100.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(0.5)
+
+
+def test_acquire_threads():
+    """Check that concurrent threads never exceed the rate."""
+    bucket = TokenBucket(50, burst=1)
+    timestamps = []
+    lock = threading.Lock()
+
+    def fetcher():
+        for _ in range(5):
+            bucket.acquire()
+            with lock:
+                timestamps.append(time.monotonic())
+
+    threads = [threading.Thread(target=fetcher) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    timestamps.sort()
+    assert len(timestamps) == 20
+    # 20 requests with burst of 1 at 50 requests per second take at least 19/50 seconds
+    assert timestamps[-1] - timestamps[0] >= 19 / 50.0 - 0.02
+
+
+def test_acquire_async():
+    """Check that coroutines are rate limited as well."""
+    bucket = TokenBucket(100, burst=2)
+
+    async def fetch_all():
+        await asyncio.gather(*[bucket.acquire_async() for _ in range(12)])
+
+    loop = asyncio.new_event_loop()
+    start = time.monotonic()
+    try:
+        loop.run_until_complete(fetch_all())
+    finally:
+        loop.close()
+
+    assert time.monotonic() - start >= 10 / 100.0 - 0.02
+
+
+if __name__ == '__main__':
+    test_initial_state()
+    test_wrong_configuration()
+    test_reserve()
+    test_acquire_threads()
+    test_acquire_async()
@@ -1,9 +1,14 @@
 """Tests for functions from recipes module."""
 
+import os
 import pytest
 from unittest.mock import patch
+from f8a_tagger.corpus import Corpus
 from f8a_tagger.errors import InvalidInputError
+from f8a_tagger.errors import ParserLimitExceededError
+from f8a_tagger.keywords_set import KeywordsSet
 import f8a_tagger.recipes
+from f8a_tagger.result_cache import ResultCache
 
 
 def test_get_registered_stemmers():
@@ -47,6 +52,49 @@ def test_lookup_text(_mocked_function):
         f8a_tagger.recipes.lookup_text(None)
 
 
+@patch('f8a_tagger.tokenizer.Tokenizer.tokenize', return_value=["token1", "token2", "token3"])
+def test_lookup_text_result_cache(mocked_function, tmpdir):
+    """Test for the function lookup_text() with cached results."""
+    with ResultCache(str(tmpdir)) as result_cache:
+        score = f8a_tagger.recipes.lookup_text("Hello world", result_cache=result_cache)
+        assert f8a_tagger.recipes.lookup_text("Hello world", result_cache=result_cache) == score
+        assert mocked_function.call_count == 1
+        assert result_cache.hits == 1
+        assert result_cache.misses == 1
+
+        # changed configuration is not served from cache
+        f8a_tagger.recipes.lookup_text("Hello world", scorer='RelativeUsage',
+                                        result_cache=result_cache)
+        assert mocked_function.call_count == 2
+
+        f8a_tagger.recipes.lookup_file("test_data/README_rst.json", result_cache=result_cache)
+        f8a_tagger.recipes.lookup_file("test_data/README_rst.json", result_cache=result_cache)
+        assert mocked_function.call_count == 3
+        assert result_cache.hits == 2
+
+
+@patch('f8a_tagger.tokenizer.Tokenizer.tokenize', return_value=[["python", "is", "django"]])
+def test_lookup_file_compiled_keywords(_mocked_function, tmpdir):
+    """Test for the function lookup_file() with compiled keywords database."""
+    database_file = str(tmpdir.join('keywords.db'))
+    f8a_tagger.recipes.compile_keywords(database_file, "test_data/keywords.yaml")
+
+    result = f8a_tagger.recipes.lookup_file("test_data/", keywords_file="test_data/keywords.yaml",
+                                            ignore_errors=True, scorer='RelativeUsage')
+    assert result
+    assert f8a_tagger.recipes.lookup_file("test_data/", keywords_file=database_file,
+                                          ignore_errors=True, scorer='RelativeUsage') == result
+    assert f8a_tagger.recipes.lookup_file("test_data/", keywords_file=database_file,
+                                          ignore_errors=True, scorer='RelativeUsage',
+                                          lookup_workers=2) == result
+
+    with ResultCache(str(tmpdir.join('cache'))) as result_cache:
+        for _ in range(2):
+            f8a_tagger.recipes.lookup_file("test_data/README_rst.json", database_file,
+                                           result_cache=result_cache)
+        assert result_cache.hits == 1
+
+
 @patch('f8a_tagger.tokenizer.Tokenizer.tokenize', return_value=["token1", "token2", "token3"])
 def test_lookup_file(_mocked_function):
     """Test for the function lookup_file()."""
@@ -69,6 +117,84 @@ def test_lookup_file(_mocked_function):
     assert result is not None
 
 
+@patch('f8a_tagger.tokenizer.Tokenizer.tokenize', return_value=[["python", "is", "django"]])
+def test_lookup_file_filters(_mocked_function, tmpdir):
+    """Test for the function lookup_file() with files selected in a directory tree."""
+    for path in ('README.md', 'docs/guide.rst', 'docs/logo.png', 'vendor/README.md'):
+        tmpdir.join(path).write('python is django', ensure=True)
+    root = str(tmpdir)
+
+    # files which cannot be parsed are skipped
+    result = f8a_tagger.recipes.lookup_file(root)
+    assert sorted(os.path.relpath(path, root) for path in result) == \
+        ['README.md', 'docs/guide.rst', 'vendor/README.md']
+
+    result = f8a_tagger.recipes.lookup_file(root, include=['*.md'], exclude=['vendor'])
+    assert list(result) == [os.path.join(root, 'README.md')]
+
+    result = f8a_tagger.recipes.lookup_file(root, use_progressbar=True)
+    assert len(result) == 3
+
+
+@patch('f8a_tagger.tokenizer.Tokenizer.tokenize', return_value=[["python", "is", "django"]])
+def test_lookup_file_lookup_workers(_mocked_function, tmpdir):
+    """Test for the function lookup_file() performing lookup in worker processes."""
+    result = f8a_tagger.recipes.lookup_file("test_data/", keywords_file="test_data/keywords.yaml",
+                                            ignore_errors=True)
+    assert result
+    assert f8a_tagger.recipes.lookup_file("test_data/", keywords_file="test_data/keywords.yaml",
+                                          ignore_errors=True, lookup_workers=2) == result
+
+    corpus = Corpus()
+    with ResultCache(str(tmpdir)) as result_cache:
+        f8a_tagger.recipes.lookup_file("test_data/README_rst.json", result_cache=result_cache,
+                                       corpus=corpus, lookup_workers=1)
+        assert corpus.get_size() == 1
+        assert f8a_tagger.recipes.lookup_file("test_data/README_rst.json",
+                                              result_cache=result_cache, lookup_workers=1)
+        assert result_cache.hits == 1
+
+    with pytest.raises(ValueError):
+        f8a_tagger.recipes.lookup_file("test_data/", lookup_workers=2)
+
+
+@patch('f8a_tagger.tokenizer.Tokenizer.tokenize',
+       return_value=[["python", "is", "py"], ["flask", "app"], ["python is", "is py"]])
+def test_retag(_mocked_function, tmpdir):
+    """Test for the function retag()."""
+    old_keywords = tmpdir.join('old_keywords.yaml')
+    old_keywords.write("python:\n  synonyms:\n    - py\nflask:\n")
+    new_keywords = tmpdir.join('new_keywords.yaml')
+    new_keywords.write("python:\nflask:\napp:\n")
+
+    corpus = Corpus()
+    previous = f8a_tagger.recipes.lookup_file("test_data/README_rst.json",
+                                              keywords_file=str(old_keywords), corpus=corpus)
+    assert previous == {"test_data/README_rst.json": {'python': 2, 'flask': 1}}
+    assert corpus.get_size() == 1
+
+    result = f8a_tagger.recipes.retag(corpus, previous, str(old_keywords), str(new_keywords))
+    assert result == f8a_tagger.recipes.lookup_file("test_data/README_rst.json",
+                                                    keywords_file=str(new_keywords))
+    assert result == {"test_data/README_rst.json": {'python': 1, 'flask': 1, 'app': 1}}
+
+
+@patch('f8a_tagger.tokenizer.Tokenizer.tokenize', return_value=["token1", "token2", "token3"])
+def test_lookup_file_sandboxed(_mocked_function, tmpdir):
+    """Test for the function lookup_file() parsing files in worker processes."""
+    result = f8a_tagger.recipes.lookup_file("test_data/README_rst.json", parse_workers=1,
+                                            parse_timeout=60)
+    assert "test_data/README_rst.json" in result
+
+    big = tmpdir.join('README.md')
+    big.write("Some *emphasized* [link](http://example.com) text.\n\n" * 20000)
+    with pytest.raises(ParserLimitExceededError):
+        f8a_tagger.recipes.lookup_file(str(big), parse_timeout=0.1)
+
+    result = f8a_tagger.recipes.lookup_file(str(big), parse_timeout=0.1, ignore_errors=True)
+    assert not result
+
+
 @patch('f8a_tagger.tokenizer.Tokenizer.tokenize', return_value=["token1", "token2", "token3"])
 def test_lookup_readme_proper_input(_mocked_function):
     """Test for the function lookup_readme()."""
@@ -158,12 +284,53 @@ def test_aggregate():
     assert keywords == {}
 
 
+def test_aggregate_parallel(tmpdir):
+    """Test for the function aggregate() parsing input files in parallel."""
+    json_file = tmpdir.join('keywords.json')
+    json_file.write('{"python": {"occurrence_count": 3, "synonyms": ["py"]}, "django": null}')
+
+    keywords = f8a_tagger.recipes.aggregate(["test_data/keywords.yaml", str(json_file)],
+                                            workers=2)
+    assert keywords == f8a_tagger.recipes.aggregate(["test_data/keywords.yaml", str(json_file)],
+                                                    workers=1)
+    assert keywords["python"]["occurrence_count"] == 3
+    assert "py" in keywords["python"]["synonyms"]
+    assert keywords["django"]["regexp"] == ['.*django.*']
+
+
 def test_collect():
     """Test for the function collect()."""
     with pytest.raises(Exception):
         f8a_tagger.recipes.collect()
 
 
+
+def test_collect_keywords_set(tmpdir):
+    """Test for the function collect_keywords_set()."""
+    class Collector(object):
+        def __init__(self, keywords):
+            self._keywords = keywords
+
+        def execute(self, ignore_errors, use_progressbar, resume):
+            return KeywordsSet().update(self._keywords)
+
+    collectors = {'first': lambda: Collector(['python', 'django']),
+                  'second': lambda: Collector(['python'])}
+    with patch('f8a_tagger.recipes.CollectorBase.get_collector_class',
+               side_effect=collectors.get):
+        keywords_set = f8a_tagger.recipes.collect_keywords_set(['first', 'second'])
+        assert keywords_set.get_occurrence_count('python') == 2
+        assert f8a_tagger.recipes.collect(['first', 'second']) == keywords_set.to_dict()
+
+    # dumped keywords set is accepted by aggregate()
+    keywords_file = tmpdir.join('keywords.yaml')
+    with open(str(keywords_file), 'w') as f:
+        keywords_set.dump(f)
+    keywords = f8a_tagger.recipes.aggregate([str(keywords_file)])
+    assert keywords['python']['occurrence_count'] == 2
+    assert keywords['django']['occurrence_count'] == 1
+
+
 if __name__ == '__main__':
     test_get_registered_stemmers()
     test_get_registered_scorers()
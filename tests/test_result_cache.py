@@ -0,0 +1,65 @@
+"""Tests for the ResultCache class."""
+
+from f8a_tagger.result_cache import ResultCache
+
+
+def test_initial_state(tmpdir):
+    """Check the initial state of ResultCache."""
+    with ResultCache(str(tmpdir)) as cache:
+        assert cache.stats == {'hits': 0, 'misses': 0, 'size': 0}
+
+
+def test_get_store(tmpdir):
+    """Check storing and retrieving lookup results."""
+    fingerprint = ResultCache.compute_fingerprint(keywords={'python': {}}, scorer='Count')
+
+    with ResultCache(str(tmpdir)) as cache:
+        assert cache.get(fingerprint, "some text") is None
+        cache.store(fingerprint, "some text", {'python': 2})
+        assert cache.get(fingerprint, "some text") == {'python': 2}
+        assert cache.get(fingerprint, "other text") is None
+        assert cache.hits == 1
+        assert cache.misses == 2
+        assert cache.total_size > 0
+
+        # the same text looked up with a different configuration
+        other_fingerprint = ResultCache.compute_fingerprint(keywords={'python': {}},
+                                                            scorer='TfIdf')
+        assert other_fingerprint != fingerprint
+        assert cache.get(other_fingerprint, "some text") is None
+
+        # replaced results are not accounted twice
+        size = cache.total_size
+        cache.store(fingerprint, "some text", {'python': 3})
+        assert cache.total_size == size
+        assert cache.get(fingerprint, "some text") == {'python': 3}
+
+    # results are persistent
+    with ResultCache(str(tmpdir)) as cache:
+        assert cache.total_size == size
+        assert cache.get(fingerprint, "some text") == {'python': 3}
+
+
+def test_compute_fingerprint():
+    """Check that fingerprint does not depend on ordering of configuration."""
+    assert ResultCache.compute_fingerprint(ngram_size=2, stemmer=None) == \
+        ResultCache.compute_fingerprint(stemmer=None, ngram_size=2)
+    assert ResultCache.compute_fingerprint(ngram_size=2) != \
+        ResultCache.compute_fingerprint(ngram_size=3)
+
+
+def test_eviction(tmpdir):
+    """Check that least recently used results are evicted first."""
+    fingerprint = ResultCache.compute_fingerprint()
+
+    with ResultCache(str(tmpdir), max_size=300) as cache:
+        cache.store(fingerprint, "first", {'first': 1})
+        cache.store(fingerprint, "second", {'second': 1})
+        cache.store(fingerprint, "third", {'third': 1})
+        assert cache.get(fingerprint, "first") == {'first': 1}
+
+        cache.store(fingerprint, "fourth", {'fourth': 1})
+        assert cache.total_size <= 300
+        assert cache.get(fingerprint, "fourth") == {'fourth': 1}
+        assert cache.get(fingerprint, "first") == {'first': 1}
+        assert cache.get(fingerprint, "second") is None
@@ -0,0 +1,88 @@
+"""Tests for the SandboxedParser class."""
+
+import pytest
+from f8a_tagger.errors import ParserLimitExceededError
+from f8a_tagger.parsers import CoreParser
+from f8a_tagger.parsers import SandboxedParser
+
+
+def _big_markdown(tmpdir):
+    """Create Markdown file which takes a while to parse."""
+    path = tmpdir.join('README.md')
+    path.write("# Header\n\nSome *emphasized* [link](http://example.com) text.\n\n" * 20000)
+    return str(path)
+
+
+def test_initial_state():
+    """Check the initial state of SandboxedParser."""
+    with SandboxedParser(workers=1) as p:
+        assert p is not None
+
+    with pytest.raises(ValueError):
+        SandboxedParser(workers=0)
+
+    with pytest.raises(ValueError):
+        SandboxedParser(parser_options={'unknown-content-type': {}})
+
+
+def test_parse_many():
+    """Test parsing files in worker processes."""
+    paths = ["test_data/README.txt", "test_data/README_rst.json", "test_data/README.md"]
+    core_parser = CoreParser()
+
+    with SandboxedParser(workers=2, timeout=60) as p:
+        parsed = dict(p.parse_many(paths))
+        assert parsed == {path: core_parser.parse_file(path) for path in paths}
+
+        with pytest.raises(ValueError):
+            list(p.parse_many(paths + ["test_data/keywords.yaml"]))
+
+        # workers are still usable after failure
+        parsed = dict(p.parse_many(["test_data/keywords.yaml"] + paths, ignore_errors=True))
+        assert set(parsed.keys()) == set(paths)
+
+
+def test_parser_options():
+    """Test that parser options are passed to workers."""
+    options = {'markdown': {'backend': 'text', 'drop_code': True}}
+    with SandboxedParser(workers=1, parser_options=options) as p:
+        parsed = dict(p.parse_many(["test_data/README.md"]))
+
+    assert parsed["test_data/README.md"] == \
+        CoreParser(options).parse_file("test_data/README.md")
+
+
+def test_timeout(tmpdir):
+    """Test that documents exceeding time limit are reported and the batch continues."""
+    big = _big_markdown(tmpdir)
+
+    with SandboxedParser(workers=1, timeout=0.2) as p:
+        results = {path: (content, error) for path, content, error in
+                   p.imap([big, "test_data/README.txt"])}
+
+        assert isinstance(results[big][1], ParserLimitExceededError)
+        assert results[big][0] is None
+        assert results["test_data/README.txt"] == \
+            (CoreParser().parse_file("test_data/README.txt"), None)
+
+        with pytest.raises(ParserLimitExceededError):
+            list(p.parse_many([big]))
+
+        assert not list(p.parse_many([big], ignore_errors=True))
+
+
+def test_max_rss(tmpdir):
+    """Test that documents exceeding memory limit are reported and the batch continues."""
+    big = _big_markdown(tmpdir)
+
+    with SandboxedParser(workers=1, max_rss=1) as p:
+        results = {path: error for path, _, error in p.imap([big, "test_data/README.txt"])}
+
+    assert isinstance(results[big], ParserLimitExceededError)
+    assert "test_data/README.txt" in results
+
+
+if __name__ == '__main__':
+    test_initial_state()
+    test_parse_many()
+    test_parser_options()
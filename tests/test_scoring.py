@@ -52,6 +52,21 @@ def test_relative_usage_scoring():
     assert score["functional-programming"] < 0.5
 
 
+def test_score_ids():
+    """Test scoring of keyword ids."""
+    keywordsChief = KeywordsChief("test_data/keywords.yaml")
+    tokens = ["python", "python", "ml", "XXdjango", "unknown"]
+    keyword_ids = keywordsChief.extract_keyword_ids(tokens)
+    keywords = keywordsChief.extract_keywords(tokens)
+
+    for scorer in ("Count", "RelativeUsage"):
+        s = Scoring.get_scoring(scorer)
+        assert s.score_ids(keywordsChief, keyword_ids) == s.score(keywordsChief, keywords)
+
+    with pytest.raises(NotImplementedError):
+        Scoring.get_scoring("TfIdf").score_ids(keywordsChief, keyword_ids)
+
+
 def test_tfid_scoring():
     """Test the class TfIdfScoring."""
     s = Scoring.get_scoring("TfIdf")
@@ -73,5 +88,6 @@ if __name__ == '__main__':
     test_get_scoring()
     test_count_scoring()
     test_relative_usage_scoring()
+    test_score_ids()
     test_tfid_scoring()
     test_scoring_func()
@@ -2,8 +2,38 @@
 
 import pytest
 from unittest.mock import patch
+import libarchive
 from f8a_tagger.collectors.stackoverflow import StackOverflowCollector
+from f8a_tagger.http_cache import HttpCache
 from f8a_tagger.keywords_set import KeywordsSet
+from f8a_tagger.utils import cwd
+
+
+_TAGS_XML = """<?xml version="1.0" encoding="utf-8"?>
+<tags>
+  <row Id="1" TagName=".net" Count="317000" ExcerptPostId="3624959" />
+  <row Id="2" TagName="html" Count="1100000" ExcerptPostId="3673183" />
+  <row Id="3" TagName="javascript" Count="2200000" ExcerptPostId="3624960" />
+  <row Id="4" TagName="css" Count="790000" ExcerptPostId="3644670" />
+</tags>
+"""
+
+
+def _make_archive(tmpdir, file_name='Tags.xml'):
+    """Create 7z archive with StackOverflow tags."""
+    tmpdir.join(file_name).write(_TAGS_XML)
+    archive_path = str(tmpdir.join('stackoverflow.com-Tags.7z'))
+    with cwd(str(tmpdir)):
+        with libarchive.file_writer(archive_path, '7zip') as archive:
+            archive.add_files(file_name)
+
+    with open(archive_path, 'rb') as f:
+        return f.read()
+
+
+def _collector(server, tmpdir):
+    return StackOverflowCollector(url=server.url + '/stackoverflow.com-Tags.7z',
+                                  http_cache=HttpCache(str(tmpdir.join('cache'))))
 
 
 def test_initial_state():
@@ -12,27 +42,60 @@ def test_initial_state():
     assert c is not None
 
 
-def test_execute_method():
+def test_execute_method(http_server, tmpdir):
     """Test the execute() method."""
-    c = StackOverflowCollector()
+    http_server.routes['/stackoverflow.com-Tags.7z'] = (200, {}, _make_archive(tmpdir))
+    c = _collector(http_server, tmpdir)
 
     keywords = c.execute()
-    assert keywords.keywords
-    assert len(keywords.keywords) > 0
+    assert keywords.keywords == {
+        '.net': {'occurrence_count': 317000},
+        'html': {'occurrence_count': 1100000},
+        'javascript': {'occurrence_count': 2200000},
+        'css': {'occurrence_count': 790000}
+    }
+
+
+def test_execute_method_cached(http_server, tmpdir):
+    """Test that not modified archive is not downloaded again."""
+    archive = _make_archive(tmpdir)
+
+    def handler(headers):
+        if headers.get('If-None-Match') == '"tags"':
+            return 304, {'ETag': '"tags"'}, b''
+        return 200, {'ETag': '"tags"'}, archive
+
+    http_server.routes['/stackoverflow.com-Tags.7z'] = handler
+    c = _collector(http_server, tmpdir)
+
+    assert len(c.execute().keywords) == 4
+    assert len(c.execute().keywords) == 4
+    assert http_server.requests[-1][1]['If-None-Match'] == '"tags"'
+
+
+def test_execute_method_no_tags(http_server, tmpdir):
+    """Test that missing Tags.xml in archive is reported."""
+    http_server.routes['/stackoverflow.com-Tags.7z'] = (200, {},
+                                                        _make_archive(tmpdir, 'Users.xml'))
+    c = _collector(http_server, tmpdir)
+
+    with pytest.raises(RuntimeError):
+        c.execute()
 
 
 class _response:
 
-    def __init__(self, status_code, ok, text):
+    def __init__(self, status_code, text):
         self.status_code = status_code
-        self.ok = ok
-        self.text = text
+        self.headers = {}
+        self.content = text.encode()
 
 
-def mocked_requests_1(url):
+def mocked_requests_1(url, **kwargs):
     """Implement mocked function requests.get()."""
     assert url
-    return _response(200, False, """
+    assert kwargs
+    return _response(404, """
         <html>
         <head><title>Simple Index</title><meta name="api-version" value="2" /></head><body>
         <a href='mock'>mock</a><br/>
@@ -41,7 +104,7 @@ def mocked_requests_1(url):
         </body></html>""")
 
 
-@patch("f8a_tagger.collectors.stackoverflow.requests.get", side_effect=mocked_requests_1)
+@patch("f8a_tagger.http_cache.requests.get", side_effect=mocked_requests_1)
 def test_execute_method_negative1(_mocked_get):
     """Test the execute() method."""
     c = StackOverflowCollector()
@@ -67,13 +130,14 @@ def mocked_add(self, x, y):
 
 
 @patch("f8a_tagger.keywords_set.KeywordsSet.add", side_effect=mocked_add, autospec=True)
-def test_execute_method_negative2(_mocked_add):
+def test_execute_method_negative2(_mocked_add, http_server, tmpdir):
     """Test the execute() method."""
-    c = StackOverflowCollector()
+    http_server.routes['/stackoverflow.com-Tags.7z'] = (200, {}, _make_archive(tmpdir))
+    c = _collector(http_server, tmpdir)
 
     keywords = c.execute()
     assert keywords.keywords
-    assert len(keywords.keywords) > 0
+    assert len(keywords.keywords) == 3
 
 
 mocked_add_2_called = False
@@ -92,18 +156,16 @@ def mocked_add_2(self, x, y):
 
 
 @patch("f8a_tagger.keywords_set.KeywordsSet.add", side_effect=mocked_add_2, autospec=True)
-def test_execute_method_negative3(_mocked_add):
+def test_execute_method_negative3(_mocked_add, http_server, tmpdir):
     """Test the execute() method."""
-    c = StackOverflowCollector()
+    http_server.routes['/stackoverflow.com-Tags.7z'] = (200, {}, _make_archive(tmpdir))
+    c = _collector(http_server, tmpdir)
 
     keywords = c.execute()
     assert keywords.keywords
-    assert len(keywords.keywords) > 0
+    assert len(keywords.keywords) == 3
 
 
 if __name__ == '__main__':
     test_initial_state()
-    test_execute_method()
     test_execute_method_negative1()
-    test_execute_method_negative2()
-    test_execute_method_negative3()
@@ -0,0 +1,548 @@
+"""Tests for markup strippers."""
+
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+from f8a_tagger.parsers.strippers import strip_asciidoc
+from f8a_tagger.parsers.strippers import strip_creole
+from f8a_tagger.parsers.strippers import strip_markdown
+from f8a_tagger.parsers.strippers import strip_mediawiki
+from f8a_tagger.parsers.strippers import strip_org
+from f8a_tagger.parsers.strippers import strip_pod
+from f8a_tagger.parsers.strippers import strip_rdoc
+from f8a_tagger.parsers.strippers import strip_restructuredtext
+from f8a_tagger.parsers.strippers import strip_textile
+
+
+_MARKDOWN = """Title
+=====
+
+# Header with *emphasis* #
+
+Some **bold**, __strong__, _emphasized_ and ~~struck~~ text with AWS_ACCESS_KEY and `inline code`.
+A [link](http://example.com "title"), a [reference link][ref], <http://autolink.com> and
+an image ![alt text](image.png). [![badge alt](badge.svg)](http://ci.com)
+Escaped \\*asterisks\\* &amp; entities.
+
+[ref]: http://example.com
+
+* first item
+- second item
+  continued
+1. numbered item
+
+> quoted
+> **text**
+>
+
+---
+
+| Name | Value |
+|------|:-----:|
+| foo  | bar   |
+
+<div align="center">
+<b>html</b> block
+</div>
+<!-- hidden
+comment -->
+<script>var hidden;</script>
+
+```python
+import fenced
+```
+
+    indented_code()
+
+Last paragraph."""
+
+
+def test_strip_markdown():
+    """Test stripping Markdown markup."""
+    assert strip_markdown(_MARKDOWN).split('\n') == [
+        'Title',
+        '',
+        'Header with emphasis',
+        '',
+        'Some bold, strong, emphasized and struck text with AWS_ACCESS_KEY and inline code.',
+        'A link, a reference link, http://autolink.com and',
+        'an image . ',
+        'Escaped *asterisks* & entities.',
+        '',
+        '',
+        'first item',
+        'second item',
+        'continued',
+        'numbered item',
+        '',
+        'quoted',
+        'text',
+        '',
+        '',
+        '',
+        'Name   Value',
+        'foo    bar',
+        '',
+        '',
+        'html block',
+        '',
+        '',
+        'python',
+        'import fenced',
+        '',
+        'indented_code()',
+        '',
+        'Last paragraph.'
+    ]
+
+
+def test_strip_markdown_drop_code():
+    """Test omitting code blocks when stripping Markdown markup."""
+    stripped = strip_markdown(_MARKDOWN, drop_code=True)
+    assert 'inline code' in stripped
+    assert 'fenced' not in stripped
+    assert 'python' not in stripped
+    assert 'indented_code' not in stripped
+    assert 'Last paragraph.' in stripped
+
+
+def test_strip_markdown_empty():
+    """Test stripping empty content."""
+    assert strip_markdown('') == ''
+    assert strip_markdown('```\nunterminated fence') == 'unterminated fence'
+
+
+
+def test_strip_markdown_pathological():
+    """Test that unclosed inline constructs do not make stripping super-linear."""
+    for line in ('[' * 4000, '![' * 4000, '[!' * 4000, '`a' * 4000, '<a ' * 4000, '<' * 8000,
+                 '[x](' * 3000):
+        start = time.monotonic()
+        strip_markdown(line)
+        assert time.monotonic() - start < 1, line[:10]
+
+    assert strip_markdown('[text ![alt](i.png) more](url) ``code ` tick``') == \
+        'text  more code ` tick'
+_RESTRUCTUREDTEXT = """=====
+Title
+=====
+
+.. |project| replace:: Substituted
+
+Paragraph with |project|, *emphasis* and ``literal``.
+
+.. image:: badge.svg
+   :alt: Badge
+
+* item
+
+.. code:: python
+
+   import code
+
+.. comment
+
+.. raw:: html
+
+   <b>raw</b>
+
+.. include:: /etc/passwd
+
+Unknown |reference| and `broken link`_."""
+
+
+def test_strip_restructuredtext():
+    """Test collecting text from reStructuredText doctree."""
+    assert strip_restructuredtext(_RESTRUCTUREDTEXT).split('\n') == [
+        'Title',
+        'Paragraph with Substituted, emphasis and literal.',
+        'item',
+        '',
+        '',
+        'import code',
+        'Unknown |reference| and broken link.',
+        '',
+        ''
+    ]
+
+
+
+def test_strip_restructuredtext_concurrent():
+    """Test stripping reStructuredText in multiple threads at once."""
+    documents = [_RESTRUCTUREDTEXT, 'Other *document*\n\n* with\n* items', 'Plain text.'] * 40
+    expected = [strip_restructuredtext(document) for document in documents]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert list(executor.map(strip_restructuredtext, documents)) == expected
+_ASCIIDOC = """Document Title
+==============
+:toc:
+:source-highlighter: pygments
+
+// line comment
+Paragraph with *bold*, _emphasis_, `monospace`, **un**constrained and snake_case_name.
+A link:https://example.com[link], https://example.com[URL],
+<<section,cross reference>> and {attribute}.
+
+== Section ==
+
+[source,python]
+----
+import *listing*
+----
+
+////
+block comment
+////
+
+.Block title
+* item
+** nested item
+. numbered item
+term:: definition
+
+NOTE: Admonition text.
+
+image::diagram.png[Diagram]
+
+|===
+|Name |Value
+|foo |bar
+|==="""
+
+
+def test_strip_asciidoc():
+    """Test stripping AsciiDoc markup."""
+    assert strip_asciidoc(_ASCIIDOC).split('\n') == [
+        'Document Title',
+        '',
+        'Paragraph with bold, emphasis, monospace, unconstrained and snake_case_name.',
+        'A link, URL,',
+        'cross reference and .',
+        '',
+        'Section',
+        '',
+        'import *listing*',
+        '',
+        '',
+        'Block title',
+        'item',
+        'nested item',
+        'numbered item',
+        'term definition',
+        '',
+        'Admonition text.',
+        '',
+        '',
+        'Name  Value',
+        'foo  bar'
+    ]
+
+
+_TEXTILE = """h1. Title
+
+p(intro). Paragraph with *strong*, _emphasis_, @code@, -deleted-, +inserted+ and snake_case_name.
+A "link(title)":http://example.com, an image !image.png(alt)! and a footnote[1].
+
+bc. code *verbatim*
+
+bc.. extended code
+
+continues
+
+p. Back to text.
+
+###. comment
+
+* item
+## nested item
+
+|_. Name |_. Value |
+| foo | bar |
+
+[alias]http://example.com
+fn1. Footnote text."""
+
+
+def test_strip_textile():
+    """Test stripping Textile markup."""
+    assert strip_textile(_TEXTILE).split('\n') == [
+        'Title',
+        '',
+        'Paragraph with strong, emphasis, code, deleted, inserted and snake_case_name.',
+        'A link, an image  and a footnote.',
+        '',
+        'code *verbatim*',
+        '',
+        'extended code',
+        '',
+        'continues',
+        '',
+        'Back to text.',
+        '',
+        '',
+        'item',
+        'nested item',
+        '',
+        'Name Value',
+        'foo bar',
+        '',
+        'Footnote text.'
+    ]
+
+
+_RDOC = """= Title
+
+Paragraph with *bold*, _emphasis_, +code+ and snake_case_name.
+A {link text}[http://example.com], Word[http://example.com] and <tt>tags</tt>.
+
+  verbatim *code*
+
+* item
+1. numbered item
+[label] described
+term:: definition
+
+:nodoc:
+--
+hidden
+++
+---
+See rdoc-ref:Some::Class."""
+
+
+def test_strip_rdoc():
+    """Test stripping RDoc markup."""
+    assert strip_rdoc(_RDOC).split('\n') == [
+        'Title',
+        '',
+        'Paragraph with bold, emphasis, code and snake_case_name.',
+        'A link text, Word and tags.',
+        '',
+        '  verbatim *code*',
+        '',
+        'item',
+        'numbered item',
+        'label described',
+        'term definition',
+        '',
+        'See Some::Class.'
+    ]
+
+
+_ORG = """#+TITLE: Document title
+#+OPTIONS: toc:nil
+
+* TODO [#A] Headline with cookie [1/2]                              :tag:other:
+  :PROPERTIES:
+  :ID: hidden
+  :END:
+  SCHEDULED: <2018-01-01 Mon>
+
+Paragraph with *bold*, /italic/, _underline_, =verbatim=, ~code~, +strike+ and snake_case_name.
+A [[https://example.com][link]], [[target]] and /usr/bin/env path[fn:1].
+
+#+BEGIN_SRC python
+import *source*
+#+END_SRC
+
+# comment
+: fixed width
+
+- [X] item
+1. numbered item
+- term :: definition
+
+| Name | Value |
+|------+-------|
+| foo  | bar   |
+
+#+BEGIN_COMMENT
+hidden
+#+END_COMMENT"""
+
+
+def test_strip_org():
+    """Test stripping Org markup."""
+    assert strip_org(_ORG).split('\n') == [
+        'Document title',
+        '',
+        'Headline with cookie  tag other',
+        '',
+        'Paragraph with bold, italic, underline, verbatim, code, strike and snake_case_name.',
+        'A link, target and /usr/bin/env path.',
+        '',
+        'python',
+        'import *source*',
+        '',
+        'fixed width',
+        '',
+        'item',
+        'numbered item',
+        'term definition',
+        '',
+        'Name Value',
+        'foo bar',
+        ''
+    ]
+
+
+_CREOLE = """= Title =
+
+Paragraph with **bold**, //italic//, {{{nowiki}}} and snake_case_name.\\\\
+A [[http://example.com|link]], [[Page]], http://example.com/path and an image {{image.png|alt}}.
+Escaped ~[[not a link]] and **unclosed bold
+
+{{{
+preformatted **text**
+}}}
+
+* item
+** nested item
+# numbered item
+
+|=Name |=Value |
+|foo |bar |
+----"""
+
+
+def test_strip_creole():
+    """Test stripping Creole markup."""
+    assert strip_creole(_CREOLE).split('\n') == [
+        'Title',
+        '',
+        'Paragraph with bold, italic, nowiki and snake_case_name. ',
+        'A link, Page, http://example.com/path and an image .',
+        'Escaped [[not a link]] and unclosed bold',
+        '',
+        'preformatted **text**',
+        '',
+        'item',
+        'nested item',
+        'numbered item',
+        '',
+        'Name Value',
+        'foo bar',
+        ''
+    ]
+
+
+_MEDIAWIKI = """{{Infobox
+| name = {{nested|template}}
+}}
+== Title ==
+
+Paragraph with '''bold''', ''italic'' and snake_case_name.__NOTOC__
+A [[Page|link]], [[word]]s, [http://example.com external link] and [http://example.com].
+[[File:Image.png|thumb|Caption with [[link]]]]<!-- comment -->
+Signed ~~~~
+
+* item
+# numbered item
+; term : definition
+
+{| class="wikitable"
+|+ Caption
+|-
+! Name !! Value
+|-
+| style="color: red" | foo || bar
+|}
+
+[[Category:Some category]]"""
+
+
+def test_strip_mediawiki():
+    """Test stripping MediaWiki markup."""
+    assert strip_mediawiki(_MEDIAWIKI).split('\n') == [
+        'Title',
+        '',
+        'Paragraph with bold, italic and snake_case_name.',
+        'A link, words, external link and .',
+        '',
+        'Signed',
+        '',
+        'item',
+        'numbered item',
+        'term : definition',
+        '',
+        'Caption',
+        'Name Value',
+        'foo bar',
+        '',
+        'Some category'
+    ]
+
+
+_POD = """=pod
+
+=head1 NAME
+
+Paragraph with B<bold>, I<italic>, C<< code->method >>, F<file> and snake_case_name.
+A L<link|http://example.com>, L<perlfunc/"open">, E<lt>escapesE<gt>, B<I<nested>>X<index> and a > b.
+
+    verbatim B<code>
+
+=over
+
+=item * item
+
+=item 1. numbered item
+
+=back
+
+=begin html
+
+<b>html</b>
+
+=end html
+
+=for comment hidden
+
+=cut
+
+code();
+
+=head2 Last
+
+=cut"""
+
+
+def test_strip_pod():
+    """Test stripping POD markup."""
+    assert strip_pod(_POD).split('\n') == [
+        '',
+        'NAME',
+        '',
+        'Paragraph with bold, italic, code->method, file and snake_case_name.',
+        'A link, perlfunc open, <escapes>, nested and a > b.',
+        '',
+        '    verbatim B<code>',
+        '',
+        '',
+        'item',
+        '',
+        'numbered item',
+        '',
+        '',
+        '',
+        '',
+        'Last',
+        ''
+    ]
+
+
+if __name__ == '__main__':
+    test_strip_markdown()
+    test_strip_markdown_drop_code()
+    test_strip_markdown_empty()
+    test_strip_markdown_pathological()
+    test_strip_restructuredtext()
+    test_strip_restructuredtext_concurrent()
+    test_strip_asciidoc()
+    test_strip_textile()
+    test_strip_rdoc()
+    test_strip_org()
+    test_strip_creole()
+    test_strip_mediawiki()
+    test_strip_pod()
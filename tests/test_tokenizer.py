@@ -206,6 +206,36 @@ def test_stem_method():
     assert tokens == ["***", "***", "***", "***", "***"]
 
 
+def test_normalize_method():
+    """Check the _normalize method."""
+    tokenizer = Tokenizer("test_data/stopwords.txt", None)
+
+    # test with no lemmatizer and stemmer
+    tokens = ["foo", "bar", "me", "your", "6502"]
+    tokenizer._normalize(tokens)
+    assert tokens == ["foo", "bar", "me", "your", "6502"]
+
+    # test with custom lemmatizer and stemmer, results are the same as of _lemmatize and _stem
+    lemmatizer = CustomLemmatizer2()
+    tokenizer = Tokenizer("test_data/stopwords.txt", lemmatizer=lemmatizer,
+                          stemmer=CustomStemmer2())
+    tokens = ["foo", "bar", "foo", "your", "foo"]
+    expected = list(tokens)
+    tokenizer._lemmatize(expected)
+    tokenizer._stem(expected)
+
+    with patch.object(lemmatizer, 'lemmatize', wraps=lemmatizer.lemmatize) as lemmatize:
+        tokenizer._normalize(tokens)
+        assert tokens == expected == ["**foo", "**bar", "**foo", "**your", "**foo"]
+        # each distinct token is normalized once
+        assert lemmatize.call_count == 3
+
+        tokens = ["bar", "baz"]
+        tokenizer._normalize(tokens)
+        assert tokens == ["**bar", "**baz"]
+        assert lemmatize.call_count == 4
+
+
 def sent_tokenize_mock(content):
     """Mock the function nlth.sent_tokenize."""
     return content.split(".")
@@ -252,5 +282,6 @@ if __name__ == '__main__':
     test_remove_stopwords_method()
     test_lemmatize_method()
     test_stem_method()
+    test_normalize_method()
     test_tokenize()
     test_tokenize_error_handling()
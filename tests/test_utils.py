@@ -1,7 +1,12 @@
 """Tests for functions from utils module."""
 
 import pytest
+import io
+import json
+import os
 from f8a_tagger.utils import iter_files, get_files_dir, cwd, progressbarize, json_dumps
+from f8a_tagger.utils import iter_json_array, iter_json_object, iter_yaml_mapping
+from f8a_tagger.utils import iter_keywords_file
 
 
 def test_iter_files():
@@ -36,6 +41,30 @@ def test_iter_files_negative():
         assert len(x) > 0
 
 
+def test_iter_files_filters(tmpdir):
+    """Check filtering of files yielded by the iter_files iterator."""
+    for path in ('README.md', 'docs/index.RST', 'docs/logo.png', 'node_modules/x/README.md',
+                 'src/notes.txt'):
+        tmpdir.join(path).write('content', ensure=True)
+    root = str(tmpdir)
+
+    def walk(**kwargs):
+        return sorted(os.path.relpath(item, root) for item, _ in iter_files(root, **kwargs))
+
+    assert len(walk()) == 5
+    assert walk(extensions=['.md', '.rst']) == ['README.md', 'docs/index.RST',
+                                                'node_modules/x/README.md']
+    assert walk(include=['README*']) == ['README.md', 'node_modules/x/README.md']
+    assert walk(include=['docs/*']) == ['docs/index.RST', 'docs/logo.png']
+    assert walk(exclude=['node_modules', '*.png']) == ['README.md', 'docs/index.RST',
+                                                       'src/notes.txt']
+    assert walk(extensions=['.md'], exclude=['node_modules']) == ['README.md']
+
+    # a file passed directly is not filtered
+    png = str(tmpdir.join('docs/logo.png'))
+    assert list(iter_files(png, extensions=['.md'], exclude=['*.png'])) == [(png, png)]
+
+
 def test_json_dumps():
     """Test the function json_dumps()."""
     payload = {
@@ -46,6 +75,66 @@ def test_json_dumps():
     assert str
 
 
+def test_iter_json_array():
+    """Test streaming items of JSON array."""
+    items = [{'groupId': 'junit', 'artifactId': 'junit'}, 12345, 1.5, "a, b]", None, [1, [2]]]
+    for indent in (None, 2):
+        serialized = json.dumps(items, indent=indent)
+        for chunk_size in (1, 3, 1024):
+            assert list(iter_json_array(io.StringIO(serialized), chunk_size)) == items
+
+    assert list(iter_json_array(io.StringIO(' [ ] '))) == []
+
+    for malformed in ('', '{}', '[1, 2', '[1, {"a": 1]'):
+        with pytest.raises(ValueError):
+            list(iter_json_array(io.StringIO(malformed), 2))
+
+
+def test_iter_json_object():
+    """Test streaming key-value pairs of JSON object."""
+    items = {'python': {'synonyms': ['py', 'a, b}']}, 'django': None, 'x': 12345, 'y': [1.5]}
+    for indent in (None, 2):
+        serialized = json.dumps(items, indent=indent)
+        for chunk_size in (1, 3, 1024):
+            assert dict(iter_json_object(io.StringIO(serialized), chunk_size)) == items
+
+    assert list(iter_json_object(io.StringIO(' { } '))) == []
+
+    for malformed in ('', '[]', '{"a": 1', '{"a" 1}', '{"a": [1}', '{1: 2}'):
+        with pytest.raises(ValueError):
+            list(iter_json_object(io.StringIO(malformed), 2))
+
+
+def test_iter_yaml_mapping():
+    """Test streaming key-value pairs of YAML mapping."""
+    serialized = "python:\n  synonyms: [py, '3']\n  occurrence_count: 3\n" \
+                 "django: &django\n  regexp: ['.*django.*']\nflask:\ndjango2: *django\n"
+    assert list(iter_yaml_mapping(io.StringIO(serialized))) == [
+        ('python', {'synonyms': ['py', '3'], 'occurrence_count': 3}),
+        ('django', {'regexp': ['.*django.*']}),
+        ('flask', None),
+        ('django2', {'regexp': ['.*django.*']})
+    ]
+
+    assert list(iter_yaml_mapping(io.StringIO(''))) == []
+    assert list(iter_yaml_mapping(io.StringIO('---\n'))) == []
+
+    for malformed in ('- python\n', 'python: !!set {a, b}\n'):
+        with pytest.raises(ValueError):
+            list(iter_yaml_mapping(io.StringIO(malformed)))
+
+
+def test_iter_keywords_file(tmpdir):
+    """Test streaming keywords from YAML and JSON keywords files."""
+    keywords = dict(iter_keywords_file("test_data/keywords.yaml"))
+    assert "python" in keywords
+    assert keywords["django"] == {'regexp': ['.*django.*']}
+
+    json_file = tmpdir.join('keywords.json')
+    json_file.write(json.dumps(keywords))
+    assert dict(iter_keywords_file(str(json_file))) == keywords
+
+
 def path_home_mock():
     """Mock the static method Path.home."""
     raise AttributeError()
@@ -84,11 +173,34 @@ def test_progressbarsize():
     assert z
 
 
+def test_progressbarize_lazy():
+    """Test that the progressbarize function does not materialize iterables."""
+    produced = []
+
+    def produce():
+        for i in range(5):
+            produced.append(i)
+            yield 'x' * i
+
+    items = progressbarize(produce(), progress=True, item_size=len)
+    assert next(items) == ''
+    assert produced == [0]
+    assert list(items) == ['x', 'xx', 'xxx', 'xxxx']
+
+    # more items than expected
+    assert list(progressbarize(produce(), progress=True, total=3)) == \
+        ['', 'x', 'xx', 'xxx', 'xxxx']
+
+
 if __name__ == '__main__':
     test_iter_files()
     test_iter_files_negative()
     test_json_dumps()
+    test_iter_json_array()
+    test_iter_json_object()
+    test_iter_yaml_mapping()
     test_get_files_dir()
     # test_get_files_dir_older_python()
     test_cwd()
     test_progressbarsize()
+    test_progressbarize_lazy()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Benchmark walking of directory trees by iter_files().
+
+A directory tree with the given number of files (mostly with extensions which cannot be
+parsed, as in checked out repositories) is generated, unless an existing directory is passed,
+and walked by the original os.listdir() based walk and by iter_files() with and without
+filters. Run it on a cold page cache (drop caches between runs) to include I/O costs.
+
+Usage:
+python3 tools/benchmark_iter_files.py
+python3 tools/benchmark_iter_files.py --files 100000 --files-per-directory 50
+python3 tools/benchmark_iter_files.py --path /path/to/checkouts --exclude node_modules
+"""
+
+from collections import deque
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import click
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from f8a_tagger.parsers.core_parser import CoreParser
+from f8a_tagger.utils import iter_files
+
+# extensions of generated files, the first ones cannot be parsed
+EXTENSIONS = ('.py', '.js', '.c', '.png', '.json', '.md', '.rst', '.txt')
+
+
+def listdir_walk(path):
+    """Walk directory tree as iter_files() did before using os.scandir(), for reference."""
+    stack = deque([path])
+
+    while stack:
+        item = stack.pop()
+
+        if os.path.isfile(item):
+            yield item, item
+        elif os.path.isdir(item):
+            for entry in os.listdir(item):
+                stack.append(os.path.join(item, entry))
+
+
+def generate_tree(path, files, files_per_directory):
+    """Generate a directory tree with empty files, ten subdirectories per directory."""
+    directories = deque([path])
+    created = 0
+    while created < files:
+        directory = directories.popleft()
+        os.makedirs(directory, exist_ok=True)
+        for i in range(min(files_per_directory, files - created)):
+            open(os.path.join(directory, 'file%d%s' % (i, EXTENSIONS[i % len(EXTENSIONS)])),
+                 'w').close()
+        created += files_per_directory
+        directories.extend(os.path.join(directory, 'dir%d' % i) for i in range(10))
+
+
+def measure(walk):
+    """Measure time of walking, return time and number of files yielded."""
+    start = time.monotonic()
+    count = sum(1 for _ in walk())
+    return time.monotonic() - start, count
+
+
+@click.command()
+@click.option('--path', type=click.Path(exists=True, file_okay=False),
+              help='Walk an existing directory tree instead of a generated one.')
+@click.option('--files', default=1000000, show_default=True,
+              help='Number of files in the generated directory tree.')
+@click.option('--files-per-directory', default=100, show_default=True,
+              help='Number of files in each directory of the generated directory tree.')
+@click.option('--exclude', multiple=True,
+              help='Glob pattern of files and directories to be skipped by a filtered walk.')
+def cli(path, files, files_per_directory, exclude):
+    """Benchmark walking of directory trees."""
+    temp_dir = None
+    if path is None:
+        temp_dir = tempfile.mkdtemp(prefix='benchmark_iter_files_')
+        path = temp_dir
+        click.echo("Generating %d files in '%s'" % (files, path))
+        generate_tree(path, files, files_per_directory)
+
+    extensions = CoreParser.get_supported_extensions()
+    walks = [
+        ('os.listdir', lambda: listdir_walk(path)),
+        ('os.scandir', lambda: iter_files(path)),
+        ('extensions', lambda: iter_files(path, extensions=extensions)),
+    ]
+    if exclude:
+        walks.append(('extensions+exclude',
+                      lambda: iter_files(path, extensions=extensions, exclude=exclude)))
+
+    try:
+        for description, walk in walks:
+            elapsed, count = measure(walk)
+            click.echo("  %-20s %10.2f s %10d files" % (description, elapsed, count))
+    finally:
+        if temp_dir is not None:
+            shutil.rmtree(temp_dir)
+
+
+if __name__ == '__main__':
+    cli()
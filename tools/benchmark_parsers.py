@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Benchmark markup parsers and their backends.
+
+Each file is parsed repeatedly by all backends available for its markup, throughput and
+whether the text extracted matches the text extracted by the first (reference) backend
+are reported. Markups with a single parser report throughput only, use --scale to check
+that it does not drop on multi-MB documents.
+
+Usage:
+python3 tools/benchmark_parsers.py README.md README.rst README.html
+python3 tools/benchmark_parsers.py --repeat 50 --scale 20 tests/test_data/README.md
+python3 tools/benchmark_parsers.py --repeat 3 --scale 1000 tests/test_data/README.*[a-z]
+"""
+
+import os
+import sys
+import time
+
+import click
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from f8a_tagger.parsers.parsers import AsciidocParser
+from f8a_tagger.parsers.parsers import CreoleParser
+from f8a_tagger.parsers.parsers import HtmlParser
+from f8a_tagger.parsers.parsers import MarkdownParser
+from f8a_tagger.parsers.parsers import MediawikiParser
+from f8a_tagger.parsers.parsers import OrgParser
+from f8a_tagger.parsers.parsers import PodParser
+from f8a_tagger.parsers.parsers import RdocParser
+from f8a_tagger.parsers.parsers import ReStructuredTextParser
+from f8a_tagger.parsers.parsers import TextileParser
+
+# markup -> list of (backend description, parser class, parser arguments), the first one is
+# the reference backend
+BACKENDS = {
+    'asciidoc': [
+        ('text', AsciidocParser, {})
+    ],
+    'creole': [
+        ('text', CreoleParser, {})
+    ],
+    'html': [
+        ('beautifulsoup', HtmlParser, {'backend': 'beautifulsoup'}),
+        ('lxml', HtmlParser, {'backend': 'lxml'})
+    ],
+    'markdown': [
+        ('beautifulsoup', MarkdownParser, {'backend': 'beautifulsoup'}),
+        ('lxml', MarkdownParser, {'backend': 'lxml'}),
+        ('text', MarkdownParser, {'backend': 'text'})
+    ],
+    'mediawiki': [
+        ('text', MediawikiParser, {})
+    ],
+    'org': [
+        ('text', OrgParser, {})
+    ],
+    'pod': [
+        ('text', PodParser, {})
+    ],
+    'rdoc': [
+        ('text', RdocParser, {})
+    ],
+    'restructuredtext': [
+        ('beautifulsoup', ReStructuredTextParser, {'backend': 'beautifulsoup'}),
+        ('lxml', ReStructuredTextParser, {'backend': 'lxml'}),
+        ('doctree', ReStructuredTextParser, {'backend': 'doctree'})
+    ],
+    'textile': [
+        ('text', TextileParser, {})
+    ]
+}
+
+FILE_EXTENSIONS = {
+    '.adoc': 'asciidoc',
+    '.asc': 'asciidoc',
+    '.asciidoc': 'asciidoc',
+    '.creole': 'creole',
+    '.htm': 'html',
+    '.html': 'html',
+    '.markdown': 'markdown',
+    '.md': 'markdown',
+    '.mdown': 'markdown',
+    '.mediawiki': 'mediawiki',
+    '.mkdn': 'markdown',
+    '.org': 'org',
+    '.pod': 'pod',
+    '.rdoc': 'rdoc',
+    '.rst': 'restructuredtext',
+    '.textile': 'textile',
+    '.wiki': 'mediawiki'
+}
+
+
+def measure(parser, content, repeat):
+    """Measure time needed to parse content repeatedly.
+
+    :param parser: parser instance
+    :param content: content to parse
+    :param repeat: number of repetitions
+    :return: tuple - the best time of a single parse in seconds and parsed text
+    """
+    best = None
+    text = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        text = parser.parse(content)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best, text
+
+
+def benchmark_file(path, repeat=10, scale=1):
+    """Benchmark all backends available for the given file.
+
+    :param path: path to file to parse
+    :param repeat: number of repetitions for each backend
+    :param scale: number of times file content is concatenated to simulate bigger documents
+    :return: list of tuples - backend description, seconds per document, MB/s, text matches
+    """
+    markup = FILE_EXTENSIONS.get(os.path.splitext(path)[1].lower())
+    if markup is None:
+        raise click.BadParameter("Unknown markup of '%s', known extensions: %s"
+                                 % (path, ', '.join(sorted(FILE_EXTENSIONS))))
+
+    with open(path, 'r') as f:
+        content = '\n\n'.join([f.read()] * scale)
+    size = len(content.encode())
+
+    results = []
+    reference = None
+    for description, parser_class, parser_kwargs in BACKENDS[markup]:
+        elapsed, text = measure(parser_class(**parser_kwargs), content, repeat)
+        if reference is None:
+            reference = text
+        results.append((description, elapsed, size / elapsed / 1024 ** 2, text == reference))
+
+    return results
+
+
+@click.command()
+@click.argument('paths', nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+@click.option('--repeat', default=10, show_default=True,
+              help='Number of times each file is parsed by each backend.')
+@click.option('--scale', default=1, show_default=True,
+              help='Concatenate file content the given number of times.')
+def cli(paths, repeat, scale):
+    """Benchmark markup parsers backends on files supplied."""
+    for path in paths:
+        click.echo(path)
+        for description, elapsed, throughput, matches in benchmark_file(path, repeat, scale):
+            click.echo("  %-16s %10.2f ms %10.2f MB/s  %s"
+                       % (description, elapsed * 1000, throughput,
+                          'same text' if matches else 'text differs from reference'))
+
+
+if __name__ == '__main__':
+    cli()